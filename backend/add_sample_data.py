@@ -3,12 +3,9 @@
 Script to add sample data for the anchor-based system
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Part, Anchor, CarModelPartLink
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+from app.db import engine
 
 def add_sample_data():
     """Add sample data for testing the anchor-based system"""
@@ -28,7 +25,7 @@ def add_sample_data():
             source_url="https://skfb.ly/6WZyV",
             uploader="Lionsharp Studios",
             source_uid="6WZyV",
-            bounds='{"min": [-1, 0, -2], "max": [1, 1, 2]}',
+            bounds={"min": [-1, 0, -2], "max": [1, 1, 2]},
             scale_factor=1.0
         )
         session.add(car_model)
@@ -51,7 +48,7 @@ def add_sample_data():
                 "source_url": "",
                 "uploader": "Creator",
                 "source_uid": "",
-                "intrinsic_size": '{"radius": 0.34, "type": "wheel"}',
+                "intrinsic_size": {"radius": 0.34, "type": "wheel"},
                 "attach_to": "wheel_FL_anchor",
                 "pos_x": 0.0, "pos_y": 0.0, "pos_z": 0.0,
                 "rot_x": 0.0, "rot_y": 0.0, "rot_z": 0.0,
@@ -69,7 +66,7 @@ def add_sample_data():
                 "source_url": "",
                 "uploader": "Creator",
                 "source_uid": "",
-                "intrinsic_size": '{"type": "body"}',
+                "intrinsic_size": {"type": "body"},
                 "attach_to": "hood_anchor",
                 "pos_x": 0.0, "pos_y": 0.0, "pos_z": 0.0,
                 "rot_x": 0.0, "rot_y": 0.0, "rot_z": 0.0,
@@ -87,7 +84,7 @@ def add_sample_data():
                 "source_url": "",
                 "uploader": "Creator",
                 "source_uid": "",
-                "intrinsic_size": '{"type": "body"}',
+                "intrinsic_size": {"type": "body"},
                 "attach_to": "spoiler_anchor",
                 "pos_x": 0.0, "pos_y": 0.0, "pos_z": 0.0,
                 "rot_x": 0.0, "rot_y": 0.0, "rot_z": 0.0,
@@ -105,7 +102,7 @@ def add_sample_data():
                 "source_url": "",
                 "uploader": "Creator",
                 "source_uid": "",
-                "intrinsic_size": '{"type": "light"}',
+                "intrinsic_size": {"type": "light"},
                 "attach_to": "headlight_L_anchor",
                 "pos_x": 0.0, "pos_y": 0.0, "pos_z": 0.0,
                 "rot_x": 0.0, "rot_y": 0.0, "rot_z": 0.0,
@@ -134,7 +131,7 @@ def add_sample_data():
                 "pos_x": -0.8, "pos_y": 0, "pos_z": -1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_FR_anchor",
@@ -142,7 +139,7 @@ def add_sample_data():
                 "pos_x": 0.8, "pos_y": 0, "pos_z": -1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_RL_anchor",
@@ -150,7 +147,7 @@ def add_sample_data():
                 "pos_x": -0.8, "pos_y": 0, "pos_z": 1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_RR_anchor",
@@ -158,7 +155,7 @@ def add_sample_data():
                 "pos_x": 0.8, "pos_y": 0, "pos_z": 1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             # Body part anchors
             {
@@ -167,7 +164,7 @@ def add_sample_data():
                 "pos_x": 0, "pos_y": 1.2, "pos_z": -2.5,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "spoiler"}'
+                "anchor_metadata": {"type": "spoiler"}
             },
             {
                 "name": "hood_anchor",
@@ -175,7 +172,7 @@ def add_sample_data():
                 "pos_x": 0, "pos_y": 1.0, "pos_z": 0,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "hood"}'
+                "anchor_metadata": {"type": "hood"}
             },
             {
                 "name": "headlight_L_anchor",
@@ -183,7 +180,7 @@ def add_sample_data():
                 "pos_x": -0.6, "pos_y": 0.8, "pos_z": 2.6,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "headlight"}'
+                "anchor_metadata": {"type": "headlight"}
             },
             {
                 "name": "headlight_R_anchor",
@@ -191,7 +188,7 @@ def add_sample_data():
                 "pos_x": 0.6, "pos_y": 0.8, "pos_z": 2.6,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "headlight"}'
+                "anchor_metadata": {"type": "headlight"}
             }
         ]
         
@@ -3,12 +3,10 @@
 Script to add sample parts to the database for testing
 """
 
-from sqlmodel import Session, create_engine
+from sqlmodel import Session
 from app.models import Part, CarModelPartLink
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+from app.db import engine
+from app.services.catalog_cache import bump_catalog_version
 
 def add_sample_parts():
     with Session(engine) as session:
@@ -79,6 +77,8 @@ def add_sample_parts():
             link = CarModelPartLink(car_model_id=porsche_id, part_id=part.id)
             session.add(link)
         
+        # running servers drop their cached per-car part lists
+        session.exec(bump_catalog_version())
         session.commit()
         print(f"Added {len(sample_parts)} sample parts to the database")
 
@@ -1,21 +1,52 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from app.config import get_settings
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from sqlmodel import Session
-from app.db import get_user, get_session
+from sqlmodel import Session, delete, select
+from typing import Dict, Optional, Tuple
+from app.db import engine, get_user, get_session
+from app.models import RevokedToken, User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# same scheme, but anonymous requests get None instead of a 401
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+@lru_cache()
+def _crypt_context(rounds: int) -> CryptContext:
+    # hashes at any other cost are flagged by verify_and_update for a rehash
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+def password_context() -> CryptContext:
+    return _crypt_context(get_settings().bcrypt_rounds)
+
+# bcrypt releases the GIL, so a few dedicated threads hash in parallel without
+# touching the event loop or the request threadpool; excess logins queue here
+_hash_pool = ThreadPoolExecutor(max_workers=get_settings().password_hash_workers, thread_name_prefix="bcrypt")
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(valid, new_hash); new_hash is set when the stored hash used another cost factor"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_pool, password_context().verify_and_update, plain_password, hashed_password
+    )
 
 def create_access_token(data: dict, expires_delta: timedelta(minutes=30)):
     # data is user info
@@ -30,6 +61,7 @@ def create_access_token(data: dict, expires_delta: timedelta(minutes=30)):
     to_encode = data.copy()
     expire = datetime.utcnow() + expires_delta
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)  # lets the token be revoked on its own
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
     return encoded_jwt
 
@@ -49,22 +81,192 @@ def decode_access_token(token: str):
     except JWTError:
         return None
 
+def user_claims(user) -> dict:
+    # everything get_current_user's callers read, so verifying the token is enough
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    }
+
+def principal_from_claims(payload: dict) -> Optional[User]:
+    # tokens issued before user claims existed only carry "sub"; those need a lookup
+    if "uid" not in payload:
+        return None
+    return User(
+        id=payload["uid"],
+        email=payload.get("email", payload["sub"]),
+        first_name=payload.get("first_name", ""),
+        last_name=payload.get("last_name", ""),
+        password="",
+    )
+
+class RevocationList:
+    """
+    jti of tokens revoked before their exp. Revocations made in this process
+    apply at once; other workers' are picked up by a reload at most every
+    ``refresh_seconds``, so checking a token never costs a query.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, float] = {}
+        self._loaded_at: Optional[float] = None
+
+    def refresh(self, session: Session, force: bool = False):
+        if not force and self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        rows = session.exec(select(RevokedToken).where(RevokedToken.expires_at > datetime.utcnow())).all()
+        now = time.time()
+        with self._lock:
+            revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            revoked.update((row.jti, _timestamp(row.expires_at)) for row in rows)
+            self._revoked = revoked
+            self._loaded_at = time.monotonic()
+
+    def revoke(self, session: Session, jti: str, expires_at: datetime):
+        session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        session.exec(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        session.commit()
+        with self._lock:
+            self._revoked[jti] = _timestamp(expires_at)
+            now = time.time()
+            self._revoked = {key: exp for key, exp in self._revoked.items() if exp > now}
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def clear(self):
+        with self._lock:
+            self._revoked.clear()
+            self._loaded_at = None
+
+class TokenCache:
+    """
+    Bounded LRU of verified token -> principal. Entries die with the
+    token's exp and are dropped as soon as its jti is revoked.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[User, float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires, jti = entry
+            if time.time() >= expires or jti in revocation_list:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: User, payload: dict):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (principal, float(payload["exp"]), payload.get("jti"))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+def _timestamp(value: datetime) -> float:
+    # token exp and revoked_token.expires_at are naive UTC
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+revocation_list = RevocationList(get_settings().auth_revocation_refresh_seconds)
+token_cache = TokenCache(get_settings().auth_token_cache_size)
+
+def load_revocations():
+    # at startup, so the first authenticated request doesn't pay for the load
+    with Session(engine) as session:
+        revocation_list.refresh(session, force=True)
+
+def verify_token(token: str, session: Session) -> Optional[dict]:
+    # claims of a well-formed, unexpired, unrevoked token; None otherwise
+    payload = decode_access_token(token)
+    if not payload or "sub" not in payload or "exp" not in payload:
+        return None
+    revocation_list.refresh(session)
+    if payload.get("jti") in revocation_list:
+        return None
+    return payload
+
+def _credentials_error():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+    )
+
 # for user updating their info
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     session: Session = Depends(get_session)
 ):
-    payload = decode_access_token(token)
-    if not payload or "sub" not in payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-        )
-    username = payload["sub"] # question what sub is
-    user = get_user(username, session)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    return user
+    # hot path: a token seen before is answered from memory, no decode; the
+    # revocation reload is time-gated, so other workers' logouts still land
+    # within auth_revocation_refresh_seconds
+    revocation_list.refresh(session)
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+    payload = verify_token(token, session)
+    if payload is None:
+        raise _credentials_error()
+    principal = principal_from_claims(payload)
+    if principal is None:
+        user = get_user(payload["sub"], session)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+        principal = principal_from_claims({**user_claims(user), "sub": payload["sub"]})
+    token_cache.set(token, principal, payload)
+    return principal
+
+def authenticate_token(token: str) -> Optional[User]:
+    # get_current_user outside dependency injection (e.g. WebSocket handshakes)
+    with Session(engine) as session:
+        try:
+            return get_current_user(token, session)
+        except HTTPException:
+            return None
+
+def get_admin_user(current_user: User = Depends(get_current_user)):
+    # registration is open, so being signed in is not enough for /admin
+    if current_user.email not in get_settings().admin_emails:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+# for routes that personalise results when a user is signed in; a stale or
+# bad token is served anonymously rather than failing a public route
+def get_optional_current_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    session: Session = Depends(get_session)
+):
+    if not token:
+        return None
+    try:
+        return get_current_user(token, session)
+    except HTTPException:
+        return None
@@ -0,0 +1,214 @@
+"""
+Response compression.
+
+``CompressionMiddleware`` compresses dynamic text/JSON responses with
+brotli (when the ``brotli`` package is installed) or gzip, chosen from the
+request's ``Accept-Encoding``. ``PrecompressedStaticFiles`` serves the
+``.br``/``.gz`` siblings written by ``scripts/precompress_assets.py`` so
+static assets are never compressed per request.
+"""
+
+import mimetypes
+import os
+import zlib
+from typing import Iterable, List, Optional
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# glTF types are missing from older mimetypes tables
+mimetypes.add_type("model/gltf-binary", ".glb")
+mimetypes.add_type("model/gltf+json", ".gltf")
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "model/gltf+json",
+    "text/",
+)
+
+
+def available_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def accepted_encodings(accept_encoding: str, available: Iterable[str]) -> List[str]:
+    """Codings from ``available`` the client accepts, best first (q-value, then server order)."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding] = q
+    ranked = []
+    for order, coding in enumerate(available):
+        q = qualities.get(coding, qualities.get("*", 0.0))
+        if q > 0:
+            ranked.append((-q, order, coding))
+    return [coding for _, _, coding in sorted(ranked)]
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    # a strong ETag must differ per content-coding
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{coding}"'
+    return etag
+
+
+def strip_encoded_etag(etag: str) -> str:
+    for coding in SUFFIXES:
+        if etag.endswith(f'-{coding}"'):
+            return etag[: -len(coding) - 2] + '"'
+    return etag
+
+
+def _compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _match_encoded_etag(headers: MutableHeaders, scope, coding: str):
+    # a 304 carries the ETag of the representation the client holds, which
+    # is the encoded one if it revalidated a compressed response
+    etag = headers.get("etag")
+    if etag and encoded_etag(etag, coding) in Headers(scope=scope).get("if-none-match", ""):
+        headers["ETag"] = encoded_etag(etag, coding)
+
+
+class _Compressor:
+    def __init__(self, coding: str, settings):
+        self.coding = coding
+        if coding == "br":
+            self._compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+        else:
+            # wbits 16+ writes a gzip header and trailer
+            self._compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.coding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.coding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing text/JSON bodies of at least
+    ``compression_min_size`` bytes. Streaming responses are compressed
+    chunk by chunk; responses that already carry a Content-Encoding
+    (precompressed static files) are passed through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        codings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""), available_encodings())
+        if not codings:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None and start_message is not None:
+                headers = MutableHeaders(raw=list(start_message["headers"]))
+                if start_message["status"] == 304:
+                    _match_encoded_etag(headers, scope, codings[0])
+                    passthrough = True
+                elif not _compressible(headers.get("content-type", "")) or "content-encoding" in headers:
+                    passthrough = True
+                elif not more_body and len(body) < settings.compression_min_size:
+                    headers.add_vary_header("Accept-Encoding")
+                    passthrough = True
+                else:
+                    compressor = _Compressor(codings[0], settings)
+                    headers["Content-Encoding"] = compressor.coding
+                    headers.add_vary_header("Accept-Encoding")
+                    if "etag" in headers:
+                        headers["ETag"] = encoded_etag(headers["etag"], compressor.coding)
+                    del headers["content-length"]
+                    body = compressor.compress(body)
+                    if not more_body:
+                        body += compressor.finish()
+                        headers["Content-Length"] = str(len(body))
+                await send({**start_message, "headers": headers.raw})
+                start_message = None
+                if passthrough:
+                    await send(message)
+                    return
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            data = compressor.compress(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+        if start_message is not None:
+            # the app never sent a body message: flush the start message as-is
+            await send(start_message)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers ``<file>.br`` / ``<file>.gz`` siblings the client accepts."""
+
+    async def get_response(self, path: str, scope):
+        if scope["method"] in ("GET", "HEAD"):
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            for coding in accepted_encodings(accept_encoding, SUFFIXES):
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + SUFFIXES[coding])
+                if stat_result is None or not os.path.isfile(full_path):
+                    continue
+                original_path, original_stat = await anyio.to_thread.run_sync(self.lookup_path, path)
+                if original_stat is None or original_stat.st_mtime > stat_result.st_mtime:
+                    continue  # missing or stale sibling
+                response = self.file_response(full_path, stat_result, scope)
+                if response.status_code == 200:
+                    response.headers["content-type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                    response.headers["content-encoding"] = coding
+                response.headers["vary"] = "Accept-Encoding"
+                return response
+        return await super().get_response(path, scope)
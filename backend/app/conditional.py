@@ -0,0 +1,54 @@
+"""
+Conditional GETs for the catalog routes.
+
+The ETag is derived from the catalog version row, which every catalog write
+bumps in its own transaction, so it changes exactly when any catalog
+response may have changed. The row is read on every request (one primary
+key lookup) rather than from the catalog cache, so a write in one worker
+moves the ETag in all of them at once, and a moved version clears the
+catalog cache first so the new ETag never labels a stale body.
+``If-None-Match`` hits short-circuit to a 304 before the route runs its
+queries.
+"""
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.compression import strip_encoded_etag
+from app.config import get_settings
+from app.db import get_async_read_session
+from app.models import CatalogVersion
+from app.services.catalog_cache import catalog_cache
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so ignore W/ prefixes
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    # and the -br/-gzip suffix the compression middleware adds
+    return any(strip_encoded_etag(candidate.removeprefix("W/")) == etag for candidate in candidates)
+
+
+async def catalog_etag(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+) -> str:
+    """
+    FASTAPI dependency: sets ETag and Cache-Control on the response, or
+    raises a bodiless 304 when the client already has this version.
+    """
+    current = await session.get(CatalogVersion, 1)
+    if current is None:
+        # unmigrated database: nothing to validate against
+        return ""
+    catalog_cache.observe_version(current.version)
+    etag = f'"{current.version}.{int(current.updated_at.timestamp())}"'
+    headers = {"ETag": etag, "Cache-Control": get_settings().catalog_cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return etag
@@ -1,13 +1,87 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
-    database_url: str
+    database_url: str = "sqlite:///./test.db"
     secret_key: str
     allowed_origins: List[str] = ["http://localhost:3000"]
     access_token_expire_minutes: int = 30
+    bcrypt_rounds: int = 12  # cost factor; stored hashes are upgraded on the next login
+    password_hash_workers: int = 4  # threads reserved for bcrypt
     sketchfab_api_token: str = ""
+    admin_emails: List[str] = []  # accounts allowed on /admin routes (cache control, catalog export)
+
+    # verified access tokens kept in memory (token -> user), expiring with the token
+    auth_token_cache_size: int = 10000  # 0 disables the cache
+    auth_revocation_refresh_seconds: float = 30.0  # how soon other workers see a logout
+
+    # refresh tokens (app.services.session_store)
+    refresh_token_expire_days: int = 30
+    session_store: str = "database"  # memory | database | redis
+    session_store_url: str = "redis://localhost:6379/0"  # session_store=redis only
+
+    # database engine tuning
+    db_echo: bool = False  # log every SQL statement (debugging only)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # seconds before a connection is recycled
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 disables the server-side timeout
+    database_read_url: str = ""  # optional replica for GET routes
+    db_async: bool = True  # False runs the async routers on sync sessions in the threadpool
+
+    # opt-in SQLite tuning for concurrent readers
+    sqlite_wal: bool = False
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268435456  # bytes
+    sqlite_cache_size: int = -65536  # negative means KiB
+    sqlite_busy_timeout_ms: int = 5000
+
+    # in-process catalog cache (car models, parts, anchors)
+    catalog_cache_size: int = 2048  # max entries; 0 disables the cache
+    catalog_cache_ttl_seconds: float = 60.0  # bounds staleness across workers
+    row_json_cache_size: int = 50000  # pre-serialized catalog rows; 0 disables
+
+    # memoized auto-placement transforms (app.services.placement_cache)
+    placement_cache_backend: str = "memory"  # memory | redis
+    placement_cache_url: str = "redis://localhost:6379/0"  # placement_cache_backend=redis only
+    placement_cache_size: int = 10000  # memory backend; 0 disables
+    placement_cache_ttl_seconds: float = 60.0  # bounds how long another worker misses a fitment change
+
+    # quotes
+    currency: str = "USD"
+    currency_decimals: int = 2
+
+    # /parts/search facets: upper bounds of the price buckets (last one is open-ended)
+    search_price_buckets: List[float] = [100.0, 250.0, 500.0, 1000.0]
+    search_cache_size: int = 256  # recent /parts/search results, kept apart from the catalog cache; 0 disables
+
+    # HTTP caching of catalog GETs (ETag from the catalog version row)
+    catalog_cache_control: str = "public, max-age=0, must-revalidate, s-maxage=60, stale-while-revalidate=300"
+
+    # response compression (brotli when installed, else gzip)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # bytes; smaller bodies go out as-is
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4  # dynamic responses; precompressed assets use 11
+
+    # rows per chunk / upsert batch for the NDJSON catalog export and import
+    catalog_sync_batch_size: int = 1000
+
+    # live manual correction: longest a dragged transform waits before it is written
+    manual_adjustment_flush_seconds: float = 1.0
+
+    # keyset pagination for list routes
+    page_size_default: int = 100
+    page_size_max: int = 1000
+
+    # per-request SQL accounting (Server-Timing header + query budgets)
+    query_stats_enabled: bool = True
+    query_budget_default: int = 0  # warn above this many queries per request; 0 disables
+    query_budgets: Dict[str, int] = {}  # per route, e.g. {"GET /saved_cars/": 3}
+    query_budget_enforce: bool = False  # raise instead of warn for routes in query_budgets (tests)
 
     class Config:
         env_file = ".env"
@@ -15,4 +89,3 @@ class Settings(BaseSettings):
 @lru_cache()
 def get_settings():
     return Settings()
-
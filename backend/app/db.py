@@ -1,26 +1,257 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
-from app.models import User # this assumes we have a User model, ask gpt 
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.models import User # this assumes we have a User model, ask gpt
+from app.migrations import run_migrations
+from app.query_stats import install_query_counter
 from sqlmodel import Session, select
 
+# async drivers used when a plain URL is given to the async engine
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
 
-# currently using a local file
-DATABASE_URL = "sqlite:///./test.db"
 
-# create the engine
-engine = create_engine(DATABASE_URL, echo=True)
+def _sqlite_file(url) -> bool:
+    return url.database not in (None, "", ":memory:")
+
+
+def _install_sqlite_pragmas(engine: Engine, settings, read_only: bool = False):
+    """Apply WAL and cache pragmas to every new SQLite connection."""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # journal_mode is persisted in the file, so only the writer sets it
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def to_async_url(database_url: str) -> str:
+    """Swap a sync driver for its async counterpart (sqlite -> sqlite+aiosqlite)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() == ASYNC_DRIVERS.get(backend):
+        return database_url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _engine_options(database_url: str, settings, read_only: bool = False, use_async: bool = False):
+    url = make_url(database_url)
+    kwargs = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    connect_args = {}
+
+    if url.get_backend_name() == "sqlite":
+        # FastAPI hands sessions to threadpool workers, so the connection
+        # must not be pinned to the thread that opened it
+        connect_args["check_same_thread"] = False
+        if _sqlite_file(url):
+            kwargs["pool_size"] = settings.db_pool_size
+            kwargs["max_overflow"] = settings.db_max_overflow
+            kwargs["pool_timeout"] = settings.db_pool_timeout
+            if read_only:
+                database_url = f"{url.drivername}:///file:{url.database}?mode=ro&uri=true"
+        if settings.sqlite_wal:
+            connect_args["timeout"] = settings.sqlite_busy_timeout_ms / 1000
+    else:
+        kwargs["pool_size"] = settings.db_pool_size
+        kwargs["max_overflow"] = settings.db_max_overflow
+        kwargs["pool_timeout"] = settings.db_pool_timeout
+        kwargs["pool_recycle"] = settings.db_pool_recycle
+        if settings.db_statement_timeout_ms:
+            if url.get_backend_name() == "postgresql" and use_async:
+                connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+            elif url.get_backend_name() == "postgresql":
+                connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+            elif url.get_backend_name() == "mysql":
+                connect_args["init_command"] = (
+                    f"SET SESSION max_execution_time={settings.db_statement_timeout_ms}"
+                )
+
+    install_pragmas = url.get_backend_name() == "sqlite" and settings.sqlite_wal and _sqlite_file(url)
+    return database_url, connect_args, kwargs, install_pragmas
+
+
+def create_db_engine(database_url: str, settings=None, read_only: bool = False) -> Engine:
+    """
+    Build an engine for ``database_url`` using the pool/echo/timeout knobs
+    from settings. SQLite gets its own connect args; everything else gets a
+    sized QueuePool. ``read_only`` opens SQLite files in ``mode=ro``.
+    """
+    settings = settings or get_settings()
+    database_url, connect_args, kwargs, install_pragmas = _engine_options(database_url, settings, read_only)
+    new_engine = create_engine(database_url, connect_args=connect_args, **kwargs)
+    if install_pragmas:
+        _install_sqlite_pragmas(new_engine, settings, read_only=read_only)
+    return new_engine
+
+
+def create_async_db_engine(database_url: str, settings=None, read_only: bool = False) -> AsyncEngine:
+    """Async counterpart of ``create_db_engine`` (aiosqlite, asyncpg, aiomysql)."""
+    settings = settings or get_settings()
+    database_url, connect_args, kwargs, install_pragmas = _engine_options(
+        to_async_url(database_url), settings, read_only, use_async=True
+    )
+    new_engine = create_async_engine(database_url, connect_args=connect_args, **kwargs)
+    if install_pragmas:
+        _install_sqlite_pragmas(new_engine.sync_engine, settings, read_only=read_only)
+    return new_engine
+
+
+def _read_url(settings):
+    """URL and read-only flag for catalog reads, or None to reuse the primary engine."""
+    if settings.database_read_url:
+        return settings.database_read_url, False
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite" and settings.sqlite_wal and _sqlite_file(url):
+        return settings.database_url, True
+    return None
+
+
+def create_read_engine(settings=None) -> Engine:
+    """
+    Engine for catalog reads. Uses ``database_read_url`` when configured,
+    a separate read-only pool on the same file in SQLite WAL mode, and
+    falls back to the primary engine otherwise (a new engine on
+    ``settings.database_url`` when custom settings are given).
+    """
+    read_url = _read_url(settings or get_settings())
+    if read_url is None:
+        return engine if settings is None else create_db_engine(settings.database_url, settings)
+    return create_db_engine(read_url[0], settings, read_only=read_url[1])
+
+
+def create_async_read_engine(settings=None) -> AsyncEngine:
+    read_url = _read_url(settings or get_settings())
+    if read_url is None:
+        return async_engine if settings is None else create_async_db_engine(settings.database_url, settings)
+    return create_async_db_engine(read_url[0], settings, read_only=read_url[1])
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a sync ``Session`` exposing the subset of the
+    ``AsyncSession`` API the routers use. Each database call runs in the
+    threadpool, which is what sync ``def`` endpoints did before, so
+    ``db_async=False`` gives a like-for-like baseline for the async engine.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def exec(self, statement, **kwargs):
+        # buffer rows in the worker thread, as AsyncSession does
+        options = dict(kwargs.pop("execution_options", {}), prebuffer_rows=True)
+        return await run_in_threadpool(self.sync_session.exec, statement, execution_options=options, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        options = dict(kwargs.pop("execution_options", {}), prebuffer_rows=True)
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, execution_options=options, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, *args, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+DATABASE_URL = get_settings().database_url
+
+# shared engine for the app, ingestion services and maintenance scripts
+engine = create_db_engine(DATABASE_URL)
+
+# GET routers read through this one; writes always go through ``engine``
+read_engine = create_read_engine()
+
+# async engines for the async routers (created lazily by the driver on first use)
+async_engine = create_async_db_engine(DATABASE_URL)
+async_read_engine = create_async_read_engine()
+
+# per-request query counts for the Server-Timing header and query budgets
+for _engine in (engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine):
+    install_query_counter(_engine)
 
 def init_db():
-    # create the database file & tables
+    # create the database file & tables, then bring older databases up to date
     SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
 
 def get_session():
     # FASTAPI dependency
     with Session(engine) as session:
         yield session
 
+def get_read_session():
+    # FASTAPI dependency for read-only catalog routes
+    with Session(read_engine) as session:
+        yield session
+
+async def _async_session(async_bind: AsyncEngine, sync_bind: Engine):
+    # objects are serialized after commit, so don't expire them
+    if get_settings().db_async:
+        async with AsyncSession(async_bind, expire_on_commit=False) as session:
+            yield session
+    else:
+        with Session(sync_bind, expire_on_commit=False) as session:
+            yield ThreadedSession(session)
+
+async def get_async_session():
+    # FASTAPI dependency for async routers; honours the db_async setting
+    async for session in _async_session(async_engine, engine):
+        yield session
+
+async def get_async_read_session():
+    # async counterpart of get_read_session
+    async for session in _async_session(async_read_engine, read_engine):
+        yield session
+
 def get_user(email: str, session: Session):
     # session is a instance of Session from SQLModel used to execute the query
     statement = select(User).where(User.email == email)
     result = session.exec(statement)
     return result.first() # returns the first matching user, as username are unique
-    
+
+async def get_user_async(email: str, session: AsyncSession):
+    # same lookup as get_user, for async sessions
+    result = await session.exec(select(User).where(User.email == email))
+    return result.first()
+
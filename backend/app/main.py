@@ -1,17 +1,26 @@
-from fastapi import FastAPI, Depends, status, HTTPException
+from fastapi import FastAPI, Body, Depends, status, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
-from app.db import init_db, get_session, get_user
-from app.models import Item
-from app.routers import items, protected, users, carmodels, parts, saved_cars, fitments
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import init_db, get_async_session, get_session, get_user, get_user_async
+from app.models import Item, User
+from app.routers import items, protected, users, carmodels, parts, saved_cars, fitments, admin
 from fastapi.security import  OAuth2PasswordRequestForm
-from app.auth import verify_password, create_access_token, oauth2_scheme
+from app.auth import verify_and_update_password, create_access_token, oauth2_scheme, load_revocations, revocation_list, user_claims, verify_token
 from app.config import get_settings
-from datetime import timedelta
+from app.services.session_store import (
+    InvalidRefreshToken, RefreshTokenReused, SessionStore, get_session_store,
+    issue_refresh_token, revoke_refresh_token, rotate_refresh_token,
+)
+from app.query_stats import QueryStatsMiddleware
+from app.compression import CompressionMiddleware, PrecompressedStaticFiles
+from datetime import datetime, timedelta
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 import os
 
-app = FastAPI(title="Simple Backend API", version = "0.1.0")
+# orjson renders the routes that go through response_model serialization
+app = FastAPI(title="Simple Backend API", version = "0.1.0", default_response_class=ORJSONResponse)
 
 # Get settings
 settings = get_settings()
@@ -22,12 +31,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link", "X-Next-Cursor", "Server-Timing"],
 )
 
-# Mount static files for GLB models
+# count SQL statements per request (Server-Timing header, query budgets)
+app.add_middleware(QueryStatsMiddleware)
+
+# brotli/gzip for JSON bodies over compression_min_size
+app.add_middleware(CompressionMiddleware)
+
+# Mount static files for GLB models; .br/.gz siblings from
+# scripts/precompress_assets.py are served when the client accepts them
 downloads_dir = "downloads"
 if os.path.exists(downloads_dir):
-    app.mount("/models", StaticFiles(directory=downloads_dir), name="models")
+    app.mount("/models", PrecompressedStaticFiles(directory=downloads_dir), name="models")
 
 app.include_router(protected.router)
 app.include_router(users.router, prefix="/users", tags=["users"])
@@ -36,25 +53,42 @@ app.include_router(parts.router)
 app.include_router(saved_cars.router)
 app.include_router(fitments.router)
 app.include_router(items.router, prefix="/items", tags=["items"])
+app.include_router(admin.router)
+
+def _access_token(claims: dict) -> str:
+    return create_access_token(
+        data=claims,
+        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+    )
 
 @app.post("/token")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    store: SessionStore = Depends(get_session_store),
 ):
-    user = get_user(form_data.username, session)  # username is actually the email
-    if not user or not verify_password(form_data.password, user.password):
+    user = await get_user_async(form_data.username, session)  # username is actually the email
+    valid, new_hash = False, None
+    if user:
+        # bcrypt runs on its own bounded pool, off the event loop and the request threadpool
+        valid, new_hash = await verify_and_update_password(form_data.password, user.password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(
-        data={"sub": user.email},  # use email as the subject
-        expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
-    )
+    if new_hash:
+        # bcrypt_rounds changed since this hash was made
+        user.password = new_hash
+        session.add(user)
+        await session.commit()
+    claims = user_claims(user)  # email is the subject; the rest spares get_current_user a lookup
+    # starts a refresh family, so the next half hour doesn't need the password (or bcrypt) again
+    refresh_token = await run_in_threadpool(issue_refresh_token, store, user.id, claims)
     return {
-        "access_token": access_token,
+        "access_token": _access_token(claims),
+        "refresh_token": refresh_token,
         "token_type": "bearer",
         "user": {
             "id": user.id,
@@ -64,9 +98,84 @@ async def login(
         }
     }
 
+@app.post("/token/refresh")
+def refresh_access_token(
+    refresh_token: str = Body(..., embed=True),
+    session: Session = Depends(get_session),
+    store: SessionStore = Depends(get_session_store),
+):
+    """
+    Trade a refresh token for a new access token and the next refresh token.
+    Each refresh token works once; replaying one revokes its whole family.
+    The access token's claims come from the user row as it is now, not as
+    it was at login.
+    """
+    try:
+        refresh_session, next_token = rotate_refresh_token(store, refresh_token)
+    except RefreshTokenReused:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token already used; sign in again",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user = session.get(User, refresh_session.user_id)
+    if user is None:
+        store.revoke_family(refresh_session.family_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return {
+        "access_token": _access_token(user_claims(user)),
+        "refresh_token": next_token,
+        "token_type": "bearer",
+    }
+
+@app.post("/token/revoke", status_code=204)
+def revoke_token(
+    refresh_token: str = Body(..., embed=True),
+    store: SessionStore = Depends(get_session_store),
+):
+    """End one login: its refresh token and every token rotated from it stop working"""
+    revoke_refresh_token(store, refresh_token)
+
+@app.post("/logout", status_code=204)
+def logout(
+    everywhere: bool = False,
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_session),
+    store: SessionStore = Depends(get_session_store),
+):
+    """
+    Revoke the presented access token in every worker before it expires.
+    everywhere=true also revokes all of the user's refresh tokens, signing
+    out every device once its current access token runs out.
+    """
+    payload = verify_token(token, session)
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    if "jti" not in payload:
+        raise HTTPException(status_code=400, detail="Token predates revocation support; let it expire")
+    revocation_list.revoke(session, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+    if everywhere:
+        user_id = payload.get("uid")
+        if user_id is None:
+            user = get_user(payload["sub"], session)
+            user_id = user.id if user else None
+        if user_id is not None:
+            store.revoke_user(user_id)
+
 @app.on_event("startup")
 def on_startup():
     init_db()
+    load_revocations()
 
 @app.get("/", summary="Root check")
 async def root():
@@ -0,0 +1,24 @@
+"""
+Versioned schema migrations.
+
+Each ``mNNNN_*`` module defines ``VERSION``, ``NAME`` and ``upgrade(conn)``.
+Applied versions are recorded in the ``schema_migrations`` table, and
+``init_db`` runs whatever is pending after ``create_all``, so migrations
+must be safe on a database that ``create_all`` just built.
+"""
+
+from app.migrations.runner import (
+    MIGRATIONS,
+    applied_versions,
+    current_version,
+    pending_migrations,
+    run_migrations,
+)
+
+__all__ = [
+    "MIGRATIONS",
+    "applied_versions",
+    "current_version",
+    "pending_migrations",
+    "run_migrations",
+]
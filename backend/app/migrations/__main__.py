@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Apply pending schema migrations: python -m app.migrations [--status]
+"""
+
+import sys
+
+from sqlmodel import SQLModel
+from app.db import engine
+from app.migrations import MIGRATIONS, applied_versions, run_migrations
+
+
+def main():
+    if "--status" in sys.argv:
+        applied = applied_versions(engine)
+        for migration in MIGRATIONS:
+            state = "applied" if migration.VERSION in applied else "pending"
+            print(f"{migration.VERSION:04d} {migration.NAME}: {state}")
+        return
+
+    SQLModel.metadata.create_all(engine)
+    applied = run_migrations(engine, verbose=True)
+    if not applied:
+        print("Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
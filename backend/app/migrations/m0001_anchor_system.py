@@ -0,0 +1,60 @@
+"""
+Anchor-based part attachment: give every car model that predates the
+anchor system the default set of anchor nodes.
+
+Replaces the one-off migrate_to_anchor_system.py script. The GLTF URL
+rewrites it also did are gone: those columns no longer exist.
+"""
+
+import json
+
+from sqlalchemy import text
+
+VERSION = 1
+NAME = "anchor_system"
+
+DEFAULT_ANCHORS = [
+    ("wheel_FL_anchor", "wheel", (-0.8, 0, -1.2), {"radius": 0.34, "axis": "x", "type": "wheel"}),
+    ("wheel_FR_anchor", "wheel", (0.8, 0, -1.2), {"radius": 0.34, "axis": "x", "type": "wheel"}),
+    ("wheel_RL_anchor", "wheel", (-0.8, 0, 1.2), {"radius": 0.34, "axis": "x", "type": "wheel"}),
+    ("wheel_RR_anchor", "wheel", (0.8, 0, 1.2), {"radius": 0.34, "axis": "x", "type": "wheel"}),
+    ("spoiler_anchor", "spoiler", (0, 1.2, -2.5), {"type": "spoiler"}),
+    ("hood_anchor", "hood", (0, 1.0, 0), {"type": "hood"}),
+    ("exhaust_L_anchor", "exhaust", (-0.3, 0.3, -2.8), {"type": "exhaust"}),
+    ("exhaust_R_anchor", "exhaust", (0.3, 0.3, -2.8), {"type": "exhaust"}),
+    ("headlight_L_anchor", "headlight", (-0.6, 0.8, 2.6), {"type": "headlight"}),
+    ("headlight_R_anchor", "headlight", (0.6, 0.8, 2.6), {"type": "headlight"}),
+    ("taillight_L_anchor", "taillight", (-0.6, 0.8, -2.6), {"type": "taillight"}),
+    ("taillight_R_anchor", "taillight", (0.6, 0.8, -2.6), {"type": "taillight"}),
+]
+
+
+def upgrade(conn):
+    car_ids = conn.execute(
+        text(
+            "SELECT id FROM carmodel WHERE NOT EXISTS "
+            "(SELECT 1 FROM anchor WHERE anchor.car_model_id = carmodel.id)"
+        )
+    ).scalars().all()
+
+    rows = [
+        {
+            "car_model_id": car_id,
+            "name": name,
+            "type": anchor_type,
+            "pos_x": pos[0], "pos_y": pos[1], "pos_z": pos[2],
+            "anchor_metadata": json.dumps(metadata),
+        }
+        for car_id in car_ids
+        for name, anchor_type, pos, metadata in DEFAULT_ANCHORS
+    ]
+    if rows:
+        conn.execute(
+            text(
+                "INSERT INTO anchor (car_model_id, name, type, pos_x, pos_y, pos_z, "
+                "rot_x, rot_y, rot_z, scale_x, scale_y, scale_z, anchor_metadata, bounds) "
+                "VALUES (:car_model_id, :name, :type, :pos_x, :pos_y, :pos_z, "
+                "0, 0, 0, 1, 1, 1, :anchor_metadata, '')"
+            ),
+            rows,
+        )
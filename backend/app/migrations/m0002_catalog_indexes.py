@@ -0,0 +1,28 @@
+"""
+Indexes for fitment resolution and the lookups done by every ingestion
+loop. ix_fitment_global_best is partial on scope='global' and ordered by
+quality_score so the "best global fitment" query is an index range scan.
+"""
+
+from sqlalchemy import text
+
+VERSION = 2
+NAME = "catalog_indexes"
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS ix_user_email ON "user" (email)',
+    "CREATE INDEX IF NOT EXISTS ix_carmodel_source_uid ON carmodel (source_uid)",
+    "CREATE INDEX IF NOT EXISTS ix_part_source_uid ON part (source_uid)",
+    "CREATE INDEX IF NOT EXISTS ix_anchor_car_model_name ON anchor (car_model_id, name)",
+    "CREATE INDEX IF NOT EXISTS ix_anchor_car_model_type ON anchor (car_model_id, type)",
+    "CREATE INDEX IF NOT EXISTS ix_fitment_lookup ON fitment "
+    "(car_model_id, part_id, anchor_id, part_variant_hash, scope, created_by_user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_fitment_global_best ON fitment "
+    "(car_model_id, part_id, anchor_id, part_variant_hash, quality_score DESC) "
+    "WHERE scope = 'global'",
+]
+
+
+def upgrade(conn):
+    for statement in INDEXES:
+        conn.execute(text(statement))
@@ -0,0 +1,47 @@
+"""
+Typed JSON columns for transforms, bounds, sizes and anchor metadata.
+
+On SQLite the columns stay TEXT (JSON is decoded client-side); this only
+normalizes legacy values: "" and malformed JSON become JSON null, and
+empty anchor metadata becomes {}. PostgreSQL columns are converted to
+JSONB and made nullable.
+"""
+
+from sqlalchemy import text
+
+VERSION = 3
+NAME = "json_columns"
+
+# (table, column, value used for empty/malformed rows)
+COLUMNS = [
+    ("fitment", "transform_override", "null"),
+    ("carmodel", "bounds", "null"),
+    ("anchor", "bounds", "null"),
+    ("anchor", "anchor_metadata", "{}"),
+    ("part", "intrinsic_size", "null"),
+    ("part", "bounding_box", "null"),
+]
+
+
+def upgrade(conn):
+    for table, column, empty in COLUMNS:
+        if conn.dialect.name == "sqlite":
+            conn.execute(text(
+                f"UPDATE {table} SET {column} = :empty "
+                f"WHERE {column} IS NULL OR {column} = '' OR json_valid({column}) = 0"
+            ), {"empty": empty})
+        elif conn.dialect.name == "postgresql":
+            data_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = :table AND column_name = :column"
+            ), {"table": table, "column": column}).scalar()
+            if data_type == "jsonb":
+                continue  # created by create_all with the new models
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB "
+                f"USING (CASE WHEN {column} = '' THEN '{empty}' ELSE {column} END)::jsonb"
+            ))
+            if empty == "null":
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL"))
+        else:
+            conn.execute(text(f"UPDATE {table} SET {column} = :empty WHERE {column} = ''"), {"empty": empty})
@@ -0,0 +1,21 @@
+"""
+Indexes behind the paginated list filters: parts by type/category (with id
+for keyset order) and price range, and global fitments in quality order.
+"""
+
+from sqlalchemy import text
+
+VERSION = 4
+NAME = "list_filter_indexes"
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_part_type_id ON part (type, id)",
+    "CREATE INDEX IF NOT EXISTS ix_part_category_id ON part (category, id)",
+    "CREATE INDEX IF NOT EXISTS ix_part_price ON part (price)",
+    "CREATE INDEX IF NOT EXISTS ix_fitment_scope_rank ON fitment (scope, quality_score DESC, id)",
+]
+
+
+def upgrade(conn):
+    for statement in INDEXES:
+        conn.execute(text(statement))
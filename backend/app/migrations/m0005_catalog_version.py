@@ -0,0 +1,24 @@
+"""
+Catalog version counter: one row in catalog_version, bumped in the same
+transaction as every car model, part or anchor write. Catalog GET routes
+derive their ETag from it.
+"""
+
+from sqlalchemy import text
+
+VERSION = 5
+NAME = "catalog_version"
+
+
+def upgrade(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS catalog_version ("
+        "id INTEGER NOT NULL PRIMARY KEY, "
+        "version INTEGER NOT NULL, "
+        "updated_at TIMESTAMP NOT NULL)"
+    ))
+    conn.execute(text(
+        "INSERT INTO catalog_version (id, version, updated_at) "
+        "SELECT 1, 1, CURRENT_TIMESTAMP "
+        "WHERE NOT EXISTS (SELECT 1 FROM catalog_version WHERE id = 1)"
+    ))
@@ -0,0 +1,26 @@
+"""
+Full-text index for /parts/search: an FTS5 table keyed by part id (rowid)
+over name, category, type and uploader, backfilled from existing parts.
+Part writers keep it current (see app.services.part_search). Other
+backends have no index and search falls back to LIKE matching.
+"""
+
+from sqlalchemy import text
+
+VERSION = 6
+NAME = "part_search"
+
+
+def upgrade(conn):
+    if conn.dialect.name != "sqlite":
+        return
+    conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS part_search USING fts5("
+        "name, category, type, uploader, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ))
+    conn.execute(text(
+        "INSERT INTO part_search (rowid, name, category, type, uploader) "
+        "SELECT id, name, category, type, uploader FROM part "
+        "WHERE id NOT IN (SELECT rowid FROM part_search)"
+    ))
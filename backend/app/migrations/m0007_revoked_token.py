@@ -0,0 +1,18 @@
+"""
+Revocation list for access tokens: revoked_token rows keyed by the
+token's jti, pruned once the token would have expired anyway.
+"""
+
+from sqlalchemy import text
+
+VERSION = 7
+NAME = "revoked_token"
+
+
+def upgrade(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS revoked_token ("
+        "jti VARCHAR NOT NULL PRIMARY KEY, "
+        "expires_at TIMESTAMP NOT NULL)"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_revoked_token_expires_at ON revoked_token (expires_at)"))
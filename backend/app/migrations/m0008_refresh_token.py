@@ -0,0 +1,25 @@
+"""
+Refresh sessions for the database session store: one refresh_token row per
+issued token (by SHA-256), grouped into families for rotation and
+reuse detection, and by user for bulk revocation.
+"""
+
+from sqlalchemy import text
+
+VERSION = 8
+NAME = "refresh_token"
+
+
+def upgrade(conn):
+    claims = "JSONB" if conn.dialect.name == "postgresql" else "JSON"
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS refresh_token ("
+        "token_hash VARCHAR NOT NULL PRIMARY KEY, "
+        "family_id VARCHAR NOT NULL, "
+        "user_id INTEGER NOT NULL, "
+        f"claims {claims} NOT NULL, "
+        "expires_at TIMESTAMP NOT NULL, "
+        "used_at TIMESTAMP)"
+    ))
+    for column in ("family_id", "user_id", "expires_at"):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_refresh_token_{column} ON refresh_token ({column})"))
@@ -0,0 +1,18 @@
+"""
+Row versions for car models, anchors and parts. Bumped on every ORM
+update; the placement cache keys its entries by them.
+"""
+
+from sqlalchemy import inspect, text
+
+VERSION = 9
+NAME = "row_versions"
+
+TABLES = ["carmodel", "anchor", "part"]
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    for table in TABLES:
+        if "version" not in {column["name"] for column in inspector.get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
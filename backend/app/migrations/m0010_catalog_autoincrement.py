@@ -0,0 +1,49 @@
+"""
+AUTOINCREMENT ids for car models, anchors and parts on SQLite.
+
+Without it SQLite hands the largest deleted id to the next insert, which
+starts again at version 1, so (table, id, version) would name two different
+rows and the per-row caches (pre-serialized JSON, placements) could serve
+the deleted row's data in any worker that did not see the delete. SQLite
+cannot add AUTOINCREMENT in place: each table is rebuilt from its own
+CREATE statement, rows and indexes copied over. Other backends' sequences
+never reuse ids.
+"""
+
+import re
+
+from sqlalchemy import text
+
+VERSION = 10
+NAME = "catalog_autoincrement"
+
+TABLES = ["carmodel", "anchor", "part"]
+
+
+def _autoincrement_sql(create_sql: str, table: str) -> str:
+    # SQLAlchemy writes "id INTEGER NOT NULL, ..., PRIMARY KEY (id)"
+    sql = re.sub(r",\s*PRIMARY KEY \(id\)", "", create_sql, count=1)
+    sql = re.sub(r"\bid INTEGER NOT NULL\b", "id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT", sql, count=1)
+    return re.sub(rf'^CREATE TABLE "?{table}"?', f"CREATE TABLE {table}_new", sql, count=1)
+
+
+def upgrade(conn):
+    if conn.dialect.name != "sqlite":
+        return
+    for table in TABLES:
+        create_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table}
+        ).scalar()
+        if create_sql is None or "AUTOINCREMENT" in create_sql.upper():
+            continue  # created from the current models
+        indexes = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+            {"name": table},
+        ).scalars().all()
+        columns = ", ".join(row[1] for row in conn.execute(text(f"PRAGMA table_info({table})")))
+        conn.execute(text(_autoincrement_sql(create_sql, table)))
+        conn.execute(text(f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {table}"))
+        conn.execute(text(f"DROP TABLE {table}"))
+        conn.execute(text(f"ALTER TABLE {table}_new RENAME TO {table}"))
+        for index in indexes:
+            conn.execute(text(index))
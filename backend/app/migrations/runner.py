@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.engine import Engine
+
+from app.migrations import (
+    m0001_anchor_system,
+    m0002_catalog_indexes,
+    m0003_json_columns,
+    m0004_list_filter_indexes,
+    m0005_catalog_version,
+    m0006_part_search,
+    m0007_revoked_token,
+    m0008_refresh_token,
+    m0009_row_versions,
+    m0010_catalog_autoincrement,
+)
+
+# keep in version order; never renumber or edit a migration once shipped
+MIGRATIONS = [
+    m0001_anchor_system,
+    m0002_catalog_indexes,
+    m0003_json_columns,
+    m0004_list_filter_indexes,
+    m0005_catalog_version,
+    m0006_part_search,
+    m0007_revoked_token,
+    m0008_refresh_token,
+    m0009_row_versions,
+    m0010_catalog_autoincrement,
+]
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """Versions already recorded in ``schema_migrations``."""
+    _metadata.create_all(engine)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(engine: Engine) -> int:
+    """Highest applied migration version, 0 for an unmigrated database."""
+    return max(applied_versions(engine), default=0)
+
+
+def pending_migrations(engine: Engine) -> List:
+    applied = applied_versions(engine)
+    return [m for m in MIGRATIONS if m.VERSION not in applied]
+
+
+def run_migrations(engine: Engine, verbose: bool = False) -> List[int]:
+    """
+    Apply pending migrations in order, each in its own transaction together
+    with its ``schema_migrations`` row. Returns the versions applied.
+    """
+    applied = []
+    for migration in pending_migrations(engine):
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=migration.VERSION,
+                    name=migration.NAME,
+                    applied_at=datetime.utcnow(),
+                )
+            )
+        applied.append(migration.VERSION)
+        if verbose:
+            print(f"Applied migration {migration.VERSION:04d} {migration.NAME}")
+    return applied
@@ -1,8 +1,69 @@
+import json
+from sqlalchemy import Column, Index, JSON, event
+from sqlalchemy.orm import object_session
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+from pydantic import BaseModel, ConfigDict, conlist
 from sqlmodel import Field, SQLModel, Relationship
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 import uuid
 
+Vector3 = conlist(float, min_length=3, max_length=3)
+
+class Transform(BaseModel):
+    """Position / euler rotation / scale override for a placed part"""
+    model_config = ConfigDict(extra="allow")
+
+    position: Vector3 = [0.0, 0.0, 0.0]
+    rotation_euler: Vector3 = [0.0, 0.0, 0.0]
+    scale: Vector3 = [1.0, 1.0, 1.0]
+
+class Bounds(BaseModel):
+    """Axis-aligned bounding box"""
+    model_config = ConfigDict(extra="allow")
+
+    min: Vector3
+    max: Vector3
+
+class IntrinsicSize(BaseModel):
+    """Real-world part dimensions used for auto-scaling (meters)"""
+    model_config = ConfigDict(extra="allow")
+
+    radius: Optional[float] = None
+    width: Optional[float] = None
+    height: Optional[float] = None
+    length: Optional[float] = None
+
+JSONVariant = JSON().with_variant(JSONB(), "postgresql")
+
+class PydanticJSON(TypeDecorator):
+    """
+    JSON column holding a pydantic model. Values are validated on the way
+    in and decoded into the model once when the row is loaded. Legacy JSON
+    strings and "" (meaning unset) are accepted on write.
+    """
+    impl = JSONVariant
+    cache_ok = True
+
+    def __init__(self, model: type, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model = model
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            value = json.loads(value) if value else None
+        if value is None:
+            return None
+        if not isinstance(value, self.model):
+            value = self.model.model_validate(value)
+        return value.model_dump(exclude_none=True)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.model.model_validate(value)
+
 class Item(SQLModel, table=True):
     id: int = Field(primary_key=True)
     name: str
@@ -11,16 +72,33 @@ class Item(SQLModel, table=True):
 
 class User(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
-    email: str
+    email: str = Field(index=True)
     password: str
     first_name: str
     last_name: str
 
+class RevokedToken(SQLModel, table=True):
+    """Access tokens invalidated before their exp (logout); kept until they would have expired"""
+    __tablename__ = "revoked_token"
+    jti: str = Field(primary_key=True)
+    expires_at: datetime = Field(index=True)
+
+class RefreshToken(SQLModel, table=True):
+    """Server-side refresh session (database session store); only the token's SHA-256 is kept"""
+    __tablename__ = "refresh_token"
+    token_hash: str = Field(primary_key=True)
+    family_id: str = Field(index=True)  # one login and every token rotated out of it
+    user_id: int = Field(index=True)
+    claims: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONVariant, nullable=False, default=dict))
+    expires_at: datetime = Field(index=True)
+    used_at: Optional[datetime] = None  # set when rotated; a second use revokes the family
+
 class CarModelPartLink(SQLModel, table=True):
     car_model_id: int = Field(foreign_key="carmodel.id", primary_key=True)
     part_id: int = Field(foreign_key="part.id", primary_key=True)
 
 class CarModel(SQLModel, table=True):
+    __table_args__ = {"sqlite_autoincrement": True}  # ids are never reused (see migration 10)
     id: int = Field(default=None, primary_key=True)
     name: str
     manufacturer: str
@@ -32,16 +110,18 @@ class CarModel(SQLModel, table=True):
     attribution_html: str = ""  # Required attribution text
     source_url: str = ""  # Original Sketchfab URL
     uploader: str = ""  # Original creator name
-    source_uid: str = ""  # Sketchfab model UID
-    bounds: str = ""  # JSON string of bounding box
+    source_uid: str = Field(default="", index=True)  # Sketchfab model UID
+    bounds: Optional[Bounds] = Field(default=None, sa_column=Column(PydanticJSON(Bounds)))
     scale_factor: float = 1.0  # Scale factor for normalization
     unit_scale: float = 1.0  # meters per unit
     default_up_axis: str = "Y"  # up axis of the model
     anchors_ready: bool = False  # whether anchors have been set up
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})  # bumped on every update (bump_row_version); keys the placement cache
     parts: List["Part"] = Relationship(back_populates="car_model", link_model=CarModelPartLink)
 
 class Anchor(SQLModel, table=True):
     """Car-specific anchor nodes for part attachment"""
+    __table_args__ = {"sqlite_autoincrement": True}  # ids are never reused (see migration 10)
     id: int = Field(default=None, primary_key=True)
     car_model_id: int = Field(foreign_key="carmodel.id")
     name: str  # e.g., "wheel_FL_anchor", "spoiler_anchor"
@@ -55,10 +135,11 @@ class Anchor(SQLModel, table=True):
     scale_x: float = 1.0
     scale_y: float = 1.0
     scale_z: float = 1.0
-    anchor_metadata: str = ""  # JSON string for extras like radius, axis, symmetry pair
+    anchor_metadata: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSONVariant, nullable=False, default=dict))  # extras like radius, axis, symmetry pair
     symmetry_pair_id: Optional[int] = None  # ID of symmetric anchor (e.g., FL <-> FR)
     expected_diameter: Optional[float] = None  # for wheels, expected wheel diameter
-    bounds: str = ""  # JSON string of anchor bounds
+    bounds: Optional[Bounds] = Field(default=None, sa_column=Column(PydanticJSON(Bounds)))  # anchor bounds
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})  # bumped on every update (bump_row_version)
 
 class Fitment(SQLModel, table=True):
     """User and community fitment overrides for part placement"""
@@ -67,7 +148,7 @@ class Fitment(SQLModel, table=True):
     part_id: int = Field(foreign_key="part.id")
     anchor_id: int = Field(foreign_key="anchor.id")
     part_variant_hash: str = ""  # hash of part GLB + material/size
-    transform_override: str = ""  # JSON string of position/rotation/scale override
+    transform_override: Optional[Transform] = Field(default=None, sa_column=Column(PydanticJSON(Transform)))  # position/rotation/scale override
     quality_score: float = 0.5  # 0-1 score from moderation/usage
     scope: str = "user"  # "user", "org", "global"
     created_by_user_id: Optional[int] = Field(foreign_key="user.id", default=None)
@@ -75,6 +156,13 @@ class Fitment(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     version: int = 1  # for versioning and rollbacks
 
+class CatalogVersion(SQLModel, table=True):
+    """Single-row counter bumped by every catalog write; drives catalog ETags"""
+    __tablename__ = "catalog_version"
+    id: int = Field(default=1, primary_key=True)
+    version: int = 1
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
 # part-to-part compatibility
 class PartCompatibility(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
@@ -94,6 +182,7 @@ class SavedCar(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class Part(SQLModel, table=True):
+    __table_args__ = {"sqlite_autoincrement": True}  # ids are never reused (see migration 10)
     id: int = Field(default=None, primary_key=True)
     name: str
     type: str  # e.g. "wheel", "engine", "exterior"
@@ -106,12 +195,12 @@ class Part(SQLModel, table=True):
     attribution_html: str = ""
     source_url: str = ""
     uploader: str = ""
-    source_uid: str = ""
-    intrinsic_size: str = ""  # JSON string for auto-scaling (e.g., wheel radius)
+    source_uid: str = Field(default="", index=True)
+    intrinsic_size: Optional[IntrinsicSize] = Field(default=None, sa_column=Column(PydanticJSON(IntrinsicSize)))  # for auto-scaling (e.g., wheel radius)
     nominal_size: float = 0.0  # nominal size in mm
     pivot_hint: str = "center"  # e.g., "center", "bottom-center", "hub-center"
     symmetry: str = ""  # "L", "R", "LR", "" (for symmetric parts)
-    bounding_box: str = ""  # JSON string of part bounding box
+    bounding_box: Optional[Bounds] = Field(default=None, sa_column=Column(PydanticJSON(Bounds)))  # part bounding box
     attach_to: str = ""  # e.g. "wheel_FL_anchor", "spoiler_anchor"
     pos_x: float = 0.0
     pos_y: float = 0.0
@@ -122,7 +211,52 @@ class Part(SQLModel, table=True):
     scale_x: float = 1.0
     scale_y: float = 1.0
     scale_z: float = 1.0
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})  # bumped on every update (bump_row_version)
     car_model: List[CarModel] = Relationship(back_populates="parts", link_model=CarModelPartLink)
     saved_cars: List["SavedCar"] = Relationship(back_populates="parts", link_model=SavedCarPartLink)
 
-Part.car_model = Relationship(back_populates="parts")
\ No newline at end of file
+Part.car_model = Relationship(back_populates="parts")
+
+def bump_row_version(mapper, connection, target):
+    # before_update also fires for rows touched without a net change
+    session = object_session(target)
+    if session is not None and session.is_modified(target, include_collections=False):
+        target.version = (target.version or 0) + 1
+
+for _versioned in (CarModel, Anchor, Part):
+    event.listen(_versioned, "before_update", bump_row_version)
+
+# Anchor lookups by (car, name) and (car, type) in placement and manual adjustment
+Index("ix_anchor_car_model_name", Anchor.car_model_id, Anchor.name)
+Index("ix_anchor_car_model_type", Anchor.car_model_id, Anchor.type)
+
+# Exact fitment lookups (create/update, user-scoped best fitment)
+Index(
+    "ix_fitment_lookup",
+    Fitment.car_model_id,
+    Fitment.part_id,
+    Fitment.anchor_id,
+    Fitment.part_variant_hash,
+    Fitment.scope,
+    Fitment.created_by_user_id,
+)
+
+# Global best fitment: scope='global' ORDER BY quality_score DESC
+Index(
+    "ix_fitment_global_best",
+    Fitment.car_model_id,
+    Fitment.part_id,
+    Fitment.anchor_id,
+    Fitment.part_variant_hash,
+    Fitment.quality_score.desc(),
+    sqlite_where=Fitment.scope == "global",
+    postgresql_where=Fitment.scope == "global",
+)
+
+# Paginated part filters (keyset on id within a type/category, price range)
+Index("ix_part_type_id", Part.type, Part.id)
+Index("ix_part_category_id", Part.category, Part.id)
+Index("ix_part_price", Part.price)
+
+# Paginated global fitment listing: ORDER BY quality_score DESC, id
+Index("ix_fitment_scope_rank", Fitment.scope, Fitment.quality_score.desc(), Fitment.id)
@@ -0,0 +1,62 @@
+"""
+Keyset (cursor) pagination helpers for the catalog list routes.
+
+Lists are ordered by a unique key and a page is ``WHERE key > :after
+ORDER BY key LIMIT :limit``, so every page is an index range scan no matter
+how deep the client pages. The cursor is the opaque, url-safe encoding of
+the last row's key. The body stays a plain JSON list; the next page is
+advertised in a ``Link: <...>; rel="next"`` header and ``X-Next-Cursor``.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Request, Response
+
+from app.config import get_settings
+
+
+def encode_cursor(*key: Any) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """Decode a cursor whose key parts have ``types``; 400 if it is malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        key = None
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(isinstance(value, expected) for value, expected in zip(key, types))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return key
+
+
+def page_limit(limit: Optional[int] = Query(None, ge=1)) -> int:
+    # FASTAPI dependency: default page size, capped at the configured maximum
+    settings = get_settings()
+    return min(limit or settings.page_size_default, settings.page_size_max)
+
+
+def paginate(rows: Sequence, limit: int, key) -> tuple:
+    """
+    Split ``limit + 1`` fetched rows into the page and the next cursor
+    (None on the last page). ``key`` maps a row to its cursor values.
+    """
+    if len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    return page, encode_cursor(*key(page[-1]))
+
+
+def set_next_page(request: Request, response: Response, next_cursor: Optional[str]):
+    if next_cursor is None:
+        return
+    next_url = request.url.remove_query_params("after").include_query_params(after=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
@@ -0,0 +1,56 @@
+"""
+Sparse fieldsets for the catalog list routes.
+
+``?fields=name,price`` or a named ``?view=card`` selects only those columns
+in SQL and serializes the plain rows straight to JSON, skipping ORM
+hydration and response-model validation. ``id`` is always included since
+it is the pagination key.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter
+
+PART_VIEWS = {
+    # what the parts selector renders
+    "card": ("id", "name", "type", "category", "price", "thumbnail_url"),
+}
+
+CAR_MODEL_VIEWS = {
+    "card": ("id", "name", "manufacturer", "year", "thumbnail_url"),
+}
+
+_rows = TypeAdapter(List[Dict[str, Any]])
+
+
+def selected_fields(model, fields: Optional[str], view: Optional[str], views: Dict[str, Sequence[str]]) -> Optional[List[str]]:
+    """Column names to select, or None for the full model. 400 on unknown names."""
+    if fields is None and view is None:
+        return None
+    names = ["id"]
+    if view is not None:
+        if view not in views:
+            raise HTTPException(status_code=400, detail=f"Unknown view {view!r}; expected one of {sorted(views)}")
+        names.extend(views[view])
+    if fields:
+        names.extend(name.strip() for name in fields.split(",") if name.strip())
+    columns = model.__table__.columns
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+
+def projected_columns(model, names: Sequence[str]) -> list:
+    return [model.__table__.columns[name] for name in names]
+
+
+def rows_response(rows: List[Dict[str, Any]], response: Optional[Response] = None) -> Response:
+    """
+    Encode rows with pydantic-core (datetimes and JSON-column models included)
+    without a response_model pass. Headers already set on the route's injected
+    ``response`` (Link, ETag, ...) are carried over.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=_rows.dump_json(rows), media_type="application/json", headers=headers)
@@ -0,0 +1,104 @@
+"""
+Per-request SQL accounting.
+
+``install_query_counter`` hooks cursor events on an engine and adds each
+statement's count and duration to the stats object of the current request.
+``QueryStatsMiddleware`` opens that object, reports it in a ``Server-Timing``
+header and checks it against the configured query budgets.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in enforce mode when a budgeted route runs too many queries."""
+
+
+# the object is mutated in place, so threadpool workers and async driver
+# greenlets (which run on a copy of the request context) report into it
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def install_query_counter(engine: Engine):
+    """Count statements on ``engine`` (pass ``async_engine.sync_engine`` for async engines)."""
+    if getattr(engine, "_query_counter_installed", False):
+        return
+    engine._query_counter_installed = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += time.perf_counter() - started
+
+
+def _route_key(scope) -> str:
+    route = scope.get("route")
+    path = route.path if route is not None else scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding ``Server-Timing: db;dur=<ms>;desc="<n> queries"``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        settings = get_settings()
+        if scope["type"] != "http" or not settings.query_stats_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+
+        route = _route_key(scope)
+        listed = route in settings.query_budgets
+        budget = settings.query_budgets[route] if listed else settings.query_budget_default or None
+        if budget is not None and stats.count > budget:
+            message = f"{route} ran {stats.count} queries (budget {budget}, {stats.duration * 1000:.1f} ms)"
+            if settings.query_budget_enforce and listed:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
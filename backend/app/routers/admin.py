@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.auth import get_admin_user
+from app.config import get_settings
+from app.db import read_engine
+from app.models import User
+from app.serialization import row_json_cache
+from app.services.catalog_cache import catalog_cache
+from app.services.catalog_sync import export_ndjson
+from app.services.compatibility_graph import compatibility_graph
+from app.services.part_search import search_cache
+from app.services.placement_cache import placement_cache
+from app.services.price_index import price_index
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/cache/stats")
+async def catalog_cache_stats(admin: User = Depends(get_admin_user)):
+    """Hit/miss counters for the in-process catalog cache (this worker only)"""
+    return catalog_cache.stats()
+
+@router.get("/cache/placements/stats")
+async def placement_cache_stats(admin: User = Depends(get_admin_user)):
+    """Hit rate of memoized placements (counters are this worker's; the store may be shared)"""
+    return placement_cache.stats()
+
+@router.post("/cache/clear", status_code=204)
+async def clear_catalog_cache(admin: User = Depends(get_admin_user)):
+    catalog_cache.invalidate()
+    price_index.invalidate()
+    compatibility_graph.invalidate()
+    placement_cache.invalidate()
+    row_json_cache.clear()
+    search_cache.invalidate()
+    return
+
+@router.get("/export")
+def export_catalog(admin: User = Depends(get_admin_user)):
+    """
+    Stream the catalog (car models, anchors, parts, link tables, global
+    fitments) as NDJSON. Load it elsewhere with scripts/catalog_sync.py import.
+    """
+    # a sync generator: Starlette pulls each chunk in the threadpool
+    return StreamingResponse(
+        export_ndjson(read_engine, get_settings().catalog_sync_batch_size),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="catalog.ndjson"'},
+    )
@@ -1,37 +1,160 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from app.db import get_session
-from app.models import CarModel, Anchor
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from app.conditional import catalog_etag
+from app.db import get_async_session, get_async_read_session
+from app.auth import get_optional_current_user
+from app.models import CarModel, Anchor, Transform, User
+from app.pagination import decode_cursor, page_limit, paginate, set_next_page
+from app.projection import CAR_MODEL_VIEWS, projected_columns, rows_response, selected_fields
+from app.serialization import catalog_rows_response, row_json_cache
+from app.services.auto_placement_service import AutoPlacementService
+from app.services.catalog_cache import catalog_cache, bump_catalog_version, CAR_MODELS, PARTS, ANCHORS
+from app.services.compatibility_graph import compatibility_graph
+from app.services.placement_cache import placement_cache
 
 router = APIRouter(prefix="/car_models", tags=["car_models"])
 
+class SceneRequest(BaseModel):
+    part_ids: List[int]
+    part_variant_hashes: Dict[int, str] = {}  # part id -> variant hash, "" when omitted
+
+class ScenePart(BaseModel):
+    part_id: int
+    anchor: Optional[Anchor]
+    transform: Transform
+    source: str  # "user", "global", "auto", or "default" when no anchor matches
+
+class SceneResponse(BaseModel):
+    car_model: CarModel
+    parts: List[ScenePart]
+    missing_part_ids: List[int]
+
+# parts x anchors per /placements call; each pair is 25 floats in the response
+MAX_PLACEMENTS = 50000
+
+class PlacementRequest(BaseModel):
+    part_ids: List[int]
+    anchor_ids: List[int]
+
 @router.post("/", response_model=CarModel, status_code=201)
-def create_car_model(car_model:CarModel, session: Session=Depends(get_session)):
+async def create_car_model(car_model:CarModel, session: AsyncSession=Depends(get_async_session)):
     session.add(car_model)
-    session.commit()
-    session.refresh(car_model)
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    await session.refresh(car_model)
+    catalog_cache.invalidate(CAR_MODELS)
     return car_model
 
 @router.get("/", response_model=list[CarModel])
-def list_car_models(session: Session=Depends(get_session)):
-    return session.exec(select(CarModel)).all()
+async def list_car_models(
+    request: Request,
+    response: Response,
+    etag: str = Depends(catalog_etag),
+    limit: int = Depends(page_limit),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's Link header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    view: Optional[str] = Query(None, description="Named field set, e.g. 'card'"),
+    session: AsyncSession=Depends(get_async_read_session)
+):
+    after_id = decode_cursor(after, int)[0] if after else None
+    names = selected_fields(CarModel, fields, view, CAR_MODEL_VIEWS)
+
+    async def load():
+        if names is None:
+            statement = select(CarModel)
+        else:
+            statement = select(*projected_columns(CarModel, names))
+        statement = statement.order_by(CarModel.id).limit(limit + 1)
+        if after_id is not None:
+            statement = statement.where(CarModel.id > after_id)
+        rows = (await session.exec(statement)).all()
+        if names is None:
+            return rows
+        return [dict(row._mapping) for row in rows]
+
+    fieldset = None if names is None else tuple(names)
+    rows = await catalog_cache.aget_or_load((CAR_MODELS, "page", after_id, limit, fieldset), load)
+    if names is None:
+        car_models, next_cursor = paginate(rows, limit, lambda car_model: (car_model.id,))
+        set_next_page(request, response, next_cursor)
+        return catalog_rows_response(car_models, response)
+    car_models, next_cursor = paginate(rows, limit, lambda car_model: (car_model["id"],))
+    set_next_page(request, response, next_cursor)
+    return rows_response(car_models, response)
 
 @router.get("/{car_model_id}", response_model=CarModel)
-def get_car_model(car_model_id: int, session: Session = Depends(get_session)):
-    car_model = session.get(CarModel, car_model_id)
+async def get_car_model(
+    car_model_id: int,
+    etag: str = Depends(catalog_etag),
+    session: AsyncSession = Depends(get_async_read_session)
+):
+    car_model = await catalog_cache.aget_or_load(
+        (CAR_MODELS, car_model_id), lambda: session.get(CarModel, car_model_id)
+    )
     if not car_model:
         raise HTTPException(status_code=404, detail="Car model not found")
     return car_model
 
 @router.get("/{car_model_id}/anchors", response_model=list[Anchor])
-def get_car_anchors(car_model_id: int, session: Session = Depends(get_session)):
+async def get_car_anchors(
+    car_model_id: int,
+    response: Response,
+    etag: str = Depends(catalog_etag),
+    session: AsyncSession = Depends(get_async_read_session)
+):
     """Get anchor nodes for a specific car model"""
-    anchors = session.exec(select(Anchor).where(Anchor.car_model_id == car_model_id)).all()
-    return anchors
+    async def load():
+        return (await session.exec(select(Anchor).where(Anchor.car_model_id == car_model_id))).all()
+    anchors = await catalog_cache.aget_or_load((ANCHORS, car_model_id), load)
+    return catalog_rows_response(anchors, response)
+
+@router.post("/{car_model_id}/scene", response_model=SceneResponse)
+async def assemble_scene(
+    car_model_id: int,
+    scene: SceneRequest,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """Resolve the anchor and transform of every part in a configuration in one call"""
+    resolved = await session.run_sync(
+        lambda sync_session: AutoPlacementService(sync_session).resolve_scene(
+            car_model_id, scene.part_ids, scene.part_variant_hashes, current_user
+        )
+    )
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Car model not found")
+    return resolved
+
+@router.post("/{car_model_id}/placements")
+async def compute_placements(
+    car_model_id: int,
+    request: PlacementRequest,
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """
+    Auto-placement of every requested part at every requested anchor, as
+    nested [part][anchor] lists of position / rotation_euler / scale and
+    row-major 4x4 matrices. Ignores fitments; see /scene for those.
+    """
+    if len(set(request.part_ids)) * len(set(request.anchor_ids)) > MAX_PLACEMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PLACEMENTS} part/anchor pairs per request")
+    placements = await session.run_sync(
+        lambda sync_session: AutoPlacementService(sync_session).compute_auto_placement_batch(
+            car_model_id, request.part_ids, request.anchor_ids
+        )
+    )
+    if placements is None:
+        raise HTTPException(status_code=404, detail="Car model not found")
+    # orjson writes the numpy arrays directly
+    return ORJSONResponse(placements)
 
 @router.put("/{car_model_id}", response_model=CarModel)
-def update_car_model(car_model_id: int, car_model: CarModel, session: Session = Depends(get_session)):
-    db_car_model = session.get(CarModel, car_model_id)
+async def update_car_model(car_model_id: int, car_model: CarModel, session: AsyncSession = Depends(get_async_session)):
+    db_car_model = await session.get(CarModel, car_model_id)
     if not db_car_model:
         raise HTTPException(status_code=404, detail="Car model not found")
     db_car_model.name = car_model.name
@@ -39,15 +162,24 @@ def update_car_model(car_model_id: int, car_model: CarModel, session: Session =
     db_car_model.year = car_model.year
     db_car_model.gltf_url = car_model.gltf_url
     session.add(db_car_model)
-    session.commit()
-    session.refresh(db_car_model)
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    await session.refresh(db_car_model)
+    catalog_cache.invalidate(CAR_MODELS)
+    placement_cache.invalidate_car_model(car_model_id)
     return db_car_model
 
 @router.delete("/{car_model_id}", status_code=204)
-def delete_car_model(car_model_id: int, session: Session = Depends(get_session)):
-    car_model = session.get(CarModel, car_model_id)
+async def delete_car_model(car_model_id: int, session: AsyncSession = Depends(get_async_session)):
+    car_model = await session.get(CarModel, car_model_id)
     if not car_model:
         raise HTTPException(status_code=404, detail="Car model not found")
-    session.delete(car_model)
-    session.commit()
+    await session.delete(car_model)
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    # anchors and per-car part lists hang off the car model
+    catalog_cache.invalidate(CAR_MODELS, ANCHORS, PARTS)
+    row_json_cache.discard(CarModel.__tablename__, car_model_id)
+    compatibility_graph.remove_car_model(car_model_id)
+    placement_cache.invalidate_car_model(car_model_id)
     return
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select
-from app.db import get_session
-from app.models import Fitment, CarModel, Part, Anchor, User
-from app.auth import get_current_user
+import asyncio
+import logging
+import anyio
+from starlette.concurrency import run_in_threadpool
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, WebSocket, WebSocketDisconnect
+from sqlalchemy import and_, func, or_, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_async_session, get_async_read_session
+from app.config import get_settings
+from app.models import Fitment, CarModel, Part, Anchor, User, Transform, Vector3
+from app.auth import authenticate_token, get_current_user, get_optional_current_user
+from app.pagination import decode_cursor, page_limit, paginate, set_next_page
+from app.services.placement_cache import placement_cache
 from typing import List, Optional
-from pydantic import BaseModel
-import json
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/fitments", tags=["fitments"])
 
 class FitmentCreate(BaseModel):
@@ -15,7 +25,7 @@ class FitmentCreate(BaseModel):
     part_id: int
     anchor_id: int
     part_variant_hash: str = ""
-    transform_override: dict
+    transform_override: Transform
     scope: str = "user"
 
 class FitmentResponse(BaseModel):
@@ -24,7 +34,7 @@ class FitmentResponse(BaseModel):
     part_id: int
     anchor_id: int
     part_variant_hash: str
-    transform_override: dict
+    transform_override: Optional[Transform]
     quality_score: float
     scope: str
     created_by_user_id: Optional[int]
@@ -32,25 +42,44 @@ class FitmentResponse(BaseModel):
     updated_at: datetime
     version: int
 
+_fitment_list = TypeAdapter(List[FitmentResponse])
+_optional_fitment_list = TypeAdapter(List[Optional[FitmentResponse]])
+
+BEST_FITMENT_BATCH_MAX = 500
+
+class FitmentKey(BaseModel):
+    car_model_id: int
+    part_id: int
+    anchor_id: int
+    part_variant_hash: str = ""
+
+class BestFitmentBatchRequest(BaseModel):
+    items: List[FitmentKey] = Field(max_length=BEST_FITMENT_BATCH_MAX)
+
 class ManualAdjustmentSave(BaseModel):
     car_model_id: int
     part_id: int
-    transform: dict
+    transform: Transform
     
     class Config:
         extra = "allow"  # Allow extra fields to be more permissive
 
 @router.get("/", response_model=List[FitmentResponse])
-def get_fitments(
+async def get_fitments(
+    request: Request,
+    response: Response,
     car_model_id: Optional[int] = Query(None),
     part_id: Optional[int] = Query(None),
     anchor_id: Optional[int] = Query(None),
     scope: str = Query("global"),
-    session: Session = Depends(get_session),
+    limit: int = Depends(page_limit),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's Link header"),
+    session: AsyncSession = Depends(get_async_read_session),
     current_user: Optional[User] = None  # Make authentication optional for testing
 ):
     """Get fitments with optional filtering"""
-    query = select(Fitment)
+    # plain column rows: no ORM identity-map bookkeeping for a read-only list
+    query = select(*Fitment.__table__.columns)
     
     if car_model_id:
         query = query.where(Fitment.car_model_id == car_model_id)
@@ -67,38 +96,46 @@ def get_fitments(
     elif scope == "org":
         query = query.where(Fitment.scope == "org")
     
-    # Order by quality score for global fitments
+    # Order by quality score for global fitments; id breaks ties so the
+    # ordering is total and pages never skip or repeat rows
     if scope == "global":
-        query = query.order_by(Fitment.quality_score.desc())
-    
-    fitments = session.exec(query).all()
-    
-    # Convert transform_override from JSON string to dict
-    result = []
-    for fitment in fitments:
-        fitment_dict = fitment.dict()
-        try:
-            fitment_dict["transform_override"] = json.loads(fitment.transform_override) if fitment.transform_override else {}
-        except:
-            fitment_dict["transform_override"] = {}
-        result.append(FitmentResponse(**fitment_dict))
+        query = query.order_by(Fitment.quality_score.desc(), Fitment.id)
+        if after:
+            after_score, after_id = decode_cursor(after, (int, float), str)
+            query = query.where(or_(
+                Fitment.quality_score < after_score,
+                and_(Fitment.quality_score == after_score, Fitment.id > after_id),
+            ))
+        page_key = lambda fitment: (fitment.quality_score, fitment.id)
+    else:
+        query = query.order_by(Fitment.id)
+        if after:
+            query = query.where(Fitment.id > decode_cursor(after, str)[0])
+        page_key = lambda fitment: (fitment.id,)
     
-    return result
+    rows = (await session.exec(query.limit(limit + 1))).all()
+    fitments, next_cursor = paginate(rows, limit, page_key)
+    set_next_page(request, response, next_cursor)
+    # columns are already typed (transform decoded and validated at load), so
+    # construct the response models directly and let pydantic-core encode the
+    # list in one pass, bypassing response_model validation
+    body = _fitment_list.dump_json([FitmentResponse.model_construct(**fitment._mapping) for fitment in fitments])
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
 
 @router.get("/best", response_model=Optional[FitmentResponse])
-def get_best_fitment(
+async def get_best_fitment(
     car_model_id: int,
     part_id: int,
     anchor_id: int,
     part_variant_hash: str = "",
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
     current_user: Optional[User] = None  # Make authentication optional for testing
 ):
     """Get the best fitment for a specific car-part-anchor combination"""
     
     # First try user fitment
     if current_user:
-        user_fitment = session.exec(
+        user_fitment = (await session.exec(
             select(Fitment).where(
                 Fitment.car_model_id == car_model_id,
                 Fitment.part_id == part_id,
@@ -107,18 +144,13 @@ def get_best_fitment(
                 Fitment.scope == "user",
                 Fitment.created_by_user_id == current_user.id
             )
-        ).first()
+        )).first()
         
         if user_fitment:
-            fitment_dict = user_fitment.dict()
-            try:
-                fitment_dict["transform_override"] = json.loads(user_fitment.transform_override) if user_fitment.transform_override else {}
-            except:
-                fitment_dict["transform_override"] = {}
-            return FitmentResponse(**fitment_dict)
+            return user_fitment
     
     # Then try global best fitment
-    global_fitment = session.exec(
+    global_fitment = (await session.exec(
         select(Fitment).where(
             Fitment.car_model_id == car_model_id,
             Fitment.part_id == part_id,
@@ -126,43 +158,87 @@ def get_best_fitment(
             Fitment.part_variant_hash == part_variant_hash,
             Fitment.scope == "global"
         ).order_by(Fitment.quality_score.desc())
-    ).first()
+    )).first()
     
     if global_fitment:
-        fitment_dict = global_fitment.dict()
-        try:
-            fitment_dict["transform_override"] = json.loads(global_fitment.transform_override) if global_fitment.transform_override else {}
-        except:
-            fitment_dict["transform_override"] = {}
-        return FitmentResponse(**fitment_dict)
+        return global_fitment
     
     return None
 
 
 
+def _best_per_key(keys, *scope_filter):
+    """Top-ranked fitment per (car, part, anchor, variant) key, via row_number() in one query"""
+    key_columns = (Fitment.car_model_id, Fitment.part_id, Fitment.anchor_id, Fitment.part_variant_hash)
+    rank = func.row_number().over(
+        partition_by=key_columns,
+        order_by=(Fitment.quality_score.desc(), Fitment.updated_at.desc()),
+    ).label("rank")
+    ranked = (
+        select(*Fitment.__table__.columns, rank)
+        .where(tuple_(*key_columns).in_(keys), *scope_filter)
+        .subquery()
+    )
+    return select(*(ranked.c[column.name] for column in Fitment.__table__.columns)).where(ranked.c.rank == 1)
+
+@router.post("/best:batch", response_model=List[Optional[FitmentResponse]])
+async def get_best_fitments_batch(
+    batch: BestFitmentBatchRequest,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """
+    Batch form of GET /fitments/best: the user's fitment, else the best
+    global one, for each key. Results (null when none) follow input order.
+    """
+    keys = list({
+        (item.car_model_id, item.part_id, item.anchor_id, item.part_variant_hash): None for item in batch.items
+    })
+    found = {}
+    if keys:
+        # global first, so user fitments overwrite them
+        rows = (await session.exec(_best_per_key(keys, Fitment.scope == "global"))).all()
+        if current_user:
+            rows += (await session.exec(
+                _best_per_key(keys, Fitment.scope == "user", Fitment.created_by_user_id == current_user.id)
+            )).all()
+        for row in rows:
+            found[(row.car_model_id, row.part_id, row.anchor_id, row.part_variant_hash)] = row
+
+    results = []
+    for item in batch.items:
+        row = found.get((item.car_model_id, item.part_id, item.anchor_id, item.part_variant_hash))
+        results.append(FitmentResponse.model_construct(**row._mapping) if row is not None else None)
+    return Response(content=_optional_fitment_list.dump_json(results), media_type="application/json")
+
+def _fitment_changed(fitment: Fitment):
+    # memoized placements resolve to the best global fitment before auto placement
+    if fitment.scope == "global":
+        placement_cache.invalidate_fitment(fitment.car_model_id, fitment.part_id, fitment.anchor_id)
+
 @router.post("/", response_model=FitmentResponse, status_code=201)
-def create_fitment(
+async def create_fitment(
     fitment_data: FitmentCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: Optional[User] = Depends(get_current_user)
 ):
     """Create or update a fitment"""
     
     # Validate that car model, part, and anchor exist
-    car_model = session.get(CarModel, fitment_data.car_model_id)
+    car_model = await session.get(CarModel, fitment_data.car_model_id)
     if not car_model:
         raise HTTPException(status_code=404, detail="Car model not found")
     
-    part = session.get(Part, fitment_data.part_id)
+    part = await session.get(Part, fitment_data.part_id)
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
     
-    anchor = session.get(Anchor, fitment_data.anchor_id)
+    anchor = await session.get(Anchor, fitment_data.anchor_id)
     if not anchor:
         raise HTTPException(status_code=404, detail="Anchor not found")
     
     # Check if fitment already exists for this combination
-    existing_fitment = session.exec(
+    existing_fitment = (await session.exec(
         select(Fitment).where(
             Fitment.car_model_id == fitment_data.car_model_id,
             Fitment.part_id == fitment_data.part_id,
@@ -170,23 +246,19 @@ def create_fitment(
             Fitment.part_variant_hash == fitment_data.part_variant_hash,
             Fitment.scope == fitment_data.scope
         )
-    ).first()
+    )).first()
     
     if existing_fitment:
         # Update existing fitment
-        existing_fitment.transform_override = json.dumps(fitment_data.transform_override)
+        existing_fitment.transform_override = fitment_data.transform_override
         existing_fitment.updated_at = datetime.utcnow()
         existing_fitment.version += 1
         session.add(existing_fitment)
-        session.commit()
-        session.refresh(existing_fitment)
+        await session.commit()
+        await session.refresh(existing_fitment)
+        _fitment_changed(existing_fitment)
         
-        fitment_dict = existing_fitment.dict()
-        try:
-            fitment_dict["transform_override"] = json.loads(existing_fitment.transform_override) if existing_fitment.transform_override else {}
-        except:
-            fitment_dict["transform_override"] = {}
-        return FitmentResponse(**fitment_dict)
+        return existing_fitment
     else:
         # Create new fitment
         fitment = Fitment(
@@ -194,133 +266,252 @@ def create_fitment(
             part_id=fitment_data.part_id,
             anchor_id=fitment_data.anchor_id,
             part_variant_hash=fitment_data.part_variant_hash,
-            transform_override=json.dumps(fitment_data.transform_override),
+            transform_override=fitment_data.transform_override,
             scope=fitment_data.scope,
             created_by_user_id=current_user.id if current_user else None,
             quality_score=0.5  # Default score for new fitments
         )
         
         session.add(fitment)
-        session.commit()
-        session.refresh(fitment)
+        await session.commit()
+        await session.refresh(fitment)
+        _fitment_changed(fitment)
         
-        fitment_dict = fitment.dict()
-        try:
-            fitment_dict["transform_override"] = json.loads(fitment.transform_override) if fitment.transform_override else {}
-        except:
-            fitment_dict["transform_override"] = {}
-        return FitmentResponse(**fitment_dict)
+        return fitment
+
+async def _manual_adjustment_anchor(session, car_model_id: int, part_id: int) -> Anchor:
+    """Anchor a manual adjustment attaches to (by attach_to, else by part type); 404 if anything is missing"""
+    car_model = await session.get(CarModel, car_model_id)
+    if not car_model:
+        raise HTTPException(status_code=404, detail="Car model not found")
+
+    part = await session.get(Part, part_id)
+    if not part:
+        raise HTTPException(status_code=404, detail="Part not found")
+
+    anchor = (await session.exec(
+        select(Anchor).where(Anchor.car_model_id == car_model_id, Anchor.name == part.attach_to)
+    )).first()
+    if not anchor:
+        anchor = (await session.exec(
+            select(Anchor).where(Anchor.car_model_id == car_model_id, Anchor.type == part.type)
+        )).first()
+    if not anchor:
+        raise HTTPException(status_code=404, detail="No suitable anchor found for this part")
+    return anchor
+
+async def _user_fitment(session, user_id: int, car_model_id: int, part_id: int, anchor_id: int) -> Optional[Fitment]:
+    return (await session.exec(
+        select(Fitment).where(
+            Fitment.car_model_id == car_model_id,
+            Fitment.part_id == part_id,
+            Fitment.anchor_id == anchor_id,
+            Fitment.scope == "user",
+            Fitment.created_by_user_id == user_id
+        )
+    )).first()
+
+def _save_user_transform(session, fitment: Optional[Fitment], user_id: int, car_model_id: int, part_id: int, anchor_id: int, transform: Transform) -> Fitment:
+    """Create the user's fitment or bump its version with the new transform (caller commits)"""
+    if fitment is None:
+        fitment = Fitment(
+            car_model_id=car_model_id,
+            part_id=part_id,
+            anchor_id=anchor_id,
+            transform_override=transform,
+            scope="user",
+            created_by_user_id=user_id,
+            quality_score=0.8  # Higher score for manual adjustments
+        )
+    else:
+        fitment.transform_override = transform
+        fitment.updated_at = datetime.utcnow()
+        fitment.version += 1
+    session.add(fitment)
+    return fitment
 
 @router.post("/manual-adjustment", response_model=FitmentResponse, status_code=201)
-def save_manual_adjustment(
+async def save_manual_adjustment(
     adjustment_data: ManualAdjustmentSave,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: Optional[User] = Depends(get_current_user)
 ):
-    """Save manual adjustment from frontend manual correction UI"""
-    
+    """Save manual adjustment from frontend manual correction UI (see manual-adjustment/ws for live drags)"""
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
     try:
-        print(f"🔍 Received manual adjustment data: {adjustment_data}")
-        print(f"🔍 Data type: {type(adjustment_data)}")
-        print(f"🔍 Transform data: {adjustment_data.transform}")
-        print(f"🔍 Transform type: {type(adjustment_data.transform)}")
-        
-        if not current_user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-        
-        # Validate that car model and part exist
-        car_model = session.get(CarModel, adjustment_data.car_model_id)
-        if not car_model:
-            raise HTTPException(status_code=404, detail="Car model not found")
-        
-        part = session.get(Part, adjustment_data.part_id)
-        if not part:
-            raise HTTPException(status_code=404, detail="Part not found")
-        
-        # Find the appropriate anchor for this part
-        anchor = session.exec(
-            select(Anchor).where(
-                Anchor.car_model_id == adjustment_data.car_model_id,
-                Anchor.name == part.attach_to
-            )
-        ).first()
-        
-        if not anchor:
-            # Try to find anchor by type
-            anchor = session.exec(
-                select(Anchor).where(
-                    Anchor.car_model_id == adjustment_data.car_model_id,
-                    Anchor.type == part.type
-                )
-            ).first()
-        
-        if not anchor:
-            raise HTTPException(status_code=404, detail="No suitable anchor found for this part")
-        
-        # Check if user fitment already exists
-        existing_fitment = session.exec(
-            select(Fitment).where(
-                Fitment.car_model_id == adjustment_data.car_model_id,
-                Fitment.part_id == adjustment_data.part_id,
-                Fitment.anchor_id == anchor.id,
-                Fitment.scope == "user",
-                Fitment.created_by_user_id == current_user.id
-            )
-        ).first()
-        
-        if existing_fitment:
-            # Update existing fitment
-            existing_fitment.transform_override = json.dumps(adjustment_data.transform)
-            existing_fitment.updated_at = datetime.utcnow()
-            existing_fitment.version += 1
-            session.add(existing_fitment)
-            session.commit()
-            session.refresh(existing_fitment)
-            
-            fitment_dict = existing_fitment.dict()
-            try:
-                fitment_dict["transform_override"] = json.loads(existing_fitment.transform_override) if existing_fitment.transform_override else {}
-            except:
-                fitment_dict["transform_override"] = {}
-            return FitmentResponse(**fitment_dict)
-        else:
-            # Create new user fitment
-            fitment = Fitment(
-                car_model_id=adjustment_data.car_model_id,
-                part_id=adjustment_data.part_id,
-                anchor_id=anchor.id,
-                transform_override=json.dumps(adjustment_data.transform),
-                scope="user",
-                created_by_user_id=current_user.id,
-                quality_score=0.8  # Higher score for manual adjustments
-            )
-            
-            session.add(fitment)
-            session.commit()
-            session.refresh(fitment)
-            
-            fitment_dict = fitment.dict()
-            try:
-                fitment_dict["transform_override"] = json.loads(fitment.transform_override) if fitment.transform_override else {}
-            except:
-                fitment_dict["transform_override"] = {}
-            return FitmentResponse(**fitment_dict)
-            
+        anchor = await _manual_adjustment_anchor(session, adjustment_data.car_model_id, adjustment_data.part_id)
+        existing_fitment = await _user_fitment(
+            session, current_user.id, adjustment_data.car_model_id, adjustment_data.part_id, anchor.id
+        )
+        fitment = _save_user_transform(
+            session, existing_fitment, current_user.id,
+            adjustment_data.car_model_id, adjustment_data.part_id, anchor.id, adjustment_data.transform,
+        )
+        await session.commit()
+        await session.refresh(fitment)
+        return fitment
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Error in save_manual_adjustment: {e}")
-        print(f"❌ Error type: {type(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("save_manual_adjustment failed")
         raise HTTPException(status_code=422, detail=f"Validation error: {str(e)}")
 
+class TransformDelta(BaseModel):
+    """Incremental gizmo movement: position and rotation add, scale multiplies"""
+    position: Vector3 = [0.0, 0.0, 0.0]
+    rotation_euler: Vector3 = [0.0, 0.0, 0.0]
+    scale: Vector3 = [1.0, 1.0, 1.0]
+
+class ManualAdjustmentChannel:
+    """
+    Latest transform for one user's drag of one part. Messages only touch
+    memory; ``flush`` writes the Fitment (one version bump) when something
+    changed since the last successful flush. A failed write is rolled back
+    and stays dirty, so the next flush retries it.
+    """
+
+    def __init__(self, session, user_id: int, car_model_id: int, part_id: int, anchor_id: int, fitment: Optional[Fitment]):
+        self.session = session
+        self.key = (user_id, car_model_id, part_id, anchor_id)
+        self.fitment = fitment
+        self.transform = fitment.transform_override if fitment and fitment.transform_override else Transform()
+        self.dirty = False
+        self._reload = False
+        self._lock = asyncio.Lock()
+
+    def apply(self, message: dict):
+        if "transform" in message:
+            self.transform = Transform.model_validate(message["transform"])
+        elif "delta" in message:
+            delta = TransformDelta.model_validate(message["delta"])
+            current = self.transform
+            # always a new object: a flush in progress keeps the one it took
+            self.transform = current.model_copy(update={
+                "position": [a + b for a, b in zip(current.position, delta.position)],
+                "rotation_euler": [a + b for a, b in zip(current.rotation_euler, delta.rotation_euler)],
+                "scale": [a * b for a, b in zip(current.scale, delta.scale)],
+            })
+        else:
+            raise ValueError("expected 'transform', 'delta' or type 'flush'")
+        self.dirty = True
+
+    async def flush(self) -> Optional[Fitment]:
+        async with self._lock:
+            if not self.dirty:
+                return None
+            if self._reload:
+                # the rollback expired it; async sessions cannot lazy-load
+                await self.session.refresh(self.fitment)
+                self._reload = False
+            transform = self.transform
+            fitment = _save_user_transform(self.session, self.fitment, *self.key, transform)
+            try:
+                await self.session.commit()
+            except Exception:
+                await self.session.rollback()
+                self._reload = self.fitment is not None
+                raise
+            self.fitment = fitment
+            # messages applied while committing are left for the next flush
+            if self.transform is transform:
+                self.dirty = False
+            await self.session.refresh(fitment)
+            return fitment
+
+def _state(kind: str, channel: ManualAdjustmentChannel) -> dict:
+    fitment = channel.fitment
+    return {
+        "type": kind,
+        "fitment_id": fitment.id if fitment else None,
+        "version": fitment.version if fitment else 0,
+        "transform": channel.transform.model_dump(),
+    }
+
+@router.websocket("/manual-adjustment/ws")
+async def manual_adjustment_channel(
+    websocket: WebSocket,
+    car_model_id: int,
+    part_id: int,
+    token: str = Query(..., description="Access token; browsers cannot set headers on WebSockets"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Live manual correction for one (car, part). The client streams
+    {"delta": {...}} or {"transform": {...}} messages while dragging; the
+    latest state is written to the user's Fitment at most once every
+    manual_adjustment_flush_seconds, on {"type": "flush"} and on close.
+    Every write is acknowledged with a "saved" message.
+    """
+    user = await run_in_threadpool(authenticate_token, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        anchor = await _manual_adjustment_anchor(session, car_model_id, part_id)
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    fitment = await _user_fitment(session, user.id, car_model_id, part_id, anchor.id)
+    channel = ManualAdjustmentChannel(session, user.id, car_model_id, part_id, anchor.id, fitment)
+    await websocket.send_json(_state("ready", channel))
+
+    closed = asyncio.Event()
+
+    async def flush_periodically():
+        interval = get_settings().manual_adjustment_flush_seconds
+        while not closed.is_set():
+            try:
+                await asyncio.wait_for(closed.wait(), interval)
+            except asyncio.TimeoutError:
+                try:
+                    if await channel.flush():
+                        await websocket.send_json(_state("saved", channel))
+                except Exception:
+                    # keep going: the change is still dirty and the next tick retries it
+                    logger.exception("manual adjustment flush failed")
+
+    flusher = asyncio.create_task(flush_periodically())
+    try:
+        while True:
+            message = await websocket.receive_json()
+            if message.get("type") == "flush":
+                try:
+                    saved = await channel.flush()
+                except Exception:
+                    logger.exception("manual adjustment flush failed")
+                    await websocket.send_json({"type": "error", "detail": "Could not save the adjustment; it will be retried"})
+                    continue
+                if saved:
+                    await websocket.send_json(_state("saved", channel))
+                continue
+            try:
+                channel.apply(message)
+            except (ValueError, ValidationError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.set()
+        # the last state must land even if the server is tearing the connection down
+        with anyio.CancelScope(shield=True):
+            try:
+                await flusher
+            finally:
+                await channel.flush()
+
 @router.delete("/{fitment_id}", status_code=204)
-def delete_fitment(
+async def delete_fitment(
     fitment_id: str,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a user's fitment"""
-    fitment = session.get(Fitment, fitment_id)
+    fitment = await session.get(Fitment, fitment_id)
     if not fitment:
         raise HTTPException(status_code=404, detail="Fitment not found")
     
@@ -328,6 +519,7 @@ def delete_fitment(
     if fitment.created_by_user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this fitment")
     
-    session.delete(fitment)
-    session.commit()
+    await session.delete(fitment)
+    await session.commit()
+    _fitment_changed(fitment)
     return 
\ No newline at end of file
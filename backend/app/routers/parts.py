@@ -1,75 +1,191 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select
-from app.db import get_session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.conditional import catalog_etag
+from app.db import get_async_session, get_async_read_session
 from app.models import CarModelPartLink, CarModel, Part, PartCompatibility
-from typing import List, Optional
-from pydantic import BaseModel
+from app.pagination import decode_cursor, page_limit, paginate, set_next_page
+from app.projection import PART_VIEWS, projected_columns, rows_response, selected_fields
+from app.serialization import catalog_rows_response, row_json_cache
+from app.services.catalog_cache import catalog_cache, bump_catalog_version, PARTS
+from app.services.compatibility_graph import compatibility_graph, part_slot
+from app.services.part_search import fts_enabled, index_part, search_cache, search_parts, search_terms, unindex_part
+from app.services.placement_cache import placement_cache
+from app.services.price_index import price_index, quote
+from app.config import get_settings
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, TypeAdapter
 
 router = APIRouter(prefix="/parts", tags=["parts"])
 
 @router.post("/", response_model=Part, status_code=201)
-def create_parts(part: Part, session: Session=Depends(get_session)):
+async def create_parts(part: Part, session: AsyncSession=Depends(get_async_session)):
     session.add(part)
-    session.commit()
-    session.refresh(part)
+    await session.flush()
+    if fts_enabled():
+        await session.exec(index_part(part))
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    await session.refresh(part)
+    catalog_cache.invalidate(PARTS)
+    price_index.set(part.id, part.price)
+    compatibility_graph.add_part(part.id, part_slot(part.category, part.type))
     return part
 
 @router.get("/", response_model=list[Part])
-def list_parts(car_model_id: Optional[int]=Query(None), session: Session=Depends(get_session)):
-    if car_model_id is not None:
-        # Join CarModelPartLink to filter parts by car_model_id
+async def list_parts(
+    request: Request,
+    response: Response,
+    etag: str = Depends(catalog_etag),
+    car_model_id: Optional[int]=Query(None),
+    part_type: Optional[str]=Query(None, alias="type"),
+    category: Optional[str]=Query(None),
+    min_price: Optional[float]=Query(None, ge=0),
+    max_price: Optional[float]=Query(None, ge=0),
+    limit: int = Depends(page_limit),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's Link header"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    view: Optional[str] = Query(None, description="Named field set, e.g. 'card'"),
+    session: AsyncSession=Depends(get_async_read_session)
+):
+    after_id = decode_cursor(after, int)[0] if after else None
+    names = selected_fields(Part, fields, view, PART_VIEWS)
+
+    async def load():
+        if names is None:
+            statement = select(Part)
+        else:
+            statement = select(*projected_columns(Part, names))
+        statement = statement.order_by(Part.id).limit(limit + 1)
+        if car_model_id is not None:
+            # Join CarModelPartLink to filter parts by car_model_id
+            statement = (
+                statement
+                .join(CarModelPartLink, Part.id == CarModelPartLink.part_id)
+                .where(CarModelPartLink.car_model_id == car_model_id)
+            )
+        if part_type is not None:
+            statement = statement.where(Part.type == part_type)
+        if category is not None:
+            statement = statement.where(Part.category == category)
+        if min_price is not None:
+            statement = statement.where(Part.price >= min_price)
+        if max_price is not None:
+            statement = statement.where(Part.price <= max_price)
+        if after_id is not None:
+            statement = statement.where(Part.id > after_id)
+        rows = (await session.exec(statement)).all()
+        if names is None:
+            return rows
+        return [dict(row._mapping) for row in rows]
+
+    fieldset = None if names is None else tuple(names)
+    key = (PARTS, "page", car_model_id, part_type, category, min_price, max_price, after_id, limit, fieldset)
+    rows = await catalog_cache.aget_or_load(key, load)
+    if names is None:
+        parts, next_cursor = paginate(rows, limit, lambda part: (part.id,))
+        set_next_page(request, response, next_cursor)
+        return catalog_rows_response(parts, response)
+    parts, next_cursor = paginate(rows, limit, lambda part: (part["id"],))
+    set_next_page(request, response, next_cursor)
+    return rows_response(parts, response)
+
+class PartSearchResponse(BaseModel):
+    total: int
+    results: List[Dict[str, Any]]
+    facets: Dict[str, Dict[str, int]]
+
+_search_response = TypeAdapter(Dict[str, Any])
+
+@router.get("/search", response_model=PartSearchResponse)
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    etag: str = Depends(catalog_etag),
+    part_type: Optional[str]=Query(None, alias="type"),
+    category: Optional[str]=Query(None),
+    min_price: Optional[float]=Query(None, ge=0),
+    max_price: Optional[float]=Query(None, ge=0),
+    limit: int = Depends(page_limit),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    view: Optional[str] = Query(None, description="Named field set, e.g. 'card'"),
+    session: AsyncSession=Depends(get_async_read_session)
+):
+    """Ranked full-text search over name, category, type and uploader, with facet counts"""
+    names = selected_fields(Part, fields, view, PART_VIEWS) or list(Part.__table__.columns.keys())
+    # the ETag names the catalog version, so any write misses older entries
+    key = (etag, tuple(search_terms(q)), part_type, category, min_price, max_price, limit, tuple(names))
+    result = await search_cache.aget_or_load(key, lambda: search_parts(
+        session, q, names, limit,
+        part_type=part_type, category=category, min_price=min_price, max_price=max_price,
+    ))
+    return Response(_search_response.dump_json(result), media_type="application/json", headers=dict(response.headers))
+
+@router.get("/car_model/{car_model_id}", response_model=list[Part])
+async def get_parts_by_car_model(
+    car_model_id: int,
+    response: Response,
+    etag: str = Depends(catalog_etag),
+    session: AsyncSession=Depends(get_async_read_session)
+):
+    """Get all parts compatible with a specific car model"""
+    async def load():
         statement = (
             select(Part)
             .join(CarModelPartLink, Part.id == CarModelPartLink.part_id)
             .where(CarModelPartLink.car_model_id == car_model_id)
         )
-        parts = session.exec(statement).all()
-        # Fallback: if no parts are linked (e.g., local-only car ID), return all parts
-        if not parts:
-            return session.exec(select(Part)).all()
-        return parts
-    else:
-        statement = select(Part)
-        return session.exec(statement).all()
-
-@router.get("/car_model/{car_model_id}", response_model=list[Part])
-def get_parts_by_car_model(car_model_id: int, session: Session=Depends(get_session)):
-    """Get all parts compatible with a specific car model"""
-    statement = (
-        select(Part)
-        .join(CarModelPartLink, Part.id == CarModelPartLink.part_id)
-        .where(CarModelPartLink.car_model_id == car_model_id)
-    )
-    return session.exec(statement).all()
+        return (await session.exec(statement)).all()
+    parts = await catalog_cache.aget_or_load((PARTS, "car_model", car_model_id), load)
+    return catalog_rows_response(parts, response)
 
 @router.get("/{part_id}", response_model=Part)
-def get_parts(part_id: int, session: Session=Depends(get_session)):
-    part = session.get(Part, part_id)
+async def get_parts(
+    part_id: int,
+    etag: str = Depends(catalog_etag),
+    session: AsyncSession=Depends(get_async_read_session)
+):
+    part = await catalog_cache.aget_or_load((PARTS, part_id), lambda: session.get(Part, part_id))
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
     return part
 
 @router.put("/{part_id}", response_model=Part)
-def update_part(part_id: int, part: Part, session: Session = Depends(get_session)):
-    db_part = session.get(Part, part_id)
+async def update_part(part_id: int, part: Part, session: AsyncSession = Depends(get_async_session)):
+    db_part = await session.get(Part, part_id)
     if not db_part:
         raise HTTPException(status_code=404, detail="Part not found")
     db_part.name = part.name
     db_part.type = part.type
     db_part.price = part.price
-    db_part.gltf_url = part.gltf_url
+    db_part.glb_url = part.glb_url
     session.add(db_part)
-    session.commit()
-    session.refresh(db_part)
+    if fts_enabled():
+        await session.exec(index_part(db_part))
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    await session.refresh(db_part)
+    catalog_cache.invalidate(PARTS)
+    price_index.set(db_part.id, db_part.price)
+    compatibility_graph.add_part(db_part.id, part_slot(db_part.category, db_part.type))
+    placement_cache.invalidate_part(db_part.id)
     return db_part
 
 @router.delete("/{part_id}", status_code=204)
-def delete_part(part_id: int, session: Session = Depends(get_session)):
-    part = session.get(Part, part_id)
+async def delete_part(part_id: int, session: AsyncSession = Depends(get_async_session)):
+    part = await session.get(Part, part_id)
     if not part:
         raise HTTPException(status_code=404, detail="Part not found")
-    session.delete(part)
-    session.commit()
+    await session.delete(part)
+    if fts_enabled():
+        await session.exec(unindex_part(part_id))
+    await session.exec(bump_catalog_version())
+    await session.commit()
+    catalog_cache.invalidate(PARTS)
+    row_json_cache.discard(Part.__tablename__, part_id)
+    price_index.remove(part_id)
+    compatibility_graph.remove_part(part_id)
+    placement_cache.invalidate_part(part_id)
     return
 
 class CostEstimateRequest(BaseModel):
@@ -78,16 +194,88 @@ class CostEstimateRequest(BaseModel):
 class CostEstimateResponse(BaseModel):
     total_cost: float
 
+QUOTE_BATCH_MAX = 200
+
+class QuoteConfiguration(BaseModel):
+    key: Optional[str] = None  # echoed back so the UI can match results
+    part_ids: List[int]
+
+class QuoteBatchRequest(BaseModel):
+    configurations: List[QuoteConfiguration] = Field(max_length=QUOTE_BATCH_MAX)
+    breakdown: bool = True  # include per-line prices
+
+class QuoteLine(BaseModel):
+    part_id: int
+    price: float
+
+class Quote(BaseModel):
+    key: Optional[str]
+    total: float
+    currency: str
+    lines: Optional[List[QuoteLine]] = None
+    unknown_part_ids: List[int]
+
 @router.post("/estimate_cost/", response_model=CostEstimateResponse)
-def estimate_cost(data: CostEstimateRequest, session: Session=Depends(get_session)):
-    statement = select(Part).where(Part.id.in_(data.part_ids))
-    parts = session.exec(statement).all()
-    total = sum(part.price for part in parts)
-    return CostEstimateResponse(total_cost=total)
+async def estimate_cost(data: CostEstimateRequest, session: AsyncSession=Depends(get_async_read_session)):
+    # served from the price index; the session is only used to (re)load it
+    await price_index.ensure_fresh(session)
+    return CostEstimateResponse(total_cost=float(quote(price_index, data.part_ids)["total"]))
+
+@router.post("/quote:batch", response_model=List[Quote])
+async def quote_batch(data: QuoteBatchRequest, session: AsyncSession=Depends(get_async_read_session)):
+    """Price many candidate configurations at once, e.g. 'what if' totals while toggling parts"""
+    await price_index.ensure_fresh(session)
+    currency = get_settings().currency
+    quotes = []
+    for configuration in data.configurations:
+        priced = quote(price_index, configuration.part_ids)
+        lines = None
+        if data.breakdown:
+            lines = [QuoteLine(part_id=part_id, price=float(price)) for part_id, price in priced["lines"]]
+        quotes.append(Quote(
+            key=configuration.key,
+            total=float(priced["total"]),
+            currency=currency,
+            lines=lines,
+            unknown_part_ids=priced["unknown_part_ids"],
+        ))
+    return quotes
 
 @router.get("/{part_id}/compatible", response_model=List[Part])
-def get_compatible_parts(part_id: int, session: Session = Depends(get_session)):
+async def get_compatible_parts(part_id: int, session: AsyncSession = Depends(get_async_read_session)):
     # Find all compatible_with_part_id for the given part_id
     statement = select(Part).join(PartCompatibility, Part.id == PartCompatibility.compatible_with_part_id).where(PartCompatibility.part_id == part_id)
-    compatible_parts = session.exec(statement).all()
-    return compatible_parts
\ No newline at end of file
+    compatible_parts = (await session.exec(statement)).all()
+    return compatible_parts
+
+class ConfigurationRequest(BaseModel):
+    car_model_id: Optional[int] = None
+    part_ids: List[int]
+    include_remaining: bool = False  # also list parts that can still be added
+
+class PartConflict(BaseModel):
+    part_id: int
+    conflicts_with_part_id: int
+
+class ConfigurationValidation(BaseModel):
+    valid: bool
+    conflicts: List[PartConflict]
+    car_conflicts: List[int]  # selected parts not linked to the car model
+    unknown_part_ids: List[int]
+    remaining_part_ids: Optional[List[int]] = None
+
+@router.post("/validate_configuration", response_model=ConfigurationValidation)
+async def validate_configuration(data: ConfigurationRequest, session: AsyncSession = Depends(get_async_read_session)):
+    """Check a whole configuration against the part and car compatibility links"""
+    await compatibility_graph.ensure_fresh(session)
+    result = compatibility_graph.validate(data.part_ids, data.car_model_id)
+    remaining = None
+    if data.include_remaining:
+        remaining = compatibility_graph.remaining(data.part_ids, data.car_model_id)
+    return ConfigurationValidation(
+        valid=not (result["conflicts"] or result["car_conflicts"] or result["unknown_part_ids"]),
+        conflicts=[PartConflict(part_id=a, conflicts_with_part_id=b) for a, b in result["conflicts"]],
+        car_conflicts=result["car_conflicts"],
+        unknown_part_ids=result["unknown_part_ids"],
+        remaining_part_ids=remaining,
+    )
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from app.db import get_session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlmodel import insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_async_session
 from app.models import User, SavedCar, SavedCarPartLink, Part
 from app.auth import get_current_user
-from typing import List
+from app.pagination import decode_cursor, page_limit, paginate, set_next_page
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/saved_cars", tags=["saved_cars"])
@@ -22,9 +24,9 @@ class SavedCarResponse(BaseModel):
     part_ids: List[int]
 
 @router.post("/", status_code=201, response_model=SavedCarResponse)
-def save_car(
+async def save_car(
     data: SavedCarCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     saved_car = SavedCar(
@@ -33,20 +35,15 @@ def save_car(
         name=data.name
     )
     session.add(saved_car)
-    session.commit()
-    session.refresh(saved_car)
+    await session.flush()  # assigns saved_car.id inside the transaction
 
-    # Link parts - remove duplicates first
-    unique_part_ids = list(set(data.part_ids))  # Remove duplicates
-    for part_id in unique_part_ids:
-        link = SavedCarPartLink(saved_car_id=saved_car.id, part_id=part_id)
-        session.add(link)
-    session.commit()
-    session.refresh(saved_car)
-    
-    # Get the part IDs for the response
-    part_links = session.exec(select(SavedCarPartLink).where(SavedCarPartLink.saved_car_id == saved_car.id)).all()
-    part_ids = [link.part_id for link in part_links]
+    # Link parts in one multi-row INSERT - remove duplicates first, keeping order
+    part_ids = list(dict.fromkeys(data.part_ids))
+    if part_ids:
+        await session.exec(insert(SavedCarPartLink).values(
+            [{"saved_car_id": saved_car.id, "part_id": part_id} for part_id in part_ids]
+        ))
+    await session.commit()
     
     return SavedCarResponse(
         id=saved_car.id,
@@ -57,43 +54,58 @@ def save_car(
         part_ids=part_ids
     )
 
+async def _part_ids_by_car(session: AsyncSession, saved_car_ids: List[int]) -> Dict[int, List[int]]:
+    # one query for the links of every car on the page
+    part_ids = {saved_car_id: [] for saved_car_id in saved_car_ids}
+    if saved_car_ids:
+        links = (await session.exec(
+            select(SavedCarPartLink.saved_car_id, SavedCarPartLink.part_id)
+            .where(SavedCarPartLink.saved_car_id.in_(saved_car_ids))
+        )).all()
+        for saved_car_id, part_id in links:
+            part_ids[saved_car_id].append(part_id)
+    return part_ids
+
 @router.get("/", response_model=List[SavedCarResponse])
-def list_saved_cars(
-    session: Session = Depends(get_session),
+async def list_saved_cars(
+    request: Request,
+    response: Response,
+    limit: int = Depends(page_limit),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's Link header"),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    cars = session.exec(select(SavedCar).where(SavedCar.user_id == current_user.id)).all()
-    
-    # Get part IDs for each car
-    result = []
-    for car in cars:
-        part_links = session.exec(select(SavedCarPartLink).where(SavedCarPartLink.saved_car_id == car.id)).all()
-        part_ids = [link.part_id for link in part_links]
-        
-        result.append(SavedCarResponse(
+    statement = select(SavedCar).where(SavedCar.user_id == current_user.id).order_by(SavedCar.id).limit(limit + 1)
+    if after:
+        statement = statement.where(SavedCar.id > decode_cursor(after, int)[0])
+    cars, next_cursor = paginate((await session.exec(statement)).all(), limit, lambda car: (car.id,))
+    set_next_page(request, response, next_cursor)
+
+    part_ids = await _part_ids_by_car(session, [car.id for car in cars])
+    return [
+        SavedCarResponse(
             id=car.id,
             user_id=car.user_id,
             car_model_id=car.car_model_id,
             name=car.name,
             created_at=car.created_at.isoformat(),
-            part_ids=part_ids
-        ))
-    
-    return result
+            part_ids=part_ids[car.id]
+        )
+        for car in cars
+    ]
 
 @router.get("/{id}", response_model=SavedCarResponse)
-def get_saved_car(
+async def get_saved_car(
     id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    car = session.get(SavedCar, id)
+    car = await session.get(SavedCar, id)
     if not car or car.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Saved car not found")
     
     # Get part IDs for this car
-    part_links = session.exec(select(SavedCarPartLink).where(SavedCarPartLink.saved_car_id == car.id)).all()
-    part_ids = [link.part_id for link in part_links]
+    part_ids = await _part_ids_by_car(session, [car.id])
     
     return SavedCarResponse(
         id=car.id,
@@ -101,19 +113,19 @@ def get_saved_car(
         car_model_id=car.car_model_id,
         name=car.name,
         created_at=car.created_at.isoformat(),
-        part_ids=part_ids
+        part_ids=part_ids[car.id]
     )
 
 @router.delete("/{id}", status_code=204)
-def delete_saved_car(
+async def delete_saved_car(
     id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
-    car = session.get(SavedCar, id)
+    car = await session.get(SavedCar, id)
     if not car or car.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Saved car not found")
-    session.delete(car)
-    session.commit()
+    await session.delete(car)
+    await session.commit()
     return
     
\ No newline at end of file
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from app.db import get_session, get_user
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_async_session
 from app.models import User
-from app.auth import get_password_hash, get_current_user
+from app.auth import hash_password_async, get_current_user
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -14,18 +15,18 @@ class UserCreate(BaseModel):
     last_name: str
 
 @router.post("/register", status_code=201)
-def register(user: UserCreate, session: Session = Depends(get_session)):
-    if session.exec(select(User).where(User.email == user.email)).first():
+async def register(user: UserCreate, session: AsyncSession = Depends(get_async_session)):
+    if (await session.exec(select(User).where(User.email == user.email))).first():
         raise HTTPException(status_code=400, detail="Email already registered")
     user_obj = User(
         email=user.email,
-        password=get_password_hash(user.password),
+        password=await hash_password_async(user.password),
         first_name=user.first_name,
         last_name=user.last_name
     )
     session.add(user_obj)
-    session.commit()
-    session.refresh(user_obj)
+    await session.commit()
+    await session.refresh(user_obj)
     return {
         "id": user_obj.id,
         "email": user_obj.email,
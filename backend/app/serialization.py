@@ -0,0 +1,79 @@
+"""
+Pre-serialized JSON for catalog rows.
+
+Part, CarModel and Anchor rows carry a ``version`` that every update bumps
+(``bump_row_version``, and the catalog import), so each row's JSON is cached
+under (table, id, version) and a list response is assembled by joining the
+cached fragments instead of validating and re-encoding every object. A write
+only re-encodes the rows it changed.
+
+The key names one row for its whole life because ids are never reused:
+those tables are AUTOINCREMENT on SQLite (migration 10) and use sequences
+elsewhere, so a reinserted row gets a new id in every worker.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from app.config import get_settings
+
+
+class RowJSONCache:
+    def __init__(self, maxsize: int = 50000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, row) -> bytes:
+        """JSON for ``row`` as its response_model would render it, cached per (table, id, version)."""
+        # one entry per row: a newer version replaces the old bytes
+        key = (row.__tablename__, row.id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == row.version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        data = row.__pydantic_serializer__.to_json(row)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = (row.version, data)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return data
+
+    def encode_list(self, rows: Sequence) -> bytes:
+        return b"[" + b",".join(self.fragment(row) for row in rows) + b"]"
+
+    def discard(self, table: str, row_id: int):
+        """Forget a deleted row's bytes."""
+        with self._lock:
+            self._entries.pop((table, row_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+row_json_cache = RowJSONCache(maxsize=get_settings().row_json_cache_size)
+
+
+def catalog_rows_response(rows: Sequence, response: Optional[Response] = None) -> Response:
+    """
+    Response for a list of catalog rows built from cached fragments.
+    Headers set on the injected ``response`` (Link, ETag, Cache-Control)
+    are carried over.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=row_json_cache.encode_list(rows), media_type="application/json", headers=headers)
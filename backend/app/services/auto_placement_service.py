@@ -5,9 +5,65 @@ Enhanced auto-placement service for parts
 
 import json
 import hashlib
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import and_, or_
 from sqlmodel import Session, select
-from app.models import CarModel, Part, Anchor, Fitment, User
+from app.models import CarModel, Part, Anchor, Fitment, User, IntrinsicSize
+from app.services.catalog_cache import catalog_cache, detach, observe_catalog_version, CAR_MODELS, PARTS, ANCHORS
+from app.services.placement_cache import placement_cache
+
+# Default sizes based on part type
+DEFAULT_INTRINSIC_SIZES = {
+    "wheels": IntrinsicSize(radius=0.34, width=0.2, height=0.68),
+    "headlight": IntrinsicSize(length=0.3, width=0.2, height=0.1),
+    "spoiler": IntrinsicSize(length=1.5, width=0.5, height=0.3),
+    "exhaust": IntrinsicSize(length=0.8, width=0.3, height=0.3),
+}
+
+FALLBACK_INTRINSIC_SIZE = IntrinsicSize(length=0.5, width=0.5, height=0.5)
+
+# scale applied on top of the anchor's by adjust_<category>_transform
+CATEGORY_SCALES = {
+    "wheel": 0.6,
+    "headlight": 0.6,
+    "spoiler": 1.0,
+    "exhaust": 0.8,
+}
+
+def placement_category(part: Part) -> Optional[str]:
+    """Which adjust_<category>_transform applies to a part, if any"""
+    if part.category == "wheel" or part.type == "wheels":
+        return "wheel"
+    if part.category == "headlight" or "headlight" in part.type.lower():
+        return "headlight"
+    if part.category == "spoiler" or "spoiler" in part.type.lower():
+        return "spoiler"
+    if part.category == "exhaust" or "exhaust" in part.type.lower():
+        return "exhaust"
+    return None
+
+def euler_matrices(rotation: np.ndarray) -> np.ndarray:
+    """
+    (..., 3) euler angles in radians -> (..., 3, 3) rotations, three.js
+    'XYZ' order (the frontend's default), i.e. Rx @ Ry @ Rz
+    """
+    a, c, e = np.cos(rotation[..., 0]), np.cos(rotation[..., 1]), np.cos(rotation[..., 2])
+    b, d, f = np.sin(rotation[..., 0]), np.sin(rotation[..., 1]), np.sin(rotation[..., 2])
+    ae, af, be, bf = a * e, a * f, b * e, b * f
+    return np.stack([
+        np.stack([c * e, -c * f, d], axis=-1),
+        np.stack([af + be * d, ae - bf * d, -b * c], axis=-1),
+        np.stack([bf - ae * d, be + af * d, a * c], axis=-1),
+    ], axis=-2)
+
+def trs_matrices(position: np.ndarray, rotation: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """(..., 3) position / euler rotation / scale -> (..., 4, 4) T @ R @ S"""
+    matrices = np.zeros(position.shape[:-1] + (4, 4))
+    matrices[..., :3, :3] = euler_matrices(rotation) * scale[..., None, :]
+    matrices[..., :3, 3] = position
+    matrices[..., 3, 3] = 1.0
+    return matrices
 
 class AutoPlacementService:
     def __init__(self, session: Session):
@@ -40,12 +96,29 @@ class AutoPlacementService:
             ).first()
             
             if user_fitment and user_fitment.transform_override:
-                try:
-                    return json.loads(user_fitment.transform_override)
-                except:
-                    pass
+                return user_fitment.transform_override.model_dump()
         
-        # Then try global best fitment
+        # The rest depends only on catalog rows and global fitments, so it is
+        # memoized by row versions (writers drop entries on fitment changes)
+        car_model, part, anchor = self.load_placement_rows(car_model_id, part_id, anchor_id)
+        if not all([car_model, part, anchor]):
+            return self.get_global_or_auto_transform(car_model_id, part_id, anchor_id, part_variant_hash)
+        return placement_cache.get_or_compute(
+            car_model, part, anchor,
+            lambda: self.get_global_or_auto_transform(car_model_id, part_id, anchor_id, part_variant_hash),
+            part_variant_hash,
+        )
+    
+    def get_global_or_auto_transform(
+        self,
+        car_model_id: int,
+        part_id: int,
+        anchor_id: int,
+        part_variant_hash: str = ""
+    ) -> Dict:
+        """
+        Highest-quality global fitment for the pair, else auto placement
+        """
         global_fitment = self.session.exec(
             select(Fitment).where(
                 Fitment.car_model_id == car_model_id,
@@ -57,14 +130,44 @@ class AutoPlacementService:
         ).first()
         
         if global_fitment and global_fitment.transform_override:
-            try:
-                return json.loads(global_fitment.transform_override)
-            except:
-                pass
+            return global_fitment.transform_override.model_dump()
         
         # Fall back to auto placement
         return self.compute_auto_placement_transform(car_model_id, part_id, anchor_id)
     
+    def load_placement_rows(
+        self,
+        car_model_id: int,
+        part_id: int,
+        anchor_id: int
+    ) -> Tuple[Optional[CarModel], Optional[Part], Optional[Anchor]]:
+        """
+        Car model, part and anchor rows, served from the catalog cache. Their
+        versions are read uncached first (one small query) and a cached row
+        older than that is reloaded, so the placement memo is never keyed by
+        or computed from a row another worker has since changed.
+        """
+        versions = self.session.exec(select(
+            select(CarModel.version).where(CarModel.id == car_model_id).scalar_subquery(),
+            select(Part.version).where(Part.id == part_id).scalar_subquery(),
+            select(Anchor.version).where(Anchor.id == anchor_id).scalar_subquery(),
+        )).one()
+        car_model = self.load_current_row((CAR_MODELS, car_model_id), CarModel, car_model_id, versions[0])
+        part = self.load_current_row((PARTS, part_id), Part, part_id, versions[1])
+        anchor = self.load_current_row((ANCHORS, "id", anchor_id), Anchor, anchor_id, versions[2])
+        return car_model, part, anchor
+    
+    def load_current_row(self, key, model, row_id: int, version: Optional[int]):
+        """The cached row at ``key`` if it is at ``version``, else the database row"""
+        if version is None:
+            return None
+        row = catalog_cache.get_or_load(key, lambda: self.session.get(model, row_id))
+        if row is None or row.version != version:
+            row = detach(self.session.get(model, row_id, populate_existing=True))
+            if row is not None:
+                catalog_cache.set(key, row)
+        return row
+    
     def compute_auto_placement_transform(
         self, 
         car_model_id: int, 
@@ -75,14 +178,19 @@ class AutoPlacementService:
         Compute automatic placement transform for a part at an anchor
         """
         
-        # Get car model, part, and anchor
-        car_model = self.session.get(CarModel, car_model_id)
-        part = self.session.get(Part, part_id)
-        anchor = self.session.get(Anchor, anchor_id)
+        # Get car model, part, and anchor (catalog rows, served from the cache)
+        car_model, part, anchor = self.load_placement_rows(car_model_id, part_id, anchor_id)
         
         if not all([car_model, part, anchor]):
             return self.get_default_transform()
         
+        return self.compute_transform(car_model, part, anchor)
+    
+    def compute_transform(self, car_model: CarModel, part: Part, anchor: Anchor) -> Dict:
+        """
+        Automatic placement transform from already-loaded rows
+        """
+        
         # Start with anchor transform
         transform = {
             "position": [anchor.pos_x, anchor.pos_y, anchor.pos_z],
@@ -92,8 +200,194 @@ class AutoPlacementService:
         
         # Apply part-specific adjustments
         transform = self.apply_part_specific_adjustments(transform, part, anchor, car_model)
-        
+
         return transform
+
+    def compute_auto_placement_batch(
+        self,
+        car_model_id: int,
+        part_ids: Sequence[int],
+        anchor_ids: Sequence[int]
+    ) -> Optional[Dict]:
+        """
+        compute_auto_placement_transform for every (part, anchor) pair of a
+        car at once. Parts are loaded with one query; the car and its anchors
+        come from the catalog cache. Transforms are arrays indexed
+        [part, anchor] in the order of ``part_ids`` / ``anchor_ids`` (unknown
+        ids and anchors of other cars are dropped and listed as missing).
+        Returns None if the car model does not exist.
+        """
+        observe_catalog_version(self.session)
+        car_model = catalog_cache.get_or_load(
+            (CAR_MODELS, car_model_id), lambda: self.session.get(CarModel, car_model_id)
+        )
+        if not car_model:
+            return None
+
+        car_anchors = {anchor.id: anchor for anchor in catalog_cache.get_or_load(
+            (ANCHORS, car_model_id),
+            lambda: self.session.exec(select(Anchor).where(Anchor.car_model_id == car_model_id)).all()
+        )}
+        requested_parts = list(dict.fromkeys(part_ids))
+        requested_anchors = list(dict.fromkeys(anchor_ids))
+        loaded = {part.id: part for part in self.session.exec(select(Part).where(Part.id.in_(requested_parts))).all()}
+        parts = [loaded[part_id] for part_id in requested_parts if part_id in loaded]
+        anchors = [car_anchors[anchor_id] for anchor_id in requested_anchors if anchor_id in car_anchors]
+
+        part_index, anchor_index = np.meshgrid(np.arange(len(parts)), np.arange(len(anchors)), indexing="ij")
+        placements = self.compute_transforms(car_model, parts, anchors, part_index, anchor_index)
+        placements.update({
+            "part_ids": [part.id for part in parts],
+            "anchor_ids": [anchor.id for anchor in anchors],
+            "missing_part_ids": [part_id for part_id in requested_parts if part_id not in loaded],
+            "missing_anchor_ids": [anchor_id for anchor_id in requested_anchors if anchor_id not in car_anchors],
+        })
+        return placements
+
+    def compute_transforms(
+        self,
+        car_model: CarModel,
+        parts: Sequence[Part],
+        anchors: Sequence[Anchor],
+        part_index: np.ndarray,
+        anchor_index: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized compute_transform for the pairs
+        (parts[part_index[k]], anchors[anchor_index[k]]); the index arrays
+        may have any (matching) shape S. Returns "position", "rotation_euler"
+        and "scale" as S + (3,) arrays and "matrix" as S + (4, 4).
+
+        Every step multiplies or adds in the same order as the scalar
+        methods, so the results are bit-for-bit equal to compute_transform.
+        """
+        # per-anchor columns
+        anchor_position = np.array([[a.pos_x, a.pos_y, a.pos_z] for a in anchors], dtype=float).reshape(-1, 3)
+        anchor_rotation = np.array([[a.rot_x, a.rot_y, a.rot_z] for a in anchors], dtype=float).reshape(-1, 3)
+        anchor_scale = np.array([[a.scale_x, a.scale_y, a.scale_z] for a in anchors], dtype=float).reshape(-1, 3)
+        expected_diameter = np.array([a.expected_diameter or 0.0 for a in anchors], dtype=float)
+
+        # per-part columns: category, pivot and the intrinsic size they read
+        categories = [placement_category(part) for part in parts]
+        sizes = [self.get_part_intrinsic_size(part) for part in parts]
+        is_wheel = np.array([category == "wheel" for category in categories], dtype=bool)
+        category_scale = np.array([CATEGORY_SCALES.get(category, 1.0) for category in categories], dtype=float)
+        radius = np.array([size.radius or 0.0 for size in sizes], dtype=float)
+        height = np.array([size.height or 0.0 for size in sizes], dtype=float)
+        pivots = [part.pivot_hint or "center" for part in parts]
+        bottom_pivot = np.array([pivot == "bottom-center" for pivot in pivots], dtype=bool) & (height != 0.0)
+        hub_pivot = np.array([pivot == "hub-center" for pivot in pivots], dtype=bool) & (radius != 0.0)
+
+        position = anchor_position[anchor_index].copy()
+        rotation = anchor_rotation[anchor_index].copy()
+        scale = anchor_scale[anchor_index].copy()
+        p_radius, p_height = radius[part_index], height[part_index]
+
+        # adjust_wheel_transform: expected diameter, then the category scale
+        diameter = expected_diameter[anchor_index]
+        fits_diameter = is_wheel[part_index] & (diameter != 0.0) & (p_radius != 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale_factor = diameter / (p_radius * 2)
+        scale = np.where(fits_diameter[..., None], scale * scale_factor[..., None], scale)
+        scale = scale * category_scale[part_index][..., None]
+
+        # apply_pivot_adjustments
+        position[..., 1] = np.where(bottom_pivot[part_index], position[..., 1] - p_height * scale[..., 1] / 2, position[..., 1])
+        position[..., 1] = np.where(hub_pivot[part_index], position[..., 1] + p_radius * scale[..., 1], position[..., 1])
+
+        if car_model.unit_scale != 1.0:
+            scale = scale * car_model.unit_scale
+
+        return {
+            "position": position,
+            "rotation_euler": rotation,
+            "scale": scale,
+            "matrix": trs_matrices(position, rotation, scale),
+        }
+
+    def resolve_scene(
+        self,
+        car_model_id: int,
+        part_ids: List[int],
+        part_variant_hashes: Optional[Dict[int, str]] = None,
+        current_user: Optional[User] = None
+    ) -> Optional[Dict]:
+        """
+        Batch form of find_matching_anchor + get_best_fitment_transform for a
+        whole configuration. Anchors, parts and fitments are each loaded with
+        one query however many parts there are. Returns None if the car model
+        does not exist.
+        """
+        observe_catalog_version(self.session)
+        part_variant_hashes = part_variant_hashes or {}
+        car_model = catalog_cache.get_or_load(
+            (CAR_MODELS, car_model_id), lambda: self.session.get(CarModel, car_model_id)
+        )
+        if not car_model:
+            return None
+        
+        anchors = catalog_cache.get_or_load(
+            (ANCHORS, car_model_id),
+            lambda: self.session.exec(select(Anchor).where(Anchor.car_model_id == car_model_id)).all()
+        )
+        requested = list(dict.fromkeys(part_ids))
+        parts = {part.id: part for part in self.session.exec(select(Part).where(Part.id.in_(requested))).all()}
+        matches = {part_id: self.find_matching_anchor(part, anchors) for part_id, part in parts.items()}
+        
+        # every candidate fitment for the matched (part, anchor) pairs, in one query
+        user_fitments, global_fitments = {}, {}
+        anchored = [part_id for part_id, anchor in matches.items() if anchor]
+        if anchored:
+            scope_filter = Fitment.scope == "global"
+            if current_user:
+                scope_filter = or_(
+                    scope_filter,
+                    and_(Fitment.scope == "user", Fitment.created_by_user_id == current_user.id)
+                )
+            fitments = self.session.exec(
+                select(Fitment).where(Fitment.car_model_id == car_model_id, Fitment.part_id.in_(anchored), scope_filter)
+            ).all()
+            for fitment in fitments:
+                anchor = matches[fitment.part_id]
+                if fitment.anchor_id != anchor.id or fitment.part_variant_hash != part_variant_hashes.get(fitment.part_id, ""):
+                    continue
+                if fitment.scope == "user":
+                    user_fitments.setdefault(fitment.part_id, fitment)
+                    continue
+                current = global_fitments.get(fitment.part_id)
+                if current is None or fitment.quality_score > current.quality_score:
+                    global_fitments[fitment.part_id] = fitment
+        
+        resolved = []
+        for part_id in requested:
+            if part_id not in parts:
+                continue
+            anchor = matches[part_id]
+            # same priority as get_best_fitment_transform: the user's own
+            # fitment, then the highest-quality global one, then auto placement
+            user_fitment, global_fitment = user_fitments.get(part_id), global_fitments.get(part_id)
+            if not anchor:
+                transform, source = self.get_default_transform(), "default"
+            elif user_fitment and user_fitment.transform_override:
+                transform, source = user_fitment.transform_override.model_dump(), "user"
+            elif global_fitment and global_fitment.transform_override:
+                transform, source = global_fitment.transform_override.model_dump(), "global"
+            else:
+                # no global fitment either, so this is also the memoized global-or-auto result
+                part = parts[part_id]
+                transform = placement_cache.get_or_compute(
+                    car_model, part, anchor,
+                    lambda: self.compute_transform(car_model, part, anchor),
+                    part_variant_hashes.get(part_id, ""),
+                )
+                source = "auto"
+            resolved.append({"part_id": part_id, "anchor": anchor, "transform": transform, "source": source})
+        
+        return {
+            "car_model": car_model,
+            "parts": resolved,
+            "missing_part_ids": [part_id for part_id in requested if part_id not in parts],
+        }
     
     def apply_part_specific_adjustments(
         self, 
@@ -111,13 +405,14 @@ class AutoPlacementService:
         anchor_metadata = self.get_anchor_metadata(anchor)
         
         # Apply category-specific adjustments
-        if part.category == "wheel" or part.type == "wheels":
+        category = placement_category(part)
+        if category == "wheel":
             transform = self.adjust_wheel_transform(transform, part, anchor, part_size, anchor_metadata)
-        elif part.category == "headlight" or "headlight" in part.type.lower():
+        elif category == "headlight":
             transform = self.adjust_headlight_transform(transform, part, anchor, part_size)
-        elif part.category == "spoiler" or "spoiler" in part.type.lower():
+        elif category == "spoiler":
             transform = self.adjust_spoiler_transform(transform, part, anchor, part_size)
-        elif part.category == "exhaust" or "exhaust" in part.type.lower():
+        elif category == "exhaust":
             transform = self.adjust_exhaust_transform(transform, part, anchor, part_size)
         
         # Apply pivot adjustments
@@ -135,7 +430,7 @@ class AutoPlacementService:
         transform: Dict, 
         part: Part, 
         anchor: Anchor, 
-        part_size: Dict, 
+        part_size: IntrinsicSize, 
         anchor_metadata: Dict
     ) -> Dict:
         """
@@ -143,13 +438,13 @@ class AutoPlacementService:
         """
         
         # Scale based on expected wheel diameter
-        if anchor.expected_diameter and part_size.get("radius"):
-            current_diameter = part_size["radius"] * 2
+        if anchor.expected_diameter and part_size.radius:
+            current_diameter = part_size.radius * 2
             scale_factor = anchor.expected_diameter / current_diameter
             transform["scale"] = [s * scale_factor for s in transform["scale"]]
         
         # Apply wheel-specific scaling
-        wheel_scale = 0.6  # Default wheel scale
+        wheel_scale = CATEGORY_SCALES["wheel"]
         transform["scale"] = [s * wheel_scale for s in transform["scale"]]
         
         return transform
@@ -159,14 +454,14 @@ class AutoPlacementService:
         transform: Dict, 
         part: Part, 
         anchor: Anchor, 
-        part_size: Dict
+        part_size: IntrinsicSize
     ) -> Dict:
         """
         Adjust transform for headlight parts
         """
         
         # Headlights should be smaller and positioned at front
-        headlight_scale = 0.6
+        headlight_scale = CATEGORY_SCALES["headlight"]
         transform["scale"] = [s * headlight_scale for s in transform["scale"]]
         
         return transform
@@ -176,14 +471,14 @@ class AutoPlacementService:
         transform: Dict, 
         part: Part, 
         anchor: Anchor, 
-        part_size: Dict
+        part_size: IntrinsicSize
     ) -> Dict:
         """
         Adjust transform for spoiler parts
         """
         
         # Spoilers should be positioned at rear and elevated
-        spoiler_scale = 1.0
+        spoiler_scale = CATEGORY_SCALES["spoiler"]
         transform["scale"] = [s * spoiler_scale for s in transform["scale"]]
         
         return transform
@@ -193,14 +488,14 @@ class AutoPlacementService:
         transform: Dict, 
         part: Part, 
         anchor: Anchor, 
-        part_size: Dict
+        part_size: IntrinsicSize
     ) -> Dict:
         """
         Adjust transform for exhaust parts
         """
         
         # Exhaust should be smaller and positioned at rear
-        exhaust_scale = 0.8
+        exhaust_scale = CATEGORY_SCALES["exhaust"]
         transform["scale"] = [s * exhaust_scale for s in transform["scale"]]
         
         return transform
@@ -220,52 +515,38 @@ class AutoPlacementService:
         if pivot_hint == "bottom-center":
             # Adjust Y position to place bottom at anchor
             part_size = self.get_part_intrinsic_size(part)
-            if part_size.get("height"):
-                transform["position"][1] -= part_size["height"] * transform["scale"][1] / 2
+            if part_size.height:
+                transform["position"][1] -= part_size.height * transform["scale"][1] / 2
         
         elif pivot_hint == "hub-center":
             # For wheels, center on hub
             part_size = self.get_part_intrinsic_size(part)
-            if part_size.get("radius"):
-                transform["position"][1] += part_size["radius"] * transform["scale"][1]
+            if part_size.radius:
+                transform["position"][1] += part_size.radius * transform["scale"][1]
         
         return transform
     
-    def get_part_intrinsic_size(self, part: Part) -> Dict:
-        """
-        Get part intrinsic size from JSON string
-        """
-        try:
-            if part.intrinsic_size:
-                return json.loads(part.intrinsic_size)
-        except:
-            pass
-        
-        # Default sizes based on part type
-        defaults = {
-            "wheels": {"radius": 0.34, "width": 0.2, "height": 0.68},
-            "headlight": {"length": 0.3, "width": 0.2, "height": 0.1},
-            "spoiler": {"length": 1.5, "width": 0.5, "height": 0.3},
-            "exhaust": {"length": 0.8, "width": 0.3, "height": 0.3}
-        }
+    def get_part_intrinsic_size(self, part: Part) -> IntrinsicSize:
+        """
+        Get part intrinsic size, falling back to per-type defaults
+        """
+        if part.intrinsic_size:
+            if isinstance(part.intrinsic_size, IntrinsicSize):
+                return part.intrinsic_size
+            # not yet round-tripped through the database
+            return IntrinsicSize.model_validate(part.intrinsic_size)
         
-        for category, size in defaults.items():
+        for category, size in DEFAULT_INTRINSIC_SIZES.items():
             if category in part.category.lower() or category in part.type.lower():
                 return size
         
-        return {"length": 0.5, "width": 0.5, "height": 0.5}
+        return FALLBACK_INTRINSIC_SIZE
     
     def get_anchor_metadata(self, anchor: Anchor) -> Dict:
         """
-        Get anchor metadata from JSON string
+        Get anchor metadata
         """
-        try:
-            if anchor.anchor_metadata:
-                return json.loads(anchor.anchor_metadata)
-        except:
-            pass
-        
-        return {}
+        return anchor.anchor_metadata or {}
     
     def get_default_transform(self) -> Dict:
         """
@@ -281,7 +562,13 @@ class AutoPlacementService:
         """
         Compute hash for part variant (GLB + material/size)
         """
-        hash_input = f"{part.glb_url}:{part.intrinsic_size}:{material_variant}"
+        # canonical JSON of the stored value: key order and whether the row
+        # came back as an IntrinsicSize or a plain dict must not change it
+        size = part.intrinsic_size
+        if isinstance(size, IntrinsicSize):
+            size = size.model_dump(exclude_none=True)
+        size = json.dumps(size, sort_keys=True) if size else ""
+        hash_input = f"{part.glb_url}:{size}:{material_variant}"
         return hashlib.sha256(hash_input.encode()).hexdigest()
     
     def find_matching_anchor(self, part: Part, anchors: List[Anchor]) -> Optional[Anchor]:
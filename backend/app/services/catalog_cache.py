@@ -0,0 +1,161 @@
+"""
+In-process cache for catalog reads (car models, parts, anchors).
+
+The catalog is read on nearly every request and written only by the admin
+routes and ingestion, so reads are served from a bounded LRU with a TTL.
+Writers call ``catalog_cache.invalidate(<region>)`` after committing.
+Invalidation is per process; the TTL bounds how long another worker can
+serve a stale entry.
+
+Keys are tuples whose first element is the region ("car_models", "parts",
+"anchors"). Cached values are detached copies, never session-bound rows.
+
+Writers also execute ``bump_catalog_version()`` inside their transaction so
+every worker (and every HTTP cache, via the ETag) sees the catalog change:
+``catalog_etag`` reads the version on each catalog request and passes it to
+``observe_version``, which clears this process's cache when it moved. That
+is how writes from other workers and from scripts reach the cache, e.g.
+CarModelPartLink rows, which only the linking scripts write and which back
+the per-car part lists under ``(PARTS, "car_model", <id>)``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlmodel import update
+
+from app.config import get_settings
+from app.models import CatalogVersion
+
+CAR_MODELS = "car_models"
+PARTS = "parts"
+ANCHORS = "anchors"
+
+_MISSING = object()
+
+
+def detach(value):
+    """Copy ORM rows (or lists of them) so the cache holds no session state."""
+    if isinstance(value, (list, tuple)):
+        return [detach(item) for item in value]
+    if hasattr(value, "__table__"):
+        return type(value).model_validate(value.model_dump())
+    return value
+
+
+class CatalogCache:
+    def __init__(self, maxsize: int = 2048, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._version: Optional[int] = None
+
+    def get(self, key: Tuple[Hashable, ...], default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Tuple[Hashable, ...], value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]):
+        """Return the cached value or call ``loader``; None results are not cached."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = detach(loader())
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    async def aget_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]]):
+        """Async variant of ``get_or_load`` for routers on AsyncSession."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = detach(await loader())
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, *regions: str):
+        """Drop every entry in the given regions, or everything if none given."""
+        with self._lock:
+            if not regions:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] in regions]:
+                    del self._entries[key]
+            self.invalidations += 1
+
+    def observe_version(self, version: int):
+        """
+        Drop everything if the catalog version moved since the last call.
+        Every path that reads this cache observes first: ``catalog_etag`` on
+        the catalog routes, ``observe_catalog_version`` in services (or, like
+        ``load_placement_rows``, compares each row's own version).
+        """
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            self._version = version
+            if changed:
+                self._entries.clear()
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+def bump_catalog_version():
+    """UPDATE statement for the catalog version; run it in the writer's transaction."""
+    return (
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+def observe_catalog_version(session):
+    """``catalog_etag``'s version check for code on a sync session: one primary key lookup."""
+    current = session.get(CatalogVersion, 1)
+    if current is not None:
+        catalog_cache.observe_version(current.version)
+
+
+def _build_cache() -> CatalogCache:
+    settings = get_settings()
+    return CatalogCache(maxsize=settings.catalog_cache_size, ttl=settings.catalog_cache_ttl_seconds)
+
+
+catalog_cache = _build_cache()
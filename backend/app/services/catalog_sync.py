@@ -0,0 +1,182 @@
+"""
+NDJSON catalog export / import for syncing environments.
+
+One line per row, parents before children:
+
+    {"table": "carmodel", "row": {"id": 1, "name": "...", ...}}
+
+Covers car models, anchors, parts, both link tables and global fitments.
+Both directions run in bounded memory: export streams each table with
+``yield_per`` (a server-side cursor where the driver has one) and import
+buffers at most ``batch_size`` rows before upserting them in their own
+transaction, so a million-row fitment table moves without the process
+growing.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import DateTime, null, select, text
+from sqlalchemy.engine import Engine
+
+from app.models import Anchor, CarModel, CarModelPartLink, Fitment, Part, PartCompatibility
+from app.services.catalog_cache import bump_catalog_version
+from app.services.part_search import index_part_rows
+from app.services.placement_cache import placement_cache
+
+# export / import order: referenced tables first
+TABLES = [CarModel, Anchor, Part, CarModelPartLink, PartCompatibility, Fitment]
+
+_BY_NAME = {model.__tablename__: model for model in TABLES}
+
+
+# columns pointing at tables that are not exported (users); written as null
+# so the rows load into an environment without those parents
+DETACHED_COLUMNS = {Fitment.__tablename__: {"created_by_user_id"}}
+
+
+def _export_filter(model):
+    # user fitments are personal data, not catalog
+    return [Fitment.scope == "global"] if model is Fitment else []
+
+
+def _export_columns(table):
+    detached = DETACHED_COLUMNS.get(table.name, set())
+    return [null().label(column.name) if column.name in detached else column for column in table.columns]
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(exclude_none=True)
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def export_ndjson(engine: Engine, batch_size: int = 1000) -> Iterator[bytes]:
+    """Yield the catalog as NDJSON chunks of up to ``batch_size`` lines."""
+    with engine.connect() as conn:
+        for model in TABLES:
+            table = model.__table__
+            prefix = b'{"table":"' + table.name.encode() + b'","row":'
+            statement = (
+                select(*_export_columns(table)).where(*_export_filter(model)).order_by(*table.primary_key.columns)
+            )
+            result = conn.execution_options(yield_per=batch_size).execute(statement)
+            for partition in result.mappings().partitions():
+                yield b"".join(prefix + orjson.dumps(dict(row), default=_default) + b"}\n" for row in partition)
+
+
+# row versions are local (they key the placement cache): an overwritten row
+# gets the next one here rather than the exporter's
+VERSIONED = {CarModel.__tablename__, Anchor.__tablename__, Part.__tablename__}
+
+
+def _upsert(conn, table, rows: List[Dict]):
+    """Insert-or-overwrite ``rows`` by primary key (executemany, batched by the driver)."""
+    keys = [column.name for column in table.primary_key.columns]
+    others = [column.name for column in table.columns if column.name not in keys]
+
+    def updated(inserted):
+        values = {name: inserted[name] for name in others}
+        if table.name in VERSIONED:
+            values["version"] = table.c.version + 1
+        return values
+
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        if others:
+            statement = statement.on_duplicate_key_update(**updated(statement.inserted))
+        else:
+            statement = statement.prefix_with("IGNORE")
+    elif dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table)
+        if others:
+            statement = statement.on_conflict_do_update(
+                index_elements=keys, set_=updated(statement.excluded)
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=keys)
+    else:
+        raise ValueError(f"Catalog import does not support {dialect}")
+    conn.execute(statement, rows)
+
+
+def _decoder(table):
+    # JSON has no datetime type; DateTime columns need real datetimes to bind
+    datetimes = [column.name for column in table.columns if isinstance(column.type, DateTime)]
+    detached = DETACHED_COLUMNS.get(table.name, set())
+
+    def decode(row: Dict) -> Dict:
+        for name in detached:  # files exported before these were nulled
+            if name in row:
+                row[name] = None
+        for name in datetimes:
+            if isinstance(row.get(name), str):
+                row[name] = datetime.fromisoformat(row[name])
+        return row
+
+    return decode
+
+
+def _reset_sequences(conn):
+    # explicit ids leave Postgres serial sequences behind
+    for model in TABLES:
+        table = model.__table__
+        keys = list(table.primary_key.columns)
+        if len(keys) == 1 and keys[0].autoincrement is not False and keys[0].type.python_type is int:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{keys[0].name}'), "
+                f"COALESCE((SELECT MAX({keys[0].name}) FROM {table.name}), 1))"
+            ))
+
+
+def import_ndjson(engine: Engine, lines: Iterable[bytes], batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Upsert NDJSON rows (as written by ``export_ndjson``) in batches of
+    ``batch_size``. Returns rows written per table. Existing rows with the
+    same primary key are overwritten; nothing is deleted.
+    """
+    counts: Dict[str, int] = {}
+    decoders = {name: _decoder(model.__table__) for name, model in _BY_NAME.items()}
+    fts = engine.dialect.name == "sqlite"
+    batch: List[Dict] = []
+    current: Optional[str] = None
+
+    def flush():
+        if not batch:
+            return
+        table = _BY_NAME[current].__table__
+        with engine.begin() as conn:
+            _upsert(conn, table, batch)
+            if fts and table is Part.__table__:
+                conn.execute(index_part_rows(batch))
+        counts[current] = counts.get(current, 0) + len(batch)
+        batch.clear()
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        name = record.get("table")
+        if name not in _BY_NAME:
+            raise ValueError(f"line {number}: unknown table {name!r}")
+        if name != current or len(batch) >= batch_size:
+            flush()
+            current = name
+        batch.append(decoders[name](record["row"]))
+    flush()
+
+    with engine.begin() as conn:
+        conn.execute(bump_catalog_version())
+        if engine.dialect.name == "postgresql":
+            _reset_sequences(conn)
+    # imported rows keep their source versions, which the placement keys can't tell apart
+    placement_cache.invalidate()
+    return counts
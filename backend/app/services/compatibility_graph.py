@@ -0,0 +1,231 @@
+"""
+In-memory part compatibility graph for whole-configuration checks.
+
+Built from PartCompatibility (part <-> part) and CarModelPartLink
+(car -> part). Every set of parts is a Python int used as a bitset, so
+checking or narrowing a configuration costs one AND / OR per selected part
+instead of a query per pair. Bits are dense positions assigned at load
+(``_index`` maps part id -> bit, ``_ids`` bit -> part id), not raw ids: a
+single part with id 2,000,000,000 would otherwise make every set that
+holds it a 250 MB int.
+
+Rules:
+- PartCompatibility is read symmetrically (a lists b == b lists a).
+- A part's slot is its category, or its type when it has none.
+- A part's compatibility rows only constrain the slots of the parts they
+  list: ``a`` conflicts with ``b`` when ``b`` is in one of those slots and
+  ``a`` does not list it, whether or not ``b`` has rows of its own. A
+  wheel that lists its tires rejects other tires and says nothing about
+  spoilers; a part with no rows constrains nothing.
+- A car with CarModelPartLink rows only accepts the parts linked to it; a
+  car with none accepts every part.
+
+Like the price index, part writes in this process patch the graph in place
+and a full rebuild every ``catalog_cache_ttl_seconds`` picks up everything
+else (other workers, the linking scripts).
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlmodel import select
+
+from app.config import get_settings
+from app.models import CarModelPartLink, Part, PartCompatibility
+
+
+def bits(mask: int) -> Iterator[int]:
+    """Set bit positions of ``mask`` in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def part_slot(category: str, part_type: str) -> str:
+    return category or part_type
+
+
+class CompatibilityGraph:
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._index: Dict[int, int] = {}  # part id -> bit position
+        self._ids: List[int] = []  # bit position -> part id
+        self._parts = 0  # every known part
+        self._constrained = 0  # parts with at least one compatibility row
+        self._compatible: Dict[int, int] = {}  # keyed by bit position
+        self._slot_of: Dict[int, str] = {}  # bit position -> slot
+        self._slots: Dict[str, int] = {}  # slot -> its parts
+        self._listed_slots: Dict[int, Set[str]] = {}  # slots a constrained part's rows cover
+        self._car_parts: Dict[int, int] = {}
+
+    def load(self, parts: Iterable[Tuple[int, str]], edges: Iterable[Tuple[int, int]], car_links: Iterable[Tuple[int, int]]):
+        """Replace the graph with ``(part_id, slot)`` rows, compatibility pairs and car links."""
+        index: Dict[int, int] = {}
+        ids: List[int] = []
+
+        def bit(part_id: int) -> int:
+            position = index.get(part_id)
+            if position is None:
+                position = index[part_id] = len(ids)
+                ids.append(part_id)
+            return position
+
+        known, slot_of, slots = 0, {}, {}
+        for part_id, slot in sorted(parts):
+            position = bit(part_id)
+            known |= 1 << position
+            slot_of[position] = slot
+            slots[slot] = slots.get(slot, 0) | (1 << position)
+        compatible: Dict[int, int] = {}
+        for a, b in edges:
+            a, b = bit(a), bit(b)
+            compatible[a] = compatible.get(a, 0) | (1 << b)
+            compatible[b] = compatible.get(b, 0) | (1 << a)
+        listed_slots = {
+            position: {slot_of[other] for other in bits(mask) if other in slot_of}
+            for position, mask in compatible.items()
+        }
+        car_parts: Dict[int, int] = {}
+        for car_model_id, part_id in car_links:
+            car_parts[car_model_id] = car_parts.get(car_model_id, 0) | (1 << bit(part_id))
+        constrained = 0
+        for position in compatible:
+            constrained |= 1 << position
+        with self._lock:
+            self._index = index
+            self._ids = ids
+            self._parts = known
+            self._constrained = constrained
+            self._compatible = compatible
+            self._slot_of = slot_of
+            self._slots = slots
+            self._listed_slots = listed_slots
+            self._car_parts = car_parts
+            self._loaded_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_fresh(self, session):
+        """Rebuild from the database if never built or older than the TTL."""
+        if not self.is_fresh():
+            self.load(
+                [(part_id, part_slot(category, part_type))
+                 for part_id, category, part_type in (await session.exec(select(Part.id, Part.category, Part.type))).all()],
+                (await session.exec(select(PartCompatibility.part_id, PartCompatibility.compatible_with_part_id))).all(),
+                (await session.exec(select(CarModelPartLink.car_model_id, CarModelPartLink.part_id))).all(),
+            )
+
+    def add_part(self, part_id: int, slot: str):
+        """Add a new part, or move an existing one to ``slot`` after an update."""
+        with self._lock:
+            position = self._index.get(part_id)
+            if position is None:
+                position = self._index[part_id] = len(self._ids)
+                self._ids.append(part_id)
+            bit = 1 << position
+            self._parts |= bit
+            old = self._slot_of.get(position)
+            if old is not None and old != slot:
+                self._slots[old] &= ~bit
+            self._slot_of[position] = slot
+            self._slots[slot] = self._slots.get(slot, 0) | bit
+            if old != slot:
+                for neighbour in bits(self._compatible.get(position, 0)):
+                    self._listed_slots[neighbour] = self._slots_listed_by(neighbour)
+
+    def remove_part(self, part_id: int):
+        with self._lock:
+            position = self._index.get(part_id)
+            if position is None:
+                return
+            # the position stays reserved for the id until the next load
+            bit = 1 << position
+            self._parts &= ~bit
+            self._constrained &= ~bit
+            slot = self._slot_of.get(position)
+            if slot in self._slots:
+                self._slots[slot] &= ~bit
+            self._listed_slots.pop(position, None)
+            for neighbour in bits(self._compatible.pop(position, 0) & ~bit):
+                self._compatible[neighbour] &= ~bit
+                if not self._compatible[neighbour]:
+                    del self._compatible[neighbour]
+                    del self._listed_slots[neighbour]
+                    self._constrained &= ~(1 << neighbour)
+                else:
+                    self._listed_slots[neighbour] = self._slots_listed_by(neighbour)
+            for car_model_id in self._car_parts:
+                self._car_parts[car_model_id] &= ~bit
+
+    def remove_car_model(self, car_model_id: int):
+        with self._lock:
+            self._car_parts.pop(car_model_id, None)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _known(self, part_ids: List[int]) -> Tuple[int, List[int]]:
+        known, unknown = 0, []
+        for part_id in dict.fromkeys(part_ids):
+            position = self._index.get(part_id)
+            if position is not None and self._parts >> position & 1:
+                known |= 1 << position
+            else:
+                unknown.append(part_id)
+        return known, unknown
+
+    def _slots_listed_by(self, position: int) -> Set[str]:
+        return {self._slot_of[other] for other in bits(self._compatible[position]) if other in self._slot_of}
+
+    def _rejects(self, position: int) -> int:
+        # parts in the slots this part's rows cover that it does not list
+        covered = 0
+        for slot in self._listed_slots[position]:
+            covered |= self._slots.get(slot, 0)
+        return covered & ~self._compatible[position] & ~(1 << position)
+
+    def _part_ids(self, mask: int) -> List[int]:
+        return sorted(self._ids[position] for position in bits(mask))
+
+    def validate(self, part_ids: List[int], car_model_id: Optional[int] = None) -> Dict:
+        """
+        Conflicts within ``part_ids`` and against the car. Pairs are
+        reported once, lower id first.
+        """
+        with self._lock:
+            selected, unknown = self._known(part_ids)
+            conflicts = set()
+            for a in bits(selected & self._constrained):
+                conflicts.update(
+                    tuple(sorted((self._ids[a], self._ids[b]))) for b in bits(selected & self._rejects(a))
+                )
+            car_conflicts = []
+            if car_model_id in self._car_parts:
+                car_conflicts = self._part_ids(selected & ~self._car_parts[car_model_id])
+        return {
+            "conflicts": sorted(conflicts),
+            "car_conflicts": car_conflicts,
+            "unknown_part_ids": unknown,
+        }
+
+    def remaining(self, part_ids: List[int], car_model_id: Optional[int] = None) -> List[int]:
+        """Parts not yet selected that could be added without a new conflict."""
+        with self._lock:
+            selected, _ = self._known(part_ids)
+            allowed = self._parts & ~selected
+            if car_model_id in self._car_parts:
+                allowed &= self._car_parts[car_model_id]
+            for a in bits(selected & self._constrained):
+                allowed &= ~self._rejects(a)
+            for candidate in bits(allowed & self._constrained):
+                if selected & self._rejects(candidate):
+                    allowed &= ~(1 << candidate)
+            return self._part_ids(allowed)
+
+compatibility_graph = CompatibilityGraph(ttl=get_settings().catalog_cache_ttl_seconds)
@@ -6,16 +6,18 @@ Service to ingest Sketchfab models into the database
 import os
 import json
 from typing import List, Optional
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Anchor
 from app.services.sketchfab_service import SketchfabService
-from app.db import DATABASE_URL
+from app.db import engine
+from app.services.catalog_cache import catalog_cache, bump_catalog_version, CAR_MODELS, ANCHORS
+from app.services.placement_cache import placement_cache
 
 class IngestionService:
     def __init__(self, api_token: str):
         self.sketchfab_service = SketchfabService(api_token)
         self.downloads_dir = "downloads"
-        self.engine = create_engine(DATABASE_URL, echo=True)
+        self.engine = engine
         os.makedirs(self.downloads_dir, exist_ok=True)
     
     def ingest_car_models(self, limit: int = 5) -> List[CarModel]:
@@ -64,13 +66,15 @@ class IngestionService:
                         source_url=f"https://sketchfab.com/3d-models/{sketchfab_model.uid}",
                         uploader=sketchfab_model.uploader,
                         source_uid=sketchfab_model.uid,
-                        bounds="",  # Will be calculated later
+                        bounds=None,  # Will be calculated later
                         scale_factor=1.0
                     )
                     
                     session.add(car_model)
+                    session.exec(bump_catalog_version())
                     session.commit()
                     session.refresh(car_model)
+                    catalog_cache.invalidate(CAR_MODELS)
                     
                     # Create anchor nodes for this car
                     self._create_anchor_nodes(session, car_model.id)
@@ -121,7 +125,7 @@ class IngestionService:
                 "pos_x": -0.8, "pos_y": 0, "pos_z": -1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_FR_anchor",
@@ -129,7 +133,7 @@ class IngestionService:
                 "pos_x": 0.8, "pos_y": 0, "pos_z": -1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_RL_anchor",
@@ -137,7 +141,7 @@ class IngestionService:
                 "pos_x": -0.8, "pos_y": 0, "pos_z": 1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             {
                 "name": "wheel_RR_anchor",
@@ -145,7 +149,7 @@ class IngestionService:
                 "pos_x": 0.8, "pos_y": 0, "pos_z": 1.2,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"radius": 0.34, "axis": "x", "type": "wheel"}'
+                "anchor_metadata": {"radius": 0.34, "axis": "x", "type": "wheel"}
             },
             # Body part anchors
             {
@@ -154,7 +158,7 @@ class IngestionService:
                 "pos_x": 0, "pos_y": 1.2, "pos_z": -2.5,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "spoiler"}'
+                "anchor_metadata": {"type": "spoiler"}
             },
             {
                 "name": "hood_anchor",
@@ -162,7 +166,7 @@ class IngestionService:
                 "pos_x": 0, "pos_y": 1.0, "pos_z": 0,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "hood"}'
+                "anchor_metadata": {"type": "hood"}
             },
             {
                 "name": "headlight_L_anchor",
@@ -170,7 +174,7 @@ class IngestionService:
                 "pos_x": -0.6, "pos_y": 0.8, "pos_z": 2.6,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "headlight"}'
+                "anchor_metadata": {"type": "headlight"}
             },
             {
                 "name": "headlight_R_anchor",
@@ -178,7 +182,7 @@ class IngestionService:
                 "pos_x": 0.6, "pos_y": 0.8, "pos_z": 2.6,
                 "rot_x": 0, "rot_y": 0, "rot_z": 0,
                 "scale_x": 1, "scale_y": 1, "scale_z": 1,
-                "anchor_metadata": '{"type": "headlight"}'
+                "anchor_metadata": {"type": "headlight"}
             }
         ]
         
@@ -186,5 +190,8 @@ class IngestionService:
             anchor = Anchor(car_model_id=car_model_id, **anchor_data)
             session.add(anchor)
         
+        session.exec(bump_catalog_version())
         session.commit()
+        catalog_cache.invalidate(CAR_MODELS, ANCHORS)
+        placement_cache.invalidate_car_model(car_model_id)
         print(f"Created {len(anchors)} anchor nodes for car model {car_model_id}") 
\ No newline at end of file
@@ -4,18 +4,21 @@ Service to ingest parts from Sketchfab into the database
 """
 
 import os
-import json
 from typing import List, Optional
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import Part
 from app.services.sketchfab_service import SketchfabService
-from app.db import DATABASE_URL
+from app.db import engine
+from app.services.catalog_cache import catalog_cache, bump_catalog_version, PARTS
+from app.services.compatibility_graph import compatibility_graph, part_slot
+from app.services.part_search import fts_enabled, index_part
+from app.services.price_index import price_index
 
 class PartIngestionService:
     def __init__(self, api_token: str):
         self.sketchfab_service = SketchfabService(api_token)
         self.downloads_dir = "downloads"
-        self.engine = create_engine(DATABASE_URL, echo=True)
+        self.engine = engine
         os.makedirs(self.downloads_dir, exist_ok=True)
     
     def ingest_parts(self, limit: int = 20) -> List[Part]:
@@ -96,8 +99,15 @@ class PartIngestionService:
                                 )
                                 
                                 session.add(part)
+                                session.flush()
+                                if fts_enabled():
+                                    session.exec(index_part(part))
+                                session.exec(bump_catalog_version())
                                 session.commit()
                                 session.refresh(part)
+                                catalog_cache.invalidate(PARTS)
+                                price_index.set(part.id, part.price)
+                                compatibility_graph.add_part(part.id, part_slot(part.category, part.type))
                                 
                                 ingested_parts.append(part)
                                 print(f"✅ Ingested: {part.name} ({part_type})")
@@ -185,7 +195,7 @@ class PartIngestionService:
         min_price, max_price = price_ranges.get(part_type, (100, 1000))
         return round(random.uniform(min_price, max_price), 2)
     
-    def _calculate_intrinsic_size(self, sketchfab_model) -> str:
+    def _calculate_intrinsic_size(self, sketchfab_model) -> dict:
         """
         Calculate intrinsic size for auto-scaling
         """
@@ -201,9 +211,9 @@ class PartIngestionService:
         # For now, return default sizes based on model name
         for part_type, size in default_sizes.items():
             if part_type in sketchfab_model.name.lower():
-                return json.dumps(size)
+                return size
         
-        return json.dumps({"length": 0.5, "width": 0.5, "height": 0.5})
+        return {"length": 0.5, "width": 0.5, "height": 0.5}
     
     def _get_attach_to(self, part_type: str) -> str:
         """
@@ -0,0 +1,175 @@
+"""
+Ranked, faceted part search.
+
+On SQLite, parts are indexed in the ``part_search`` FTS5 table (migration
+0006) with the part id as rowid, and results are ranked by bm25 with name
+matches weighted highest. Part writers keep the index current inside their
+own transaction:
+
+    session.add(part)
+    await session.flush()
+    if fts_enabled():
+        await session.exec(index_part(part))
+
+Other backends have no FTS table; matching falls back to case-insensitive
+LIKE on the same columns, unranked.
+
+A search is two queries whatever the catalog size: the ranked page, and
+one UNION ALL of the type / category / price-bucket counts over all matches.
+Recent results are kept in ``search_cache``, a small LRU of its own so that
+free-text queries never evict catalog rows from ``catalog_cache``.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, and_, case, delete, func, insert, literal, literal_column, or_, union_all
+from sqlmodel import select
+
+from app.config import get_settings
+from app.db import engine
+from app.models import Part
+from app.services.catalog_cache import CatalogCache
+
+# not part of SQLModel.metadata: create_all must not build it as a plain table
+part_search = Table(
+    "part_search",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("name", String),
+    Column("category", String),
+    Column("type", String),
+    Column("uploader", String),
+)
+
+SEARCH_COLUMNS = ("name", "category", "type", "uploader")
+
+# bm25 column weights, in SEARCH_COLUMNS order
+_WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+search_cache = CatalogCache(
+    maxsize=get_settings().search_cache_size, ttl=get_settings().catalog_cache_ttl_seconds
+)
+
+
+def fts_enabled() -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def index_part(part: Part):
+    """Insert or refresh the index entry for ``part`` (needs its id, so flush first)."""
+    return index_part_rows([{"id": part.id, **{column: getattr(part, column) for column in SEARCH_COLUMNS}}])
+
+
+def index_part_rows(rows: Sequence[Dict[str, Any]]):
+    """``index_part`` for plain part row dicts, e.g. a bulk import batch."""
+    values = [
+        {"rowid": row["id"], **{column: row.get(column) or "" for column in SEARCH_COLUMNS}}
+        for row in rows
+    ]
+    return insert(part_search).prefix_with("OR REPLACE").values(values)
+
+
+def unindex_part(part_id: int):
+    return delete(part_search).where(part_search.c.rowid == part_id)
+
+
+def search_terms(q: str) -> List[str]:
+    # quotes are FTS5 syntax; everything else is matched as a plain token
+    return [term for term in q.replace('"', " ").split() if term]
+
+
+def match_expression(terms: Sequence[str]) -> str:
+    """All terms must match; the last one as a prefix so results follow typing."""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _matches(terms: Sequence[str]):
+    """Subquery of (id, rank) for parts matching every term; lower rank is better."""
+    if fts_enabled():
+        table = literal_column("part_search")
+        return (
+            select(part_search.c.rowid.label("id"), func.bm25(table, *_WEIGHTS).label("rank"))
+            .where(table.op("MATCH")(match_expression(terms)))
+            .subquery("matches")
+        )
+    columns = [Part.__table__.columns[name] for name in SEARCH_COLUMNS]
+    return (
+        select(Part.id.label("id"), literal(0.0, Float).label("rank"))
+        .where(and_(*(or_(*(column.icontains(term, autoescape=True) for column in columns)) for term in terms)))
+        .subquery("matches")
+    )
+
+
+def _bucket_labels(edges: Sequence[float]) -> List[str]:
+    bounds = [0.0, *edges]
+    labels = [f"{low:g}-{high:g}" for low, high in zip(bounds, bounds[1:])]
+    return labels + [f"{bounds[-1]:g}+"]
+
+
+def _price_bucket(edges: Sequence[float]):
+    labels = _bucket_labels(edges)
+    return case(*((Part.price < edge, label) for edge, label in zip(edges, labels)), else_=labels[-1])
+
+
+async def search_parts(
+    session,
+    q: str,
+    columns: Sequence[str],
+    limit: int,
+    part_type: Optional[str] = None,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    ``{"total", "results", "facets"}`` for ``q``. Results are dicts of
+    ``columns`` in rank order; facets count every match after filters.
+    """
+    edges = sorted(get_settings().search_price_buckets)
+    facets: Dict[str, Dict[str, int]] = {
+        "type": {},
+        "category": {},
+        "price": dict.fromkeys(_bucket_labels(edges), 0),
+    }
+    terms = search_terms(q)
+    if not terms:
+        return {"total": 0, "results": [], "facets": facets}
+
+    matches = _matches(terms)
+    filters = []
+    if part_type is not None:
+        filters.append(Part.type == part_type)
+    if category is not None:
+        filters.append(Part.category == category)
+    if min_price is not None:
+        filters.append(Part.price >= min_price)
+    if max_price is not None:
+        filters.append(Part.price <= max_price)
+
+    page = (
+        select(*(Part.__table__.columns[name] for name in columns))
+        .join(matches, matches.c.id == Part.id)
+        .where(*filters)
+        .order_by(matches.c.rank, Part.id)
+        .limit(limit)
+    )
+    results = [dict(row._mapping) for row in (await session.exec(page)).all()]
+
+    matched = (
+        select(Part.type, Part.category, _price_bucket(edges).label("bucket"))
+        .join(matches, matches.c.id == Part.id)
+        .where(*filters)
+        .cte("matched")
+    )
+    counts = union_all(*(
+        select(literal(facet).label("facet"), column.label("value"), func.count().label("n"))
+        .group_by(column)
+        for facet, column in (("type", matched.c.type), ("category", matched.c.category), ("price", matched.c.bucket))
+    ))
+    rows = (await session.exec(select(*counts.subquery().c))).all()
+    for facet, value, count in sorted(rows, key=lambda row: (-row[2], row[1] or "")):
+        if value:
+            facets[facet][value] = count
+    return {"total": sum(facets["price"].values()), "results": results, "facets": facets}
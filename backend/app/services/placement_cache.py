@@ -0,0 +1,242 @@
+"""
+Memoized placement results.
+
+AutoPlacementService resolves the same (car model, part, anchor, variant)
+to the same transform until one of the rows it read changes, so results
+are cached under those ids plus the ``version`` of the car model, part and
+anchor rows (bumped on every ORM update by ``bump_row_version``).
+``load_placement_rows`` reads those versions uncached, so after an update
+every worker misses the old entry on its next lookup. Writes that keep the
+versions, like the NDJSON import (which copies them from the source), call
+``invalidate()`` instead.
+
+Entries are also tagged with what they depend on, and writers drop them
+right away: ``invalidate_part`` / ``invalidate_anchor`` /
+``invalidate_car_model`` for catalog rows and ``invalidate_fitment`` when a
+fitment for the pair is written, since a global fitment outranks auto
+placement.
+
+Backends (``placement_cache_backend`` setting):
+- ``memory``: a per-process LRU; entries live ``placement_cache_ttl_seconds``,
+  which bounds how long another worker misses a fitment change
+- ``redis``: shared by every worker, at ``placement_cache_url`` (pip install
+  redis); invalidations are seen everywhere at once
+Hit/miss counters are per process either way.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Protocol, Set, Tuple
+
+from app.config import get_settings
+from app.models import Anchor, CarModel, Part
+
+Key = Tuple[Hashable, ...]
+
+
+class PlacementBackend(Protocol):
+    def get(self, key: Key) -> Optional[Dict]: ...
+
+    def set(self, key: Key, value: Dict, tags: Iterable[str]) -> None: ...
+
+    def drop(self, tag: str) -> None:
+        """Remove every entry carrying ``tag``."""
+        ...
+
+    def clear(self) -> None: ...
+
+    def size(self) -> Optional[int]: ...
+
+
+class MemoryPlacementBackend:
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Key, Tuple[float, Dict, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Key]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Key) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Key, value: Dict, tags: Iterable[str]):
+        if self.maxsize <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def drop(self, tag: str):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisPlacementBackend:
+    """
+    Entries are JSON under ``<prefix>e:<key>``; each tag is a set of entry
+    keys under ``<prefix>t:<tag>``. Both expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "placement:"):
+        self.client = client
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+
+    def _entry(self, key: Key) -> str:
+        return f"{self.prefix}e:" + ":".join(str(part) for part in key)
+
+    def get(self, key: Key) -> Optional[Dict]:
+        value = self.client.get(self._entry(key))
+        return None if value is None else json.loads(value)
+
+    def set(self, key: Key, value: Dict, tags: Iterable[str]):
+        entry = self._entry(key)
+        self.client.set(entry, json.dumps(value), ex=self.ttl)
+        for tag in tags:
+            tag_key = f"{self.prefix}t:{tag}"
+            self.client.sadd(tag_key, entry)
+            self.client.expire(tag_key, self.ttl)
+
+    def drop(self, tag: str):
+        tag_key = f"{self.prefix}t:{tag}"
+        self.client.delete(tag_key, *self.client.smembers(tag_key))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None  # shared; not worth a SCAN per stats call
+
+
+def _copy(transform: Dict) -> Dict:
+    # callers may edit the lists they get back
+    return {name: list(value) for name, value in transform.items()}
+
+
+class PlacementCache:
+    def __init__(self, backend: PlacementBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(car_model: CarModel, part: Part, anchor: Anchor, part_variant_hash: str = "") -> Key:
+        return (
+            car_model.id, part.id, anchor.id, part_variant_hash,
+            car_model.version, part.version, anchor.version,
+        )
+
+    def get_or_compute(
+        self,
+        car_model: CarModel,
+        part: Part,
+        anchor: Anchor,
+        compute: Callable[[], Dict],
+        part_variant_hash: str = "",
+    ) -> Dict:
+        """Cached transform for the pair, or ``compute()`` stored for next time."""
+        key = self.key(car_model, part, anchor, part_variant_hash)
+        transform = self.backend.get(key)
+        with self._lock:
+            if transform is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if transform is None:
+            transform = compute()
+            self.backend.set(key, _copy(transform), (
+                f"car_model:{car_model.id}",
+                f"part:{part.id}",
+                f"anchor:{anchor.id}",
+                f"fitment:{car_model.id}:{part.id}:{anchor.id}",
+            ))
+        return _copy(transform)
+
+    def invalidate_car_model(self, car_model_id: int):
+        self._drop(f"car_model:{car_model_id}")
+
+    def invalidate_part(self, part_id: int):
+        self._drop(f"part:{part_id}")
+
+    def invalidate_anchor(self, anchor_id: int):
+        self._drop(f"anchor:{anchor_id}")
+
+    def invalidate_fitment(self, car_model_id: int, part_id: int, anchor_id: int):
+        self._drop(f"fitment:{car_model_id}:{part_id}:{anchor_id}")
+
+    def invalidate(self):
+        self.backend.clear()
+        with self._lock:
+            self.invalidations += 1
+
+    def _drop(self, tag: str):
+        self.backend.drop(tag)
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": self.backend.size(),
+            }
+
+
+def _build_cache() -> PlacementCache:
+    settings = get_settings()
+    if settings.placement_cache_backend == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("placement_cache_backend=redis needs the redis package (pip install redis)") from e
+        client = redis.Redis.from_url(settings.placement_cache_url)
+        return PlacementCache(RedisPlacementBackend(client, settings.placement_cache_ttl_seconds))
+    if settings.placement_cache_backend == "memory":
+        return PlacementCache(MemoryPlacementBackend(settings.placement_cache_size, settings.placement_cache_ttl_seconds))
+    raise ValueError(f"Unknown placement_cache_backend {settings.placement_cache_backend!r}; expected memory or redis")
+
+
+placement_cache = _build_cache()
@@ -0,0 +1,126 @@
+"""
+In-memory part price index for quotes.
+
+Prices live in a dense ``array('d')`` indexed by part id (NaN marks ids
+with no part), so pricing a configuration is a handful of array reads with
+no database round trip. The array is only used while the ids are dense
+enough (see ``_dense``): a few huge or scattered ids (imported catalogs,
+a sequence started high) switch the index to a plain dict instead of
+allocating 8 bytes for every id below them. Part writes in this process update it in place
+after commit; a full reload every ``catalog_cache_ttl_seconds`` picks up
+writes made by other workers, the same staleness bound as the catalog cache.
+"""
+
+import math
+import threading
+import time
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlmodel import select
+
+from app.config import get_settings
+from app.models import Part
+
+_UNKNOWN = math.nan
+
+# the array may hold up to this many slots per known price, or the floor
+_MAX_SLOTS_PER_PRICE = 4
+_MIN_DENSE_SLOTS = 1024
+
+
+def _dense(slots: int, prices: int) -> bool:
+    return slots <= max(_MIN_DENSE_SLOTS, prices * _MAX_SLOTS_PER_PRICE)
+
+
+class PriceIndex:
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._prices: Union[array, Dict[int, float]] = array("d")
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+
+    def load(self, rows: Iterable[Tuple[int, float]]):
+        """Replace the index with ``(part_id, price)`` rows."""
+        rows = list(rows)
+        slots = max((part_id for part_id, _ in rows), default=-1) + 1
+        if _dense(slots, len(rows)):
+            prices = array("d", [_UNKNOWN]) * slots
+            for part_id, price in rows:
+                prices[part_id] = price
+        else:
+            prices = dict(rows)
+        with self._lock:
+            self._prices = prices
+            self._loaded_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_fresh(self, session):
+        """Reload from the database if never loaded or older than the TTL."""
+        if not self.is_fresh():
+            self.load((await session.exec(select(Part.id, Part.price))).all())
+
+    def set(self, part_id: int, price: float):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # built in full on first use
+            prices = self._prices
+            if isinstance(prices, array) and part_id >= len(prices):
+                if part_id < max(_MIN_DENSE_SLOTS, 2 * len(prices)):
+                    prices.extend(array("d", [_UNKNOWN]) * (part_id + 1 - len(prices)))
+                else:
+                    # one id would more than double the array: stop growing it
+                    prices = self._prices = {i: value for i, value in enumerate(prices) if value == value}
+            prices[part_id] = price
+
+    def remove(self, part_id: int):
+        with self._lock:
+            if isinstance(self._prices, dict):
+                self._prices.pop(part_id, None)
+            elif part_id < len(self._prices):
+                self._prices[part_id] = _UNKNOWN
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def price(self, part_id: int) -> Optional[float]:
+        prices = self._prices
+        if isinstance(prices, dict):
+            return prices.get(part_id)
+        if 0 <= part_id < len(prices):
+            value = prices[part_id]
+            if value == value:  # not NaN
+                return value
+        return None
+
+
+def round_currency(amount: Decimal) -> Decimal:
+    exponent = Decimal(1).scaleb(-get_settings().currency_decimals)
+    return amount.quantize(exponent, rounding=ROUND_HALF_UP)
+
+
+def quote(index: PriceIndex, part_ids: List[int]) -> Dict:
+    """
+    Price one configuration. Duplicate ids are priced once, as in
+    estimate_cost; ids with no part are reported, not priced. Lines are
+    rounded first so they always add up to the total.
+    """
+    lines, unknown = [], []
+    for part_id in dict.fromkeys(part_ids):
+        price = index.price(part_id)
+        if price is None:
+            unknown.append(part_id)
+        else:
+            lines.append((part_id, round_currency(Decimal(repr(price)))))
+    return {
+        "lines": lines,
+        "total": sum((amount for _, amount in lines), Decimal(0)),
+        "unknown_part_ids": unknown,
+    }
+
+
+price_index = PriceIndex(ttl=get_settings().catalog_cache_ttl_seconds)
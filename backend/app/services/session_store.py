@@ -0,0 +1,300 @@
+"""
+Refresh tokens and the server-side store behind them.
+
+A login starts a *family*: the first refresh token, and every token rotated
+out of it. Each refresh consumes the presented token and issues the next one
+in the family. Presenting a consumed token again means it leaked (or two
+clients raced), so the whole family is revoked and the user has to sign in
+again. Tokens are opaque random strings; stores only ever see their SHA-256.
+
+A family lives ``refresh_token_expire_days`` from its login: rotated tokens
+inherit that expiry, so staying active never extends a session past it.
+Refreshing costs one user lookup (for current claims) and no bcrypt; only a
+real login pays for the password check.
+
+Backends (``session_store`` setting):
+- ``memory``: per process, for development and single-worker deployments
+- ``database``: the refresh_token table in the app database (the default)
+- ``redis``: any Redis-protocol server at ``session_store_url`` (pip install
+  redis); a local stand-in works as long as it speaks SET NX / EX and sets
+"""
+
+import hashlib
+import json
+import secrets
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Protocol, Set, Tuple
+
+from sqlmodel import Session, delete, update
+
+from app.config import get_settings
+from app.models import RefreshToken
+
+
+class InvalidRefreshToken(Exception):
+    """Unknown, expired or revoked refresh token."""
+
+
+class RefreshTokenReused(InvalidRefreshToken):
+    """An already rotated token came back; its family has been revoked."""
+
+
+@dataclass
+class RefreshSession:
+    token_hash: str
+    family_id: str
+    user_id: int
+    claims: Dict = field(default_factory=dict)
+    expires_at: float = 0.0  # unix seconds
+
+
+class SessionStore(Protocol):
+    def create(self, session: RefreshSession) -> None: ...
+
+    def get(self, token_hash: str) -> Optional[RefreshSession]: ...
+
+    def consume(self, token_hash: str) -> bool:
+        """Mark a token used; True only for the first caller."""
+        ...
+
+    def revoke_family(self, family_id: str) -> None: ...
+
+    def revoke_user(self, user_id: int) -> None: ...
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class MemorySessionStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, RefreshSession] = {}
+        self._used: Set[str] = set()
+        self._families: Dict[str, Set[str]] = {}
+        self._users: Dict[int, Set[str]] = {}
+
+    def create(self, session: RefreshSession):
+        with self._lock:
+            self._prune()
+            self._sessions[session.token_hash] = session
+            self._families.setdefault(session.family_id, set()).add(session.token_hash)
+            self._users.setdefault(session.user_id, set()).add(session.family_id)
+
+    def get(self, token_hash: str) -> Optional[RefreshSession]:
+        session = self._sessions.get(token_hash)
+        if session is None or session.expires_at <= time.time():
+            return None
+        return session
+
+    def consume(self, token_hash: str) -> bool:
+        with self._lock:
+            if token_hash in self._used:
+                return False
+            self._used.add(token_hash)
+            return True
+
+    def revoke_family(self, family_id: str):
+        with self._lock:
+            self._drop_family(family_id)
+
+    def revoke_user(self, user_id: int):
+        with self._lock:
+            for family_id in self._users.pop(user_id, set()):
+                self._drop_family(family_id)
+
+    def _drop_family(self, family_id: str):
+        for token_hash in self._families.pop(family_id, set()):
+            self._sessions.pop(token_hash, None)
+            self._used.discard(token_hash)
+
+    def _prune(self):
+        now = time.time()
+        for token_hash in [key for key, session in self._sessions.items() if session.expires_at <= now]:
+            session = self._sessions.pop(token_hash)
+            self._used.discard(token_hash)
+            family = self._families.get(session.family_id)
+            if family is not None:
+                family.discard(token_hash)
+                if not family:
+                    del self._families[session.family_id]
+                    self._users.get(session.user_id, set()).discard(session.family_id)
+
+
+class DatabaseSessionStore:
+    """Sessions in the refresh_token table; consume is a single conditional UPDATE."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def create(self, session: RefreshSession):
+        with Session(self.engine) as db:
+            db.add(RefreshToken(
+                token_hash=session.token_hash,
+                family_id=session.family_id,
+                user_id=session.user_id,
+                claims=session.claims,
+                expires_at=datetime.utcfromtimestamp(session.expires_at),
+            ))
+            db.exec(delete(RefreshToken).where(
+                RefreshToken.user_id == session.user_id,
+                RefreshToken.expires_at <= datetime.utcnow(),
+            ))
+            db.commit()
+
+    def get(self, token_hash: str) -> Optional[RefreshSession]:
+        with Session(self.engine) as db:
+            row = db.get(RefreshToken, token_hash)
+            if row is None or row.expires_at <= datetime.utcnow():
+                return None
+            return RefreshSession(
+                token_hash=row.token_hash,
+                family_id=row.family_id,
+                user_id=row.user_id,
+                claims=row.claims,
+                expires_at=(row.expires_at - datetime(1970, 1, 1)).total_seconds(),
+            )
+
+    def consume(self, token_hash: str) -> bool:
+        with Session(self.engine) as db:
+            result = db.exec(
+                update(RefreshToken)
+                .where(RefreshToken.token_hash == token_hash, RefreshToken.used_at.is_(None))
+                .values(used_at=datetime.utcnow())
+            )
+            db.commit()
+            return result.rowcount == 1
+
+    def revoke_family(self, family_id: str):
+        with Session(self.engine) as db:
+            db.exec(delete(RefreshToken).where(RefreshToken.family_id == family_id))
+            db.commit()
+
+    def revoke_user(self, user_id: int):
+        with Session(self.engine) as db:
+            db.exec(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+            db.commit()
+
+
+class RedisSessionStore:
+    """
+    Keys under ``prefix``: ``s:<hash>`` (session JSON, expires with the
+    token), ``u:<hash>`` (used marker, SET NX), and the sets ``f:<family>``
+    and ``user:<id>`` for revocation.
+    """
+
+    def __init__(self, client, prefix: str = "refresh:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _ttl(self, session: RefreshSession) -> int:
+        return max(1, int(session.expires_at - time.time()))
+
+    def create(self, session: RefreshSession):
+        ttl = self._ttl(session)
+        family_key = f"{self.prefix}f:{session.family_id}"
+        user_key = f"{self.prefix}user:{session.user_id}"
+        self.client.set(f"{self.prefix}s:{session.token_hash}", json.dumps(asdict(session)), ex=ttl)
+        self.client.sadd(family_key, session.token_hash)
+        self.client.expire(family_key, ttl)
+        self.client.sadd(user_key, session.family_id)
+        self.client.expire(user_key, ttl)
+
+    def get(self, token_hash: str) -> Optional[RefreshSession]:
+        value = self.client.get(f"{self.prefix}s:{token_hash}")
+        if value is None:
+            return None
+        session = RefreshSession(**json.loads(value))
+        return session if session.expires_at > time.time() else None
+
+    def consume(self, token_hash: str) -> bool:
+        session = self.get(token_hash)
+        ttl = self._ttl(session) if session else 60
+        return bool(self.client.set(f"{self.prefix}u:{token_hash}", "1", ex=ttl, nx=True))
+
+    def revoke_family(self, family_id: str):
+        family_key = f"{self.prefix}f:{family_id}"
+        hashes = [_text(member) for member in self.client.smembers(family_key)]
+        keys = [f"{self.prefix}{kind}:{token_hash}" for token_hash in hashes for kind in ("s", "u")]
+        self.client.delete(family_key, *keys)
+
+    def revoke_user(self, user_id: int):
+        user_key = f"{self.prefix}user:{user_id}"
+        for family_id in self.client.smembers(user_key):
+            self.revoke_family(_text(family_id))
+        self.client.delete(user_key)
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def issue_refresh_token(
+    store: SessionStore,
+    user_id: int,
+    claims: Dict,
+    family_id: Optional[str] = None,
+    expires_at: Optional[float] = None,
+) -> str:
+    """
+    New refresh token; a new family (login) unless ``family_id`` is given
+    (rotation), in which case ``expires_at`` carries the family's expiry.
+    """
+    token = secrets.token_urlsafe(32)
+    if expires_at is None:
+        expires_at = time.time() + get_settings().refresh_token_expire_days * 86400
+    store.create(RefreshSession(
+        token_hash=hash_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        user_id=user_id,
+        claims=claims,
+        expires_at=expires_at,
+    ))
+    return token
+
+
+def rotate_refresh_token(store: SessionStore, token: str) -> Tuple[RefreshSession, str]:
+    """
+    Consume ``token`` and issue its successor, which expires with the
+    family. Returns the consumed session and the new token. Raises
+    InvalidRefreshToken, or RefreshTokenReused after revoking the family.
+    """
+    token_hash = hash_token(token)
+    session = store.get(token_hash)
+    if session is None:
+        raise InvalidRefreshToken()
+    if not store.consume(token_hash):
+        store.revoke_family(session.family_id)
+        raise RefreshTokenReused()
+    return session, issue_refresh_token(
+        store, session.user_id, session.claims, session.family_id, session.expires_at
+    )
+
+
+def revoke_refresh_token(store: SessionStore, token: str):
+    """Sign out one login: revoke the family ``token`` belongs to."""
+    session = store.get(hash_token(token))
+    if session is not None:
+        store.revoke_family(session.family_id)
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    settings = get_settings()
+    if settings.session_store == "memory":
+        return MemorySessionStore()
+    if settings.session_store == "redis":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("session_store=redis needs the redis package (pip install redis)") from e
+        return RedisSessionStore(redis.Redis.from_url(settings.session_store_url))
+    if settings.session_store == "database":
+        from app.db import engine
+        return DatabaseSessionStore(engine)
+    raise ValueError(f"Unknown session_store {settings.session_store!r}; expected memory, database or redis")
@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+import pytest
+
+# app.db builds its engines at import time, so point settings at a scratch
+# database before any test module imports the app
+_TEST_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DIR}/test.db")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")  # minimum cost; hashing speed is not under test
+
+
+@pytest.fixture(params=[True, False], ids=["async", "threaded"])
+def db_async(request, monkeypatch):
+    """Runs the test twice: async routes, then the threadpool fallback."""
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "db_async", request.param)
+    return request.param
+
+
+@pytest.fixture
+def client(db_async):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def query_count():
+    """SQL statements a response ran, from QueryStatsMiddleware's Server-Timing header."""
+    def count(response) -> int:
+        timing = response.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        return int(timing.split('desc="')[1].split()[0])
+    return count
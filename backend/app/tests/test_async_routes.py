@@ -0,0 +1,18 @@
+def test_car_model_and_part_round_trip(client):
+    car = client.post("/car_models/", json={"name": "Test Car", "manufacturer": "Make", "year": 2024})
+    assert car.status_code == 201
+    car_id = car.json()["id"]
+
+    assert client.get(f"/car_models/{car_id}").json()["name"] == "Test Car"
+    assert any(c["id"] == car_id for c in client.get("/car_models/").json())
+
+    part = client.post("/parts/", json={"name": "Test Wheel", "type": "wheels", "price": 250.0})
+    assert part.status_code == 201
+    part_id = part.json()["id"]
+
+    cost = client.post("/parts/estimate_cost/", json={"part_ids": [part_id]})
+    assert cost.json() == {"total_cost": 250.0}
+
+    assert client.delete(f"/parts/{part_id}").status_code == 204
+    assert client.get(f"/parts/{part_id}").status_code == 404
+    assert client.delete(f"/car_models/{car_id}").status_code == 204
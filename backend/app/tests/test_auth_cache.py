@@ -0,0 +1,76 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import TokenCache, create_access_token, decode_access_token, revocation_list
+from app.db import engine
+from app.main import app
+from app.models import RevokedToken, User
+
+
+def _login(client) -> str:
+    email = f"claims-{uuid.uuid4().hex}@example.com"
+    client.post("/users/register", json={"email": email, "password": "pw", "first_name": "Ada", "last_name": "L"})
+    return client.post("/token", data={"username": email, "password": "pw"}).json()["access_token"]
+
+
+def test_claim_tokens_skip_the_user_lookup(query_count):
+    with TestClient(app) as client:
+        token = _login(client)
+        claims = decode_access_token(token)
+        assert {"uid", "email", "first_name", "last_name", "jti", "exp"} <= set(claims)
+
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(2):
+            response = client.get("/users/user_profile", headers=headers)
+            assert response.status_code == 200
+            assert query_count(response) == 0
+        assert response.json() == {"id": claims["uid"], "email": claims["email"], "first_name": "Ada", "last_name": "L"}
+
+
+def test_legacy_tokens_are_looked_up_once(query_count):
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email=f"legacy-{uuid.uuid4().hex}@example.com", password="x", first_name="O", last_name="ld")
+            session.add(user)
+            session.commit()
+            token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+        headers = {"Authorization": f"Bearer {token}"}
+        assert query_count(client.get("/users/user_profile", headers=headers)) == 1
+        assert query_count(client.get("/users/user_profile", headers=headers)) == 0
+
+
+def test_logout_revokes_a_cached_token():
+    with TestClient(app) as client:
+        token = _login(client)
+        other = _login(client)
+        for t in (token, other):
+            assert client.get("/users/user_profile", headers={"Authorization": f"Bearer {t}"}).status_code == 200
+
+        assert client.post("/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 204
+        assert client.get("/users/user_profile", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+        assert client.get("/users/user_profile", headers={"Authorization": f"Bearer {other}"}).status_code == 200
+
+        # a revocation written by another worker shows up once the reload
+        # interval has passed, even for a token answered from the cache
+        with Session(engine) as session:
+            session.add(RevokedToken(jti=decode_access_token(other)["jti"], expires_at=datetime.utcnow() + timedelta(hours=1)))
+            session.commit()
+        assert client.get("/users/user_profile", headers={"Authorization": f"Bearer {other}"}).status_code == 200
+        revocation_list._loaded_at -= revocation_list.refresh_seconds + 1
+        assert client.get("/users/user_profile", headers={"Authorization": f"Bearer {other}"}).status_code == 401
+
+
+def test_cache_entries_expire_with_the_token():
+    cache = TokenCache(maxsize=2)
+    principal = User(id=1, email="a@example.com", password="", first_name="", last_name="")
+    cache.set("expired", principal, {"exp": time.time() - 1})
+    cache.set("live", principal, {"exp": time.time() + 60})
+    assert cache.get("expired") is None
+    assert cache.get("live") is principal
+    cache.set("newer", principal, {"exp": time.time() + 60})
+    cache.set("newest", principal, {"exp": time.time() + 60})
+    assert cache.get("live") is None  # evicted, least recently used
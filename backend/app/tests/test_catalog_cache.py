@@ -0,0 +1,93 @@
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import create_access_token
+from app.config import get_settings
+from app.db import engine
+from app.main import app
+from app.models import Part, User
+from app.services.catalog_cache import CatalogCache, bump_catalog_version, catalog_cache, PARTS
+
+
+def test_lru_ttl_and_region_invalidation():
+    cache = CatalogCache(maxsize=2, ttl=0.05)
+    cache.set(("parts", 1), "a")
+    cache.set(("car_models", 1), "b")
+    assert cache.get(("parts", 1)) == "a"
+    cache.set(("anchors", 1), "c")  # evicts the least recently used entry
+    assert cache.get(("car_models", 1)) is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate("parts")
+    assert cache.get(("parts", 1)) is None
+    assert cache.get(("anchors", 1)) == "c"
+
+    time.sleep(0.06)
+    assert cache.get(("anchors", 1)) is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_none_results_are_not_cached():
+    cache = CatalogCache()
+    assert cache.get_or_load(("parts", 1), lambda: None) is None
+    assert cache.get_or_load(("parts", 1), lambda: "loaded") == "loaded"
+
+
+def test_part_reads_hit_cache_and_writes_invalidate():
+    catalog_cache.invalidate()
+    with TestClient(app) as client:
+        part_id = client.post("/parts/", json={"name": "Cached", "type": "wheels", "price": 10.0}).json()["id"]
+
+        before = catalog_cache.stats()
+        assert client.get(f"/parts/{part_id}").json()["name"] == "Cached"
+        assert client.get(f"/parts/{part_id}").json()["name"] == "Cached"
+        after = catalog_cache.stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+        # a write behind the cache's back is not seen until invalidation
+        with Session(engine) as session:
+            part = session.get(Part, part_id)
+            part.name = "Renamed"
+            session.add(part)
+            session.commit()
+        assert client.get(f"/parts/{part_id}").json()["name"] == "Cached"
+        catalog_cache.invalidate(PARTS)
+        assert client.get(f"/parts/{part_id}").json()["name"] == "Renamed"
+
+        # another worker's write: this process only sees the version bump
+        with Session(engine) as session:
+            part = session.get(Part, part_id)
+            part.name = "Elsewhere"
+            session.add(part)
+            session.exec(bump_catalog_version())
+            session.commit()
+        response = client.get(f"/parts/{part_id}")
+        assert response.json()["name"] == "Elsewhere"
+        assert client.get(f"/parts/{part_id}", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+        client.get("/parts/")
+        other = client.post("/parts/", json={"name": "Another", "type": "wheels", "price": 12.0}).json()["id"]
+        assert any(p["id"] == other for p in client.get("/parts/").json())
+        assert client.delete(f"/parts/{other}").status_code == 204
+
+        assert client.delete(f"/parts/{part_id}").status_code == 204
+        assert client.get(f"/parts/{part_id}").status_code == 404
+
+
+def test_admin_routes_require_an_admin(monkeypatch):
+    emails = [f"{name}-{uuid.uuid4().hex}@example.com" for name in ("user", "admin")]
+    with Session(engine) as session:
+        session.add_all([User(email=email, password="x", first_name="A", last_name="B") for email in emails])
+        session.commit()
+    user, admin = ({"Authorization": f"Bearer {create_access_token({'sub': email}, timedelta(minutes=5))}"} for email in emails)
+    monkeypatch.setattr(get_settings(), "admin_emails", [emails[1]])
+    with TestClient(app) as client:
+        for method, path in (("get", "/admin/cache/stats"), ("get", "/admin/cache/placements/stats"), ("post", "/admin/cache/clear")):
+            assert getattr(client, method)(path).status_code == 401
+            assert getattr(client, method)(path, headers=user).status_code == 403
+            assert getattr(client, method)(path, headers=admin).status_code in (200, 204)
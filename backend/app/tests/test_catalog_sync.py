@@ -0,0 +1,95 @@
+import uuid
+from datetime import timedelta
+
+import orjson
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.auth import create_access_token
+from app.config import get_settings
+from app.db import engine, init_db
+from app.main import app
+from app.migrations import run_migrations
+from app.models import Anchor, Bounds, CarModel, CarModelPartLink, Fitment, Part, Transform, User
+from app.services.catalog_sync import export_ndjson, import_ndjson
+from app.services.part_search import part_search
+from app.services.placement_cache import placement_cache
+
+
+def _seed():
+    init_db()
+    uploader = f"syncer-{uuid.uuid4().hex[:8]}"
+    with Session(engine) as session:
+        user = User(email=f"sync-{uuid.uuid4().hex}@example.com", password="x", first_name="S", last_name="Y")
+        car = CarModel(name="Sync car", manufacturer="Test", year=2024, bounds=Bounds(min=[0, 0, 0], max=[4, 1.5, 2]))
+        part = Part(name="Sync wheel", type="wheels", category="wheel", price=120.0, uploader=uploader)
+        session.add_all([user, car, part])
+        session.commit()
+        anchor = Anchor(car_model_id=car.id, name="wheel_FL_anchor", type="wheel", anchor_metadata={"radius": 0.3})
+        session.add_all([anchor, CarModelPartLink(car_model_id=car.id, part_id=part.id)])
+        session.commit()
+        for scope in ("global", "user"):
+            session.add(Fitment(car_model_id=car.id, part_id=part.id, anchor_id=anchor.id, scope=scope,
+                                created_by_user_id=user.id, transform_override=Transform(position=[1, 2, 3])))
+        session.commit()
+        return user.email, car.id, part.id, uploader
+
+
+def test_export_streams_catalog_without_user_fitments(monkeypatch):
+    email, car_id, part_id, _ = _seed()
+    token = create_access_token({"sub": email}, timedelta(minutes=5))
+    with TestClient(app) as client:
+        assert client.get("/admin/export").status_code == 401
+        assert client.get("/admin/export", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+        monkeypatch.setattr(get_settings(), "admin_emails", [email])
+        response = client.get("/admin/export", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [orjson.loads(line) for line in response.content.splitlines()]
+    tables = [record["table"] for record in records]
+    assert tables == sorted(tables, key=["carmodel", "anchor", "part", "carmodelpartlink", "partcompatibility", "fitment"].index)
+    assert {"table": "carmodelpartlink", "row": {"car_model_id": car_id, "part_id": part_id}} in records
+    fitments = [record["row"] for record in records if record["table"] == "fitment"]
+    assert fitments and all(row["scope"] == "global" for row in fitments)
+
+
+def test_round_trip_into_an_empty_database(tmp_path):
+    _, car_id, part_id, uploader = _seed()
+    exported = b"".join(export_ndjson(engine, batch_size=2)).splitlines(keepends=True)
+
+    target = create_engine(f"sqlite:///{tmp_path}/target.db")
+
+    # enforce foreign keys like Postgres / MySQL would: users are not exported
+    @event.listens_for(target, "connect")
+    def enforce_foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    SQLModel.metadata.create_all(target)
+    run_migrations(target)
+    counts = import_ndjson(target, iter(exported), batch_size=3)
+    assert sum(counts.values()) == len(exported)
+    assert import_ndjson(target, iter(exported), batch_size=3) == counts  # upserts, no duplicates
+
+    with Session(target) as session:
+        car = session.get(CarModel, car_id)
+        assert car.bounds == Bounds(min=[0, 0, 0], max=[4, 1.5, 2])
+        fitment = session.exec(select(Fitment).where(Fitment.car_model_id == car_id)).one()
+        assert fitment.scope == "global" and fitment.transform_override.position == [1, 2, 3]
+        assert fitment.created_at is not None
+        assert fitment.created_by_user_id is None
+        assert session.exec(select(part_search.c.rowid).where(part_search.c.uploader == uploader)).all() == [part_id]
+    target.dispose()
+
+
+def test_import_drops_memoized_placements(tmp_path):
+    _seed()
+    exported = b"".join(export_ndjson(engine)).splitlines(keepends=True)
+    target = create_engine(f"sqlite:///{tmp_path}/target.db")
+    SQLModel.metadata.create_all(target)
+    run_migrations(target)
+    # same ids and versions as before the import, different rows
+    placement_cache.backend.set(("stale",), {"position": [9, 9, 9]}, [])
+    import_ndjson(target, iter(exported))
+    assert placement_cache.backend.get(("stale",)) is None
+    target.dispose()
@@ -0,0 +1,94 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import engine
+from app.main import app
+from app.models import CarModel, CarModelPartLink, Part, PartCompatibility
+from app.services.compatibility_graph import CompatibilityGraph, compatibility_graph
+
+
+def test_validate_and_remaining():
+    graph = CompatibilityGraph()
+    # wheel 1 lists tire 2, spoiler 4 lists wing 5; tire 3 and wing 6 have no rows
+    graph.load(
+        [(1, "wheel"), (2, "tire"), (3, "tire"), (4, "spoiler"), (5, "wing"), (6, "wing")],
+        [(1, 2), (4, 5)],
+        [(7, 1), (7, 2), (7, 4)],
+    )
+
+    # rows in unrelated slots never clash
+    assert graph.validate([1, 2, 4, 5]) == {"conflicts": [], "car_conflicts": [], "unknown_part_ids": []}
+    assert graph.validate([3, 6]) == {"conflicts": [], "car_conflicts": [], "unknown_part_ids": []}
+    # an unlisted part in a listed slot clashes, with or without rows of its own
+    assert graph.validate([4, 6])["conflicts"] == [(4, 6)]
+    assert graph.validate([3, 1, 2, 4, 99], car_model_id=7) == {
+        "conflicts": [(1, 3)],
+        "car_conflicts": [3],
+        "unknown_part_ids": [99],
+    }
+    assert graph.remaining([1]) == [2, 4, 5, 6]
+    assert graph.remaining([1], car_model_id=7) == [2, 4]
+    assert graph.remaining([3]) == [2, 4, 5, 6]  # wheel 1 only takes tire 2
+
+    graph.add_part(3, "wheel")  # re-slotted by an update
+    assert graph.validate([1, 3]) == {"conflicts": [], "car_conflicts": [], "unknown_part_ids": []}
+    graph.add_part(3, "tire")
+
+    graph.remove_part(2)
+    assert graph.validate([1, 3]) == {"conflicts": [], "car_conflicts": [], "unknown_part_ids": []}
+    assert graph.remaining([], car_model_id=7) == [1, 4]
+
+
+def test_validate_configuration_endpoint():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            car = CarModel(name="Graph car", manufacturer="Test", year=2024)
+            wheel = Part(name="Graph wheel", type="wheels", price=100.0)
+            tire = Part(name="Graph tire", type="wheels", price=50.0)
+            rim = Part(name="Graph rim", type="wheels", price=75.0)
+            session.add_all([car, wheel, tire, rim])
+            session.commit()
+            session.add_all([
+                PartCompatibility(part_id=wheel.id, compatible_with_part_id=tire.id),
+                PartCompatibility(part_id=rim.id, compatible_with_part_id=rim.id),
+                CarModelPartLink(car_model_id=car.id, part_id=wheel.id),
+                CarModelPartLink(car_model_id=car.id, part_id=tire.id),
+            ])
+            session.commit()
+            car_id, wheel_id, tire_id, rim_id = car.id, wheel.id, tire.id, rim.id
+        compatibility_graph.invalidate()  # links were written behind the API's back
+
+        ok = client.post("/parts/validate_configuration", json={
+            "car_model_id": car_id, "part_ids": [wheel_id, tire_id], "include_remaining": True,
+        }).json()
+        assert ok["valid"] is True
+        assert ok["remaining_part_ids"] == []
+
+        bad = client.post("/parts/validate_configuration", json={"car_model_id": car_id, "part_ids": [rim_id, wheel_id]}).json()
+        assert bad["valid"] is False
+        assert bad["conflicts"] == [{"part_id": wheel_id, "conflicts_with_part_id": rim_id}]
+        assert bad["car_conflicts"] == [rim_id]
+        assert bad["remaining_part_ids"] is None
+
+        client.delete(f"/parts/{rim_id}")
+        gone = client.post("/parts/validate_configuration", json={"part_ids": [rim_id, wheel_id]}).json()
+        assert gone["conflicts"] == [] and gone["unknown_part_ids"] == [rim_id]
+
+
+def test_sparse_ids_get_dense_bits():
+    graph = CompatibilityGraph()
+    huge = 2_000_000_000
+    graph.load([(1, "wheel"), (huge, "tire"), (huge + 5, "spoiler")], [(1, huge)], [(7, huge)])
+    assert max(graph._parts.bit_length(), *(mask.bit_length() for mask in graph._compatible.values())) <= 3
+
+    assert graph.validate([huge, 1, huge + 5], car_model_id=7) == {
+        "conflicts": [], "car_conflicts": [1, huge + 5], "unknown_part_ids": [],
+    }
+    assert graph.remaining([huge]) == [1, huge + 5]
+
+    graph.add_part(huge * 2, "tire")
+    assert graph.remaining([]) == [1, huge, huge + 5, huge * 2]
+    assert graph.validate([1, huge * 2])["conflicts"] == [(1, huge * 2)]
+    assert graph._parts.bit_length() == 4
+    graph.remove_part(huge)
+    assert graph.validate([huge]) == {"conflicts": [], "car_conflicts": [], "unknown_part_ids": [huge]}
@@ -0,0 +1,93 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import compression
+from app.compression import CompressionMiddleware, PrecompressedStaticFiles, accepted_encodings
+from app.main import app
+
+needs_brotli = pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "precompress_assets.py"
+
+
+def test_accept_encoding_negotiation():
+    assert accepted_encodings("gzip, deflate, br", ["br", "gzip"]) == ["br", "gzip"]
+    assert accepted_encodings("br;q=0.5, gzip", ["br", "gzip"]) == ["gzip", "br"]
+    assert accepted_encodings("br;q=0, *", ["br", "gzip"]) == ["gzip"]
+    assert accepted_encodings("identity", ["br", "gzip"]) == []
+
+
+@needs_brotli
+def test_json_is_compressed_above_threshold():
+    with TestClient(app) as client:
+        for i in range(20):
+            client.post("/parts/", json={"name": f"Compressed {i}", "type": "wheels", "price": 1.0})
+
+        response = client.get("/parts/", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["etag"].endswith('-br"')
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()) >= 20  # httpx decodes br
+
+        # the encoded ETag still revalidates
+        cached = client.get("/parts/", headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
+
+        gzipped = client.get("/parts/", headers={"Accept-Encoding": "gzip"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+
+        small = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+        assert "content-encoding" not in small.headers
+        plain = client.get("/parts/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+
+def test_streaming_responses_are_compressed_incrementally():
+    streaming = FastAPI()
+    streaming.add_middleware(CompressionMiddleware)
+
+    @streaming.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"n": {i}}}\n' for i in range(500)), media_type="application/x-ndjson")
+
+    with TestClient(streaming) as client:
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text.count("\n") == 500
+
+
+@needs_brotli
+def test_precompressed_siblings_are_served(tmp_path):
+    asset = tmp_path / "car.glb"
+    asset.write_bytes(b"glTF" + b"\x00" * 4096)
+
+    spec = importlib.util.spec_from_file_location("precompress_assets", SCRIPT)
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+    assert set(script.precompress(asset)) == {"gzip", "br"}
+    assert script.precompress(asset) == []  # up to date
+
+    static = FastAPI()
+    static.mount("/models", PrecompressedStaticFiles(directory=tmp_path), name="models")
+    with TestClient(static) as client:
+        br = client.get("/models/car.glb", headers={"Accept-Encoding": "br, gzip"})
+        assert br.headers["content-encoding"] == "br"
+        assert br.headers["content-type"] == "model/gltf-binary"
+        assert br.content == asset.read_bytes()
+
+        gz = client.get("/models/car.glb", headers={"Accept-Encoding": "gzip"})
+        assert gz.headers["content-encoding"] == "gzip"
+
+        plain = client.get("/models/car.glb", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == asset.read_bytes()
+
+        # a source newer than its siblings is served uncompressed until rebuilt
+        os.utime(asset, (asset.stat().st_atime, asset.stat().st_mtime + 10))
+        assert "content-encoding" not in client.get("/models/car.glb", headers={"Accept-Encoding": "br"}).headers
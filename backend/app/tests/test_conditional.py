@@ -0,0 +1,64 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import engine
+from app.main import app
+from app.models import CarModel, CarModelPartLink, CatalogVersion, Part
+from app.services.catalog_cache import bump_catalog_version
+
+
+def test_catalog_etag_revalidates_until_a_write():
+    with TestClient(app) as client:
+        first = client.get("/parts/")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"].startswith("public")
+
+        cached = client.get("/parts/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert client.get("/car_models/", headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+        assert client.get("/parts/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+        part = client.post("/parts/", json={"name": "New", "type": "wheels", "price": 1.0}).json()
+        changed = client.get("/parts/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert any(p["id"] == part["id"] for p in changed.json())
+
+        projected = client.get("/parts/?view=card")
+        assert projected.headers["etag"] == changed.headers["etag"]
+
+        client.delete(f"/parts/{part['id']}")
+        with Session(engine) as session:
+            assert session.get(CatalogVersion, 1).version >= 3
+
+
+def test_catalog_etag_sees_writes_from_other_workers():
+    with TestClient(app) as client:
+        etag = client.get("/parts/").headers["etag"]
+        # another worker's write: this process's catalog cache is not invalidated
+        with Session(engine) as session:
+            session.exec(bump_catalog_version())
+            session.commit()
+        response = client.get("/parts/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+def test_linking_script_writes_reach_cached_car_part_lists():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            car = CarModel(name="Linked car", manufacturer="Test", year=2024)
+            part = Part(name="Linked part", type="wheels", price=1.0)
+            session.add_all([car, part])
+            session.commit()
+            car_id, part_id = car.id, part.id
+        assert client.get(f"/parts/car_model/{car_id}").json() == []
+
+        # what link_parts_to_cars.py does from its own process
+        with Session(engine) as session:
+            session.add(CarModelPartLink(car_model_id=car_id, part_id=part_id))
+            session.exec(bump_catalog_version())
+            session.commit()
+        assert [p["id"] for p in client.get(f"/parts/car_model/{car_id}").json()] == [part_id]
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.config import Settings
+from app import db
+from app.db import create_db_engine, create_read_engine
+
+
+def make_settings(tmp_path, **overrides):
+    return Settings(
+        secret_key="test",
+        database_url=f"sqlite:///{tmp_path}/wal.db",
+        sqlite_wal=True,
+        **overrides,
+    )
+
+
+def test_sqlite_wal_pragmas(tmp_path):
+    settings = make_settings(tmp_path, sqlite_busy_timeout_ms=1234)
+    engine = create_db_engine(settings.database_url, settings)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    engine.dispose()
+
+
+def test_read_engine_is_read_only(tmp_path):
+    settings = make_settings(tmp_path)
+    engine = create_db_engine(settings.database_url, settings)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    read_engine = create_read_engine(settings)
+    assert read_engine is not engine
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT x FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+    read_engine.dispose()
+    engine.dispose()
+
+
+def test_read_engine_without_a_read_url_uses_the_given_settings(tmp_path):
+    settings = Settings(secret_key="test", database_url=f"sqlite:///{tmp_path}/plain.db", sqlite_wal=False)
+    read_engine = create_read_engine(settings)
+    assert read_engine is not db.engine
+    assert read_engine.url.database == f"{tmp_path}/plain.db"
+    read_engine.dispose()
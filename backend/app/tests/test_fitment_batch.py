@@ -0,0 +1,59 @@
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import create_access_token
+from app.db import engine
+from app.main import app
+from app.models import Fitment, Transform, User
+from app.routers.fitments import BEST_FITMENT_BATCH_MAX
+
+
+def _transform(x: float) -> Transform:
+    return Transform(position=[x, 0, 0], rotation_euler=[0, 0, 0], scale=[1, 1, 1])
+
+
+def test_batch_matches_single_lookups_in_input_order(query_count):
+    car_id = 500 + uuid.uuid4().int % 100000
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email=f"batch-{uuid.uuid4().hex}@example.com", password="x", first_name="B", last_name="T")
+            session.add(user)
+            session.commit()
+            for part_id, score in [(1, 0.2), (1, 0.9), (1, 0.5), (2, 0.4)]:
+                session.add(Fitment(car_model_id=car_id, part_id=part_id, anchor_id=1, scope="global",
+                                    quality_score=score, transform_override=_transform(score)))
+            session.add(Fitment(car_model_id=car_id, part_id=2, anchor_id=1, scope="user", created_by_user_id=user.id,
+                                quality_score=0.1, transform_override=_transform(-1)))
+            session.add(Fitment(car_model_id=car_id, part_id=3, anchor_id=1, part_variant_hash="v2", scope="global",
+                                quality_score=0.3, transform_override=_transform(3)))
+            session.commit()
+            token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+
+        keys = [
+            {"car_model_id": car_id, "part_id": 2, "anchor_id": 1},
+            {"car_model_id": car_id, "part_id": 9, "anchor_id": 1},
+            {"car_model_id": car_id, "part_id": 1, "anchor_id": 1},
+            {"car_model_id": car_id, "part_id": 3, "anchor_id": 1, "part_variant_hash": "v2"},
+            {"car_model_id": car_id, "part_id": 3, "anchor_id": 1},
+            {"car_model_id": car_id, "part_id": 1, "anchor_id": 1},
+        ]
+        anonymous = client.post("/fitments/best:batch", json={"items": keys})
+        assert anonymous.status_code == 200
+        assert query_count(anonymous) == 1
+        results = anonymous.json()
+        assert [r and r["quality_score"] for r in results] == [0.4, None, 0.9, 0.3, None, 0.9]
+        for key, result in zip(keys, results):
+            single = client.get("/fitments/best", params=key).json()
+            assert (single and single["id"]) == (result and result["id"])
+
+        signed_in = client.post("/fitments/best:batch", json={"items": keys}, headers={"Authorization": f"Bearer {token}"})
+        assert query_count(signed_in) == 3  # user lookup + one query per scope
+        assert signed_in.json()[0]["scope"] == "user"
+        assert signed_in.json()[0]["transform_override"]["position"] == [-1, 0, 0]
+
+        assert client.post("/fitments/best:batch", json={"items": []}).json() == []
+        too_many = [keys[0]] * (BEST_FITMENT_BATCH_MAX + 1)
+        assert client.post("/fitments/best:batch", json={"items": too_many}).status_code == 422
@@ -0,0 +1,125 @@
+import pytest
+from sqlalchemy import MetaData, text
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.migrations import MIGRATIONS, current_version, m0010_catalog_autoincrement, run_migrations
+from app.models import Anchor, CarModel, Fitment, Part, User
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_are_recorded(engine):
+    assert current_version(engine) == MIGRATIONS[-1].VERSION
+    assert run_migrations(engine) == []
+
+
+def test_user_fitment_lookup_uses_index(engine):
+    statement = select(Fitment).where(
+        Fitment.car_model_id == 1,
+        Fitment.part_id == 2,
+        Fitment.anchor_id == 3,
+        Fitment.part_variant_hash == "",
+        Fitment.scope == "user",
+        Fitment.created_by_user_id == 4,
+    )
+    assert "ix_fitment_lookup" in query_plan(engine, statement)
+
+
+def test_global_best_fitment_uses_partial_index_without_sort(engine):
+    statement = select(Fitment).where(
+        Fitment.car_model_id == 1,
+        Fitment.part_id == 2,
+        Fitment.anchor_id == 3,
+        Fitment.part_variant_hash == "",
+        Fitment.scope == "global",
+    ).order_by(Fitment.quality_score.desc())
+    plan = query_plan(engine, statement)
+    assert "ix_fitment_global_best" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize(
+    "statement, index",
+    [
+        (select(Anchor).where(Anchor.car_model_id == 1, Anchor.name == "spoiler_anchor"), "ix_anchor_car_model_name"),
+        (select(Anchor).where(Anchor.car_model_id == 1, Anchor.type == "wheel"), "ix_anchor_car_model_type"),
+        (select(User).where(User.email == "a@b.c"), "ix_user_email"),
+        (select(CarModel).where(CarModel.source_uid == "abc"), "ix_carmodel_source_uid"),
+        (select(Part).where(Part.source_uid == "abc"), "ix_part_source_uid"),
+    ],
+)
+def test_catalog_lookups_use_indexes(engine, statement, index):
+    assert index in query_plan(engine, statement)
+
+
+def test_migrations_upgrade_legacy_schema():
+    # a database created before the indexes existed, with one car and no anchors
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(text(f"DROP INDEX {index.name}"))
+        conn.execute(text("INSERT INTO carmodel (name, manufacturer, year, glb_url, thumbnail_url, license_slug, "
+                          "license_url, attribution_html, source_url, uploader, source_uid, bounds, scale_factor, "
+                          "unit_scale, default_up_axis, anchors_ready) "
+                          "VALUES ('Car', 'Make', 2024, '', '', '', '', '', '', '', '', '', 1, 1, 'Y', 0)"))
+
+    run_migrations(engine)
+
+    statement = select(Fitment).where(Fitment.car_model_id == 1, Fitment.part_id == 2, Fitment.anchor_id == 3,
+                                      Fitment.part_variant_hash == "", Fitment.scope == "global"
+                                      ).order_by(Fitment.quality_score.desc())
+    assert "ix_fitment_global_best" in query_plan(engine, statement)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM anchor WHERE car_model_id = 1")).scalar() == 12
+    engine.dispose()
+
+
+def test_catalog_tables_are_rebuilt_with_autoincrement():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # the part table as created before migration 10
+        legacy = Part.__table__.to_metadata(MetaData())
+        legacy.dialect_options["sqlite"]["autoincrement"] = False
+        conn.execute(text("DROP TABLE part"))
+        conn.execute(CreateTable(legacy))
+        for index in legacy.indexes:
+            conn.execute(CreateIndex(index))
+    with Session(engine) as session:
+        session.add_all([Part(name="Kept", type="wheels", price=1), Part(name="Last", type="wheels", price=1)])
+        session.commit()
+    with engine.connect() as conn:
+        assert "AUTOINCREMENT" not in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'part'")).scalar()
+
+    with engine.begin() as conn:
+        m0010_catalog_autoincrement.upgrade(conn)
+        m0010_catalog_autoincrement.upgrade(conn)  # idempotent
+    with engine.begin() as conn:
+        assert "AUTOINCREMENT" in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'part'")).scalar()
+        assert conn.execute(text("SELECT name FROM part ORDER BY id")).scalars().all() == ["Kept", "Last"]
+        conn.execute(text("DELETE FROM part WHERE id = 2"))
+    with Session(engine) as session:
+        part = Part(name="New", type="wheels", price=1)
+        session.add(part)
+        session.commit()
+        assert part.id == 3
+    assert "ix_part_category_id" in query_plan(engine, select(Part).where(Part.category == "rim").order_by(Part.id))
+    engine.dispose()
@@ -0,0 +1,76 @@
+import hashlib
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.migrations import run_migrations
+from app.models import Fitment, IntrinsicSize, Part, Transform
+from app.services.auto_placement_service import AutoPlacementService
+
+
+def test_legacy_json_strings_are_normalized_and_decoded():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for i, size in enumerate(['{"radius": 0.3, "type": "wheel"}', "", "not json"], start=1):
+            conn.execute(text(
+                "INSERT INTO part (id, name, type, category, price, glb_url, thumbnail_url, license_slug, "
+                "license_url, attribution_html, source_url, uploader, source_uid, intrinsic_size, nominal_size, "
+                "pivot_hint, symmetry, bounding_box, attach_to, pos_x, pos_y, pos_z, rot_x, rot_y, rot_z, "
+                "scale_x, scale_y, scale_z) VALUES (:id, 'p', 'wheels', '', 1, '', '', '', '', '', '', '', '', "
+                ":size, 0, 'center', '', '', '', 0, 0, 0, 0, 0, 0, 1, 1, 1)"
+            ), {"id": i, "size": size})
+
+    run_migrations(engine)
+
+    with Session(engine) as session:
+        parts = session.exec(select(Part).order_by(Part.id)).all()
+        assert parts[0].intrinsic_size == IntrinsicSize(radius=0.3, type="wheel")
+        assert parts[1].intrinsic_size is None
+        assert parts[2].intrinsic_size is None
+        assert parts[0].bounding_box is None
+    engine.dispose()
+
+
+def test_transform_round_trip_and_variant_hash_is_stable():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        part = Part(name="Wheel", type="wheels", price=1, glb_url="w.glb", intrinsic_size={"radius": 0.34, "type": "wheel"})
+        session.add(part)
+        session.commit()
+        session.refresh(part)
+        fitment = Fitment(car_model_id=1, part_id=part.id, anchor_id=1,
+                          transform_override={"position": [1, 2, 3], "rotation_euler": [0, 0, 0], "scale": [1, 1, 1]})
+        session.add(fitment)
+        session.commit()
+        session.refresh(fitment)
+
+        assert isinstance(fitment.transform_override, Transform)
+        assert fitment.transform_override.position == [1.0, 2.0, 3.0]
+
+        # hash input matches what the JSON-string column used to produce
+        expected = hashlib.sha256('w.glb:{"radius": 0.34, "type": "wheel"}:'.encode()).hexdigest()
+        assert AutoPlacementService(session).compute_part_variant_hash(part) == expected
+    engine.dispose()
+
+
+def test_variant_hash_ignores_key_order_and_value_type():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        service = AutoPlacementService(session)
+        stored = Part(name="Spoiler", type="spoiler", price=1, glb_url="s.glb",
+                      intrinsic_size={"length": 1.2, "width": 0.3, "height": 0.25})
+        session.add(stored)
+        session.commit()
+        session.refresh(stored)
+        # rows detached from the catalog cache can carry the raw dict
+        detached = Part(name="Spoiler", type="spoiler", price=1, glb_url="s.glb")
+        detached.intrinsic_size = {"length": 1.2, "width": 0.3, "height": 0.25}
+
+        expected = hashlib.sha256('s.glb:{"height": 0.25, "length": 1.2, "width": 0.3}:'.encode()).hexdigest()
+        assert service.compute_part_variant_hash(stored) == expected
+        assert service.compute_part_variant_hash(detached) == expected
+    engine.dispose()
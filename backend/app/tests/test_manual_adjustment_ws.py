@@ -0,0 +1,133 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.websockets import WebSocketDisconnect
+
+from app.auth import create_access_token
+from app.config import get_settings
+from app.db import engine
+from app.main import app
+from app.models import Anchor, CarModel, Fitment, Part, User
+
+
+def _setup(client):
+    with Session(engine) as session:
+        user = User(email=f"drag-{uuid.uuid4().hex}@example.com", password="x", first_name="D", last_name="R")
+        car = CarModel(name="Drag car", manufacturer="Test", year=2024)
+        part = Part(name="Drag spoiler", type="exterior", price=10.0, attach_to="spoiler_anchor")
+        session.add_all([user, car, part])
+        session.commit()
+        session.add(Anchor(car_model_id=car.id, name="spoiler_anchor", type="spoiler"))
+        session.commit()
+        token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+        return token, user.id, car.id, part.id
+
+
+def _fitment(user_id, part_id):
+    with Session(engine) as session:
+        return session.exec(select(Fitment).where(Fitment.created_by_user_id == user_id, Fitment.part_id == part_id)).one()
+
+
+def test_rejects_bad_token():
+    with TestClient(app) as client:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect("/fitments/manual-adjustment/ws?car_model_id=1&part_id=1&token=nope"):
+                pass
+        assert closed.value.code == 1008
+
+
+def test_one_version_per_flush(monkeypatch):
+    monkeypatch.setattr(get_settings(), "manual_adjustment_flush_seconds", 60)
+    with TestClient(app) as client:
+        token, user_id, car_id, part_id = _setup(client)
+        url = f"/fitments/manual-adjustment/ws?car_model_id={car_id}&part_id={part_id}&token={token}"
+
+        with client.websocket_connect(url) as ws:
+            assert ws.receive_json()["version"] == 0
+            for _ in range(50):
+                ws.send_json({"delta": {"position": [0.01, 0, 0], "scale": [1, 1.01, 1]}})
+            ws.send_json({"delta": {"position": "sideways"}})
+            assert ws.receive_json()["type"] == "error"
+        fitment = _fitment(user_id, part_id)
+        assert fitment.version == 1
+        assert fitment.transform_override.position[0] == pytest.approx(0.5)
+        assert fitment.transform_override.scale[1] == pytest.approx(1.01 ** 50)
+
+        with client.websocket_connect(url) as ws:
+            ready = ws.receive_json()
+            assert ready["fitment_id"] == fitment.id and ready["version"] == 1
+            ws.send_json({"transform": {"position": [1, 2, 3]}})
+            ws.send_json({"type": "flush"})
+            assert ws.receive_json()["version"] == 2
+            ws.send_json({"type": "flush"})  # nothing new: no write
+            ws.send_json({"delta": {"rotation_euler": [0, 0.5, 0]}})
+        fitment = _fitment(user_id, part_id)
+        assert fitment.version == 3
+        assert fitment.transform_override.position == [1, 2, 3]
+        assert fitment.transform_override.rotation_euler == [0, 0.5, 0]
+
+
+def test_flushes_on_interval(monkeypatch):
+    monkeypatch.setattr(get_settings(), "manual_adjustment_flush_seconds", 0.05)
+    with TestClient(app) as client:
+        token, user_id, car_id, part_id = _setup(client)
+        url = f"/fitments/manual-adjustment/ws?car_model_id={car_id}&part_id={part_id}&token={token}"
+        with client.websocket_connect(url) as ws:
+            ws.receive_json()
+            ws.send_json({"delta": {"position": [0, 1, 0]}})
+            saved = ws.receive_json()
+            assert saved["type"] == "saved" and saved["version"] == 1
+            assert _fitment(user_id, part_id).transform_override.position == [0, 1, 0]
+
+
+def _fail_commits(monkeypatch, count):
+    real_commit = AsyncSession.commit
+    failures = {"left": count}
+
+    async def commit(self):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise OperationalError("COMMIT", {}, Exception("database is locked"))
+        await real_commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", commit)
+
+
+def test_failed_flush_stays_dirty_and_retries(monkeypatch):
+    monkeypatch.setattr(get_settings(), "manual_adjustment_flush_seconds", 60)
+    with TestClient(app) as client:
+        token, user_id, car_id, part_id = _setup(client)
+        url = f"/fitments/manual-adjustment/ws?car_model_id={car_id}&part_id={part_id}&token={token}"
+        with client.websocket_connect(url) as ws:
+            ws.receive_json()
+            ws.send_json({"transform": {"position": [1, 0, 0]}})
+            ws.send_json({"type": "flush"})
+            assert ws.receive_json()["version"] == 1
+
+            _fail_commits(monkeypatch, 1)
+            ws.send_json({"transform": {"position": [2, 0, 0]}})
+            ws.send_json({"type": "flush"})
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"type": "flush"})
+            saved = ws.receive_json()
+            assert saved["version"] == 2 and saved["transform"]["position"] == [2, 0, 0]
+        assert _fitment(user_id, part_id).version == 2
+
+
+def test_interval_flusher_survives_failures(monkeypatch):
+    monkeypatch.setattr(get_settings(), "manual_adjustment_flush_seconds", 0.05)
+    with TestClient(app) as client:
+        token, user_id, car_id, part_id = _setup(client)
+        url = f"/fitments/manual-adjustment/ws?car_model_id={car_id}&part_id={part_id}&token={token}"
+        _fail_commits(monkeypatch, 2)
+        with client.websocket_connect(url) as ws:
+            ws.receive_json()
+            ws.send_json({"delta": {"position": [0, 1, 0]}})
+            saved = ws.receive_json()
+            assert saved["type"] == "saved" and saved["version"] == 1
+        assert _fitment(user_id, part_id).transform_override.position == [0, 1, 0]
@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+from app.db import engine
+from app.main import app
+from app.models import Fitment, Part
+from app.pagination import decode_cursor, encode_cursor
+from app.services.catalog_cache import catalog_cache
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            session.exec(delete(Part))
+            session.exec(delete(Fitment))
+            session.commit()
+        catalog_cache.invalidate()
+        yield client
+
+
+def _pages(client, url):
+    items = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        items.extend(response.json())
+        link = response.headers.get("link")
+        url = link[1:link.index(">")] if link else None
+    return items
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(0.5, "abc"), float, str) == [0.5, "abc"]
+    with pytest.raises(Exception):
+        decode_cursor("not-a-cursor", int)
+    with pytest.raises(Exception):
+        decode_cursor(encode_cursor("1"), int)
+
+
+def test_parts_keyset_pages_and_filters(client):
+    for i in range(7):
+        client.post("/parts/", json={
+            "name": f"Part {i}", "type": "wheels" if i % 2 else "exterior",
+            "category": "rim" if i % 2 else "wing", "price": 100.0 * i,
+        })
+
+    first = client.get("/parts/?limit=3")
+    assert len(first.json()) == 3
+    assert 'rel="next"' in first.headers["link"]
+    assert first.headers["x-next-cursor"]
+
+    names = [p["name"] for p in _pages(client, "/parts/?limit=3")]
+    assert names == [f"Part {i}" for i in range(7)]
+
+    wheels = _pages(client, "/parts/?type=wheels&limit=2")
+    assert [p["name"] for p in wheels] == ["Part 1", "Part 3", "Part 5"]
+    ranged = _pages(client, "/parts/?min_price=150&max_price=450&category=rim")
+    assert [p["price"] for p in ranged] == [300.0]
+
+    last = client.get("/parts/?limit=50")
+    assert "link" not in last.headers
+    assert client.get("/parts/?after=garbage").status_code == 400
+
+
+def test_parts_for_unlinked_car_are_empty(client):
+    client.post("/parts/", json={"name": "Loose part", "type": "wheels", "price": 1.0})
+    assert client.get("/parts/?car_model_id=987654").json() == []
+
+
+def test_global_fitments_page_in_quality_order(client):
+    with Session(engine) as session:
+        for i, score in enumerate([0.9, 0.5, 0.5, 0.5, 0.1]):
+            session.add(Fitment(car_model_id=1, part_id=i, anchor_id=1, quality_score=score, scope="global"))
+        session.commit()
+
+    fitments = _pages(client, "/fitments/?limit=2")
+    assert [f["quality_score"] for f in fitments] == [0.9, 0.5, 0.5, 0.5, 0.1]
+    assert len({f["id"] for f in fitments}) == 5
+
+
+def test_card_view_and_fields_projection(client):
+    for i in range(3):
+        client.post("/parts/", json={
+            "name": f"Card {i}", "type": "wheels", "price": 10.0 + i,
+            "attribution_html": "x" * 500, "thumbnail_url": f"/t/{i}.png",
+        })
+
+    cards = client.get("/parts/?view=card&limit=2")
+    assert cards.status_code == 200
+    assert set(cards.json()[0]) == {"id", "name", "type", "category", "price", "thumbnail_url"}
+    assert 'rel="next"' in cards.headers["link"]
+    assert [p["name"] for p in _pages(client, "/parts/?view=card&limit=2")] == ["Card 0", "Card 1", "Card 2"]
+
+    picked = client.get("/parts/?fields=price,bounding_box").json()
+    assert picked[0] == {"id": picked[0]["id"], "price": 10.0, "bounding_box": None}
+
+    assert client.get("/parts/?fields=password").status_code == 400
+    assert client.get("/parts/?view=nope").status_code == 400
+
+    car = client.post("/car_models/", json={"name": "Card Car", "manufacturer": "Make", "year": 2024}).json()
+    listed = client.get("/car_models/?view=card").json()
+    assert {"id": car["id"], "name": "Card Car", "manufacturer": "Make", "year": 2024, "thumbnail_url": ""} in listed
+    client.delete(f"/car_models/{car['id']}")
@@ -0,0 +1,68 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.catalog_cache import PARTS, catalog_cache
+from app.services.part_search import match_expression, search_cache, search_terms
+
+
+def test_match_expression_quotes_terms_and_prefixes_the_last():
+    assert match_expression(search_terms('alloy "wh')) == '"alloy" "wh"*'
+    assert search_terms('"" ') == []
+
+
+def test_search_ranks_facets_and_tracks_writes(query_count):
+    tag = f"zq{uuid.uuid4().hex[:8]}"
+    with TestClient(app) as client:
+        created = [client.post("/parts/", json=part).json() for part in [
+            {"name": f"{tag} alloy wheel", "type": "wheels", "category": "wheel", "price": 80.0},
+            {"name": "Forged rim", "type": "wheels", "category": "wheel", "price": 320.0, "uploader": tag},
+            {"name": f"{tag} carbon wing", "type": "exterior", "category": "wing", "price": 640.0},
+        ]]
+
+        response = client.get("/parts/search", params={"q": tag})
+        assert response.status_code == 200
+        assert query_count(response) <= 3  # catalog version + page + facets
+        body = response.json()
+        assert body["total"] == 3
+        # name matches outrank the uploader-only match
+        assert body["results"][-1]["id"] == created[1]["id"]
+        assert body["facets"]["type"] == {"wheels": 2, "exterior": 1}
+        assert body["facets"]["category"] == {"wheel": 2, "wing": 1}
+        assert body["facets"]["price"] == {"0-100": 1, "100-250": 0, "250-500": 1, "500-1000": 1, "1000+": 0}
+
+        prefix = client.get("/parts/search", params={"q": f"{tag} car", "view": "card"}).json()
+        assert [part["id"] for part in prefix["results"]] == [created[2]["id"]]
+        assert set(prefix["results"][0]) == {"id", "name", "type", "category", "price", "thumbnail_url"}
+
+        filtered = client.get("/parts/search", params={"q": tag, "type": "wheels", "max_price": 100}).json()
+        assert [part["id"] for part in filtered["results"]] == [created[0]["id"]]
+        assert filtered["facets"]["type"] == {"wheels": 1}
+
+        client.delete(f"/parts/{created[2]['id']}")
+        assert client.get("/parts/search", params={"q": f"{tag} wing"}).json()["total"] == 0
+
+
+def test_like_fallback_without_fts(monkeypatch):
+    import app.services.part_search as part_search
+
+    tag = f"zq{uuid.uuid4().hex[:8]}"
+    with TestClient(app) as client:
+        part = client.post("/parts/", json={"name": f"{tag} 50% intake", "type": "performance", "price": 120.0}).json()
+        monkeypatch.setattr(part_search, "fts_enabled", lambda: False)
+        body = client.get("/parts/search", params={"q": f"{tag.upper()} 50%"}).json()
+        assert [result["id"] for result in body["results"]] == [part["id"]]
+        assert body["facets"]["price"]["100-250"] == 1
+
+
+def test_searches_use_their_own_cache(query_count):
+    tag = f"zq{uuid.uuid4().hex[:8]}"
+    with TestClient(app) as client:
+        client.post("/parts/", json={"name": f"{tag} strut", "type": "suspension", "price": 90.0})
+        client.get("/parts/search", params={"q": tag})
+        repeat = client.get("/parts/search", params={"q": f"  {tag} "})
+        assert query_count(repeat) == 1  # catalog version only
+        assert repeat.json()["total"] == 1
+        assert not any(key[0] == PARTS and key[1] == "search" for key in catalog_cache._entries)
+        assert search_cache.stats()["size"] <= search_cache.maxsize
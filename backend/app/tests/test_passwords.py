@@ -0,0 +1,49 @@
+import threading
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+import app.auth as auth
+from app.config import get_settings
+from app.db import engine
+from app.main import app
+from app.models import User
+
+
+def _stored_hash(email: str) -> str:
+    with Session(engine) as session:
+        return session.exec(select(User.password).where(User.email == email)).one()
+
+
+def test_hashing_runs_on_the_bcrypt_pool(monkeypatch):
+    threads = []
+    original = auth.get_password_hash
+
+    def recording_hash(password):
+        threads.append(threading.current_thread().name)
+        return original(password)
+
+    monkeypatch.setattr(auth, "get_password_hash", recording_hash)
+    with TestClient(app) as client:
+        response = client.post("/users/register", json={
+            "email": f"pool-{uuid.uuid4().hex}@example.com", "password": "pw", "first_name": "P", "last_name": "L",
+        })
+    assert response.status_code == 201
+    assert len(threads) == 1 and threads[0].startswith("bcrypt")
+
+
+def test_login_rehashes_when_the_cost_changes(monkeypatch):
+    email = f"rehash-{uuid.uuid4().hex}@example.com"
+    with TestClient(app) as client:
+        client.post("/users/register", json={"email": email, "password": "pw", "first_name": "R", "last_name": "H"})
+        assert _stored_hash(email).startswith("$2b$04$")
+
+        monkeypatch.setattr(get_settings(), "bcrypt_rounds", 5)
+        assert client.post("/token", data={"username": email, "password": "pw"}).status_code == 200
+        upgraded = _stored_hash(email)
+        assert upgraded.startswith("$2b$05$")
+
+        assert client.post("/token", data={"username": email, "password": "pw"}).status_code == 200
+        assert _stored_hash(email) == upgraded  # already at cost, no rewrite
+        assert client.post("/token", data={"username": email, "password": "nope"}).status_code == 401
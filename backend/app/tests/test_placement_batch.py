@@ -0,0 +1,110 @@
+import math
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.db import engine
+from app.main import app
+from app.models import Anchor, CarModel, IntrinsicSize, Part
+from app.services.auto_placement_service import AutoPlacementService
+from app.services.catalog_cache import catalog_cache
+
+PART_KINDS = [
+    # (type, category, pivot_hint, intrinsic_size)
+    ("wheels", "wheel", "hub-center", None),
+    ("wheels", "rim", "hub-center", IntrinsicSize(radius=0.31, width=0.25)),
+    ("tire", "wheel", "bottom-center", IntrinsicSize(radius=0.0, height=0.6)),
+    ("Front Headlight", "lighting", "bottom-center", None),
+    ("spoiler", "aero", "center", IntrinsicSize(length=1.2, height=0.25)),
+    ("exhaust", "exhaust", "bottom-center", IntrinsicSize(length=0.7, height=0.0)),
+    ("interior", "seat", "center", None),
+    ("interior", "seat", "hub-center", IntrinsicSize(radius=0.1)),
+]
+
+
+@pytest.fixture
+def car():
+    rng = random.Random(24)
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            car = CarModel(name="Batch Car", manufacturer="Make", year=2024, unit_scale=0.0254)
+            session.add(car)
+            session.commit()
+            anchors = [
+                Anchor(
+                    car_model_id=car.id, name=f"anchor_{i}", type="wheel" if i % 2 else "body",
+                    pos_x=rng.uniform(-2, 2), pos_y=rng.uniform(0, 1.5), pos_z=rng.uniform(-2, 2),
+                    rot_x=rng.uniform(-math.pi, math.pi), rot_y=rng.uniform(-math.pi, math.pi), rot_z=rng.uniform(-math.pi, math.pi),
+                    scale_x=rng.uniform(0.5, 2), scale_y=rng.uniform(0.5, 2), scale_z=rng.uniform(0.5, 2),
+                    expected_diameter=rng.choice([None, 0.0, rng.uniform(0.5, 0.8)]),
+                )
+                for i in range(7)
+            ]
+            parts = [
+                Part(name=f"{kind[0]} {i}", type=kind[0], category=kind[1], pivot_hint=kind[2], intrinsic_size=kind[3], price=1)
+                for i, kind in enumerate(PART_KINDS * 2)
+            ]
+            session.add_all(anchors + parts)
+            session.commit()
+            yield client, car.id, [part.id for part in parts], [anchor.id for anchor in anchors]
+        catalog_cache.invalidate()
+
+
+def test_batch_matches_scalar_path_exactly(car):
+    _, car_id, part_ids, anchor_ids = car
+    with Session(engine) as session:
+        service = AutoPlacementService(session)
+        batch = service.compute_auto_placement_batch(car_id, part_ids, anchor_ids)
+        assert batch["part_ids"] == part_ids and batch["anchor_ids"] == anchor_ids
+        assert batch["matrix"].shape == (len(part_ids), len(anchor_ids), 4, 4)
+        for i, part_id in enumerate(part_ids):
+            for j, anchor_id in enumerate(anchor_ids):
+                expected = service.compute_auto_placement_transform(car_id, part_id, anchor_id)
+                for key in ("position", "rotation_euler", "scale"):
+                    assert batch[key][i, j].tolist() == expected[key], (part_id, anchor_id, key)
+
+
+def test_matrices_are_translate_rotate_scale(car):
+    _, car_id, part_ids, anchor_ids = car
+    with Session(engine) as session:
+        batch = AutoPlacementService(session).compute_auto_placement_batch(car_id, part_ids[:3], anchor_ids[:3])
+    for i in range(3):
+        for j in range(3):
+            x, y, z = batch["rotation_euler"][i, j]
+            rx = np.array([[1, 0, 0], [0, math.cos(x), -math.sin(x)], [0, math.sin(x), math.cos(x)]])
+            ry = np.array([[math.cos(y), 0, math.sin(y)], [0, 1, 0], [-math.sin(y), 0, math.cos(y)]])
+            rz = np.array([[math.cos(z), -math.sin(z), 0], [math.sin(z), math.cos(z), 0], [0, 0, 1]])
+            expected = np.eye(4)
+            expected[:3, :3] = rx @ ry @ rz @ np.diag(batch["scale"][i, j])
+            expected[:3, 3] = batch["position"][i, j]
+            assert np.allclose(batch["matrix"][i, j], expected)
+
+
+def test_unknown_ids_are_reported(car):
+    _, car_id, part_ids, anchor_ids = car
+    with Session(engine) as session:
+        service = AutoPlacementService(session)
+        batch = service.compute_auto_placement_batch(car_id, [part_ids[0], 987654], [anchor_ids[0], 987655])
+        assert batch["missing_part_ids"] == [987654]
+        assert batch["missing_anchor_ids"] == [987655]
+        assert batch["position"].shape == (1, 1, 3)
+        assert service.compute_auto_placement_batch(987656, part_ids, anchor_ids) is None
+
+
+def test_placements_endpoint(car):
+    client, car_id, part_ids, anchor_ids = car
+    response = client.post(f"/car_models/{car_id}/placements", json={"part_ids": part_ids[:2], "anchor_ids": anchor_ids})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["matrix"]) == 2 and len(body["matrix"][0]) == len(anchor_ids)
+    assert len(body["matrix"][0][0]) == 4
+    with Session(engine) as session:
+        expected = AutoPlacementService(session).compute_auto_placement_transform(car_id, part_ids[1], anchor_ids[3])
+    assert body["scale"][1][3] == expected["scale"]
+
+    assert client.post("/car_models/987656/placements", json={"part_ids": part_ids, "anchor_ids": anchor_ids}).status_code == 404
+    too_many = {"part_ids": list(range(1, 1001)), "anchor_ids": list(range(1, 1001))}
+    assert client.post(f"/car_models/{car_id}/placements", json=too_many).status_code == 400
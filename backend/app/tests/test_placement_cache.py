@@ -0,0 +1,191 @@
+import fnmatch
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import decode_access_token
+from app.config import get_settings
+from app.db import engine
+from app.main import app
+from app.models import Anchor, CarModel, IntrinsicSize, Part
+from app.services.auto_placement_service import AutoPlacementService
+from app.services.catalog_cache import catalog_cache
+from app.services.placement_cache import (
+    MemoryPlacementBackend,
+    PlacementCache,
+    RedisPlacementBackend,
+    placement_cache,
+)
+
+
+class FakeRedis:
+    """The commands RedisPlacementBackend uses, with redis-py's bytes replies"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key.decode() if isinstance(key, bytes) else key, None)
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(member.encode() for member in members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def scan_iter(self, match):
+        return [key.encode() for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+@pytest.fixture
+def rows():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            car = CarModel(name="Memo Car", manufacturer="Make", year=2024, unit_scale=2.0)
+            session.add(car)
+            session.commit()
+            anchor = Anchor(car_model_id=car.id, name="wheel_FL_anchor", type="wheel", pos_x=-0.8, expected_diameter=0.7)
+            part = Part(name="Memo Wheel", type="wheels", category="wheel", price=1, pivot_hint="hub-center",
+                        intrinsic_size=IntrinsicSize(radius=0.3))
+            session.add(anchor)
+            session.add(part)
+            session.commit()
+            yield client, car.id, part.id, anchor.id
+        catalog_cache.invalidate()
+        placement_cache.invalidate()
+
+
+def _resolve(car_id, part_id, anchor_id):
+    with Session(engine) as session:
+        return AutoPlacementService(session).get_best_fitment_transform(car_id, part_id, anchor_id)
+
+
+def _resolve_uncached(car_id, part_id, anchor_id):
+    with Session(engine) as session:
+        return AutoPlacementService(session).get_global_or_auto_transform(car_id, part_id, anchor_id)
+
+
+def _login(client) -> str:
+    email = f"memo-{uuid.uuid4().hex}@example.com"
+    client.post("/users/register", json={"email": email, "password": "pw", "first_name": "M", "last_name": "C"})
+    return client.post("/token", data={"username": email, "password": "pw"}).json()["access_token"]
+
+
+def test_repeat_resolutions_are_memoized(rows):
+    _, car_id, part_id, anchor_id = rows
+    before = placement_cache.stats()
+    first = _resolve(car_id, part_id, anchor_id)
+    first["scale"][0] = 99.0  # callers get their own copy
+    second = _resolve(car_id, part_id, anchor_id)
+    after = placement_cache.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert second == _resolve_uncached(car_id, part_id, anchor_id)
+    assert 0.0 < after["hit_rate"] <= 1.0
+
+
+def test_row_updates_bump_the_version_key(rows):
+    _, car_id, part_id, anchor_id = rows
+    old = _resolve(car_id, part_id, anchor_id)
+    with Session(engine) as session:
+        part = session.get(Part, part_id)
+        part.intrinsic_size = IntrinsicSize(radius=0.35)
+        session.add(part)
+        session.commit()
+        assert part.version == 2
+        # touched without a net change: no bump
+        session.add(part)
+        session.commit()
+        assert session.get(Part, part_id).version == 2
+
+    # no writer hook ran and the catalog cache still holds the old part, as
+    # in a worker that did not see the write: the new row version alone
+    # misses the old entry
+    new = _resolve(car_id, part_id, anchor_id)
+    assert new != old
+    assert new == _resolve_uncached(car_id, part_id, anchor_id)
+
+
+def test_global_fitment_writes_invalidate(rows):
+    client, car_id, part_id, anchor_id = rows
+    _resolve(car_id, part_id, anchor_id)
+    headers = {"Authorization": f"Bearer {_login(client)}"}
+    fitment = {"car_model_id": car_id, "part_id": part_id, "anchor_id": anchor_id, "scope": "global",
+               "transform_override": {"position": [0, 3, 0], "rotation_euler": [0, 0, 0], "scale": [1, 1, 1]}}
+    response = client.post("/fitments/", json=fitment, headers=headers)
+    assert response.status_code == 201
+    assert _resolve(car_id, part_id, anchor_id)["position"] == [0, 3, 0]
+
+    assert client.delete(f"/fitments/{response.json()['id']}", headers=headers).status_code == 204
+    assert _resolve(car_id, part_id, anchor_id) == _resolve_uncached(car_id, part_id, anchor_id)
+    assert _resolve(car_id, part_id, anchor_id)["position"] != [0, 3, 0]
+
+
+def test_stats_endpoint(rows, monkeypatch):
+    client, car_id, part_id, anchor_id = rows
+    _resolve(car_id, part_id, anchor_id)
+    _resolve(car_id, part_id, anchor_id)
+    token = _login(client)
+    monkeypatch.setattr(get_settings(), "admin_emails", [decode_access_token(token)["email"]])
+    stats = client.get("/admin/cache/placements/stats", headers={"Authorization": f"Bearer {token}"}).json()
+    assert stats["backend"] == "MemoryPlacementBackend"
+    assert stats["hits"] >= 1 and stats["size"] >= 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_backends_drop_by_dependency(backend):
+    store = MemoryPlacementBackend(maxsize=10) if backend == "memory" else RedisPlacementBackend(FakeRedis())
+    cache = PlacementCache(store)
+    car = CarModel(id=1, name="C", manufacturer="M", year=2024)
+    parts = [Part(id=i, name=f"P{i}", type="t", price=1) for i in (1, 2)]
+    anchor = Anchor(id=7, car_model_id=1, name="a", type="t")
+
+    def transform(value):
+        return lambda: {"position": [value, 0, 0], "rotation_euler": [0, 0, 0], "scale": [1, 1, 1]}
+
+    for part in parts:
+        cache.get_or_compute(car, part, anchor, transform(part.id))
+    assert cache.get_or_compute(car, parts[0], anchor, transform(-1))["position"] == [1, 0, 0]
+
+    cache.invalidate_part(1)
+    assert cache.get_or_compute(car, parts[0], anchor, transform(10))["position"] == [10, 0, 0]
+    assert cache.get_or_compute(car, parts[1], anchor, transform(-1))["position"] == [2, 0, 0]
+
+    cache.invalidate_fitment(1, 2, 7)
+    assert cache.get_or_compute(car, parts[1], anchor, transform(20))["position"] == [20, 0, 0]
+
+    cache.invalidate_anchor(7)
+    assert cache.get_or_compute(car, parts[0], anchor, transform(30))["position"] == [30, 0, 0]
+
+    cache.invalidate()
+    assert cache.get_or_compute(car, parts[0], anchor, transform(40))["position"] == [40, 0, 0]
+    assert cache.stats()["hits"] == 2
+
+
+def test_memory_backend_is_a_bounded_lru():
+    store = MemoryPlacementBackend(maxsize=2, ttl=60)
+    store.set(("a",), {"v": [1]}, ["t1"])
+    store.set(("b",), {"v": [2]}, ["t1"])
+    store.get(("a",))
+    store.set(("c",), {"v": [3]}, ["t2"])
+    assert store.get(("b",)) is None and store.get(("a",)) == {"v": [1]}
+    store.drop("t1")
+    assert store.get(("a",)) is None and store.size() == 1
+
+    expiring = MemoryPlacementBackend(maxsize=2, ttl=0.01)
+    expiring.set(("a",), {"v": [1]}, [])
+    time.sleep(0.02)
+    assert expiring.get(("a",)) is None
@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.price_index import PriceIndex, price_index, quote
+
+
+def test_quote_rounds_lines_and_reports_unknown_ids():
+    index = PriceIndex()
+    index.load([(1, 10.005), (3, 0.1), (4, 0.2)])
+    priced = quote(index, [3, 4, 1, 3, 2, 99])
+    assert [part_id for part_id, _ in priced["lines"]] == [3, 4, 1]
+    assert str(priced["total"]) == "10.31"  # 0.10 + 0.20 + 10.01, no float drift
+    assert priced["unknown_part_ids"] == [2, 99]
+
+    index.remove(3)
+    index.set(7, 5.0)
+    assert index.price(3) is None
+    assert index.price(7) == 5.0
+
+
+def test_sparse_ids_do_not_allocate_up_to_the_largest_id():
+    index = PriceIndex()
+    index.load([(1, 1.0), (10**9, 2.0)])
+    assert isinstance(index._prices, dict)
+    assert index.price(10**9) == 2.0 and index.price(2) is None
+
+    index.load([(i, float(i)) for i in range(1, 101)])
+    assert len(index._prices) == 101
+    index.set(150, 3.0)  # small growth stays in the array
+    assert len(index._prices) == 151
+    index.set(10**9, 4.0)
+    assert isinstance(index._prices, dict)
+    assert index.price(10**9) == 4.0 and index.price(150) == 3.0 and index.price(42) == 42.0
+    assert index.price(120) is None
+    index.remove(42)
+    assert index.price(42) is None
+
+
+def test_estimate_cost_served_from_warm_index(query_count):
+    with TestClient(app) as client:
+        part = client.post("/parts/", json={"name": "Quote part", "type": "wheels", "price": 19.99}).json()
+        client.post("/parts/estimate_cost/", json={"part_ids": [part["id"]]})  # warm up
+
+        response = client.post("/parts/estimate_cost/", json={"part_ids": [part["id"], part["id"]]})
+        assert response.json() == {"total_cost": 19.99}
+        assert query_count(response) == 0
+
+        client.delete(f"/parts/{part['id']}")
+        assert price_index.price(part["id"]) is None
+        assert client.post("/parts/estimate_cost/", json={"part_ids": [part["id"]]}).json() == {"total_cost": 0.0}
+
+
+def test_quote_batch(query_count):
+    with TestClient(app) as client:
+        client.post("/parts/estimate_cost/", json={"part_ids": []})  # make sure the index is loaded
+        wheel = client.post("/parts/", json={"name": "Quote wheel", "type": "wheels", "price": 250.5}).json()["id"]
+        wing = client.post("/parts/", json={"name": "Quote wing", "type": "exterior", "price": 99.25}).json()["id"]
+
+        response = client.post("/parts/quote:batch", json={"configurations": [
+            {"key": "base", "part_ids": [wheel]},
+            {"key": "full", "part_ids": [wheel, wing, 10**9]},
+        ]})
+        assert response.status_code == 200
+        assert query_count(response) == 0  # index was updated in place by the create
+        base, full = response.json()
+        assert base["key"] == "base" and base["total"] == 250.5 and base["currency"] == "USD"
+        assert full["total"] == 349.75
+        assert full["lines"] == [{"part_id": wheel, "price": 250.5}, {"part_id": wing, "price": 99.25}]
+        assert full["unknown_part_ids"] == [10**9]
+
+        totals_only = client.post("/parts/quote:batch", json={
+            "configurations": [{"part_ids": [wing]}], "breakdown": False,
+        }).json()
+        assert totals_only == [{"key": None, "total": 99.25, "currency": "USD", "lines": None, "unknown_part_ids": []}]
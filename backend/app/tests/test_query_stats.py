@@ -0,0 +1,28 @@
+import pytest
+
+from app.config import get_settings
+from app.query_stats import QueryBudgetExceeded
+
+
+def test_server_timing_counts_queries(client, query_count):
+    car = client.post("/car_models/", json={"name": "Timed Car", "manufacturer": "Make", "year": 2024})
+    assert query_count(car) >= 1
+    assert query_count(client.get("/")) == 0
+    client.delete(f"/car_models/{car.json()['id']}")
+
+
+def test_enforced_budget_fails_route(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "query_budgets", {"GET /fitments/": 0, "GET /": 0})
+    monkeypatch.setattr(get_settings(), "query_budget_default", 0)
+    monkeypatch.setattr(get_settings(), "query_budget_enforce", True)
+    assert client.get("/").status_code == 200
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/fitments/")
+
+
+def test_budget_warns_when_not_enforced(client, monkeypatch, caplog):
+    monkeypatch.setattr(get_settings(), "query_budgets", {"GET /fitments/": 0})
+    monkeypatch.setattr(get_settings(), "query_budget_default", 0)
+    with caplog.at_level("WARNING", logger="app.query_stats"):
+        assert client.get("/fitments/").status_code == 200
+    assert "GET /fitments/ ran" in caplog.text
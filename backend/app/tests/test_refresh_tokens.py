@@ -0,0 +1,210 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import decode_access_token
+from app.db import engine, init_db
+from app.main import app
+from app.models import User
+from app.services.session_store import (
+    DatabaseSessionStore,
+    InvalidRefreshToken,
+    MemorySessionStore,
+    RedisSessionStore,
+    RefreshTokenReused,
+    get_session_store,
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
+
+
+class FakeRedis:
+    """The handful of commands RedisSessionStore uses, with redis-py's bytes replies"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def _live(self, key):
+        if key in self.expiry and self.expiry[key] <= time.time():
+            self.data.pop(key, None)
+            self.expiry.pop(key, None)
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        if ex:
+            self.expiry[key] = time.time() + ex
+        return True
+
+    def get(self, key):
+        return self._live(key)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(member.encode() for member in members)
+
+    def smembers(self, key):
+        return set(self._live(key) or ())
+
+    def expire(self, key, seconds):
+        self.expiry[key] = time.time() + seconds
+
+
+def _database_store():
+    init_db()
+    return DatabaseSessionStore(engine)
+
+
+@pytest.fixture(params=["memory", "database", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemorySessionStore()
+    if request.param == "database":
+        return _database_store()
+    return RedisSessionStore(FakeRedis())
+
+
+def _user_id() -> int:
+    return uuid.uuid4().int % 1_000_000_000
+
+
+def test_rotation_issues_a_new_token_with_the_same_claims(store):
+    user_id = _user_id()
+    first = issue_refresh_token(store, user_id, {"sub": "a@example.com", "uid": user_id})
+    session, second = rotate_refresh_token(store, first)
+    assert second != first
+    assert session.user_id == user_id
+    assert session.claims == {"sub": "a@example.com", "uid": user_id}
+    session, third = rotate_refresh_token(store, second)
+    assert third not in (first, second)
+
+
+def test_rotation_keeps_the_family_expiry(store):
+    user_id = _user_id()
+    first = issue_refresh_token(store, user_id, {"uid": user_id})
+    login, second = rotate_refresh_token(store, first)
+    rotated, _ = rotate_refresh_token(store, second)
+    assert rotated.expires_at == pytest.approx(login.expires_at, abs=1)
+
+
+def test_reuse_revokes_the_family(store):
+    user_id = _user_id()
+    first = issue_refresh_token(store, user_id, {"uid": user_id})
+    _, second = rotate_refresh_token(store, first)
+    with pytest.raises(RefreshTokenReused):
+        rotate_refresh_token(store, first)
+    # the legitimate holder is signed out too: the thief may have rotated first
+    with pytest.raises(InvalidRefreshToken):
+        rotate_refresh_token(store, second)
+
+
+def test_revocation_by_family_and_by_user(store):
+    user_id = _user_id()
+    laptop = issue_refresh_token(store, user_id, {"uid": user_id})
+    phone = issue_refresh_token(store, user_id, {"uid": user_id})
+    other = issue_refresh_token(store, user_id + 1, {"uid": user_id + 1})
+
+    revoke_refresh_token(store, laptop)
+    with pytest.raises(InvalidRefreshToken):
+        rotate_refresh_token(store, laptop)
+    _, phone = rotate_refresh_token(store, phone)
+
+    store.revoke_user(user_id)
+    with pytest.raises(InvalidRefreshToken):
+        rotate_refresh_token(store, phone)
+    rotate_refresh_token(store, other)
+
+
+def test_unknown_and_expired_tokens_are_rejected(store, monkeypatch):
+    with pytest.raises(InvalidRefreshToken):
+        rotate_refresh_token(store, "not-a-token")
+    from app.config import get_settings
+    monkeypatch.setattr(get_settings(), "refresh_token_expire_days", -1)
+    stale = issue_refresh_token(store, _user_id(), {})
+    with pytest.raises(InvalidRefreshToken):
+        rotate_refresh_token(store, stale)
+
+
+def test_refresh_endpoint_skips_the_password_path():
+    with TestClient(app) as client:
+        email = f"refresh-{uuid.uuid4().hex}@example.com"
+        client.post("/users/register", json={"email": email, "password": "pw", "first_name": "R", "last_name": "T"})
+        login = client.post("/token", data={"username": email, "password": "pw"}).json()
+        assert login["refresh_token"]
+
+        response = client.post("/token/refresh", json={"refresh_token": login["refresh_token"]})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["refresh_token"] != login["refresh_token"]
+        profile = client.get("/users/user_profile", headers={"Authorization": f"Bearer {body['access_token']}"})
+        assert profile.json()["email"] == email
+
+        replay = client.post("/token/refresh", json={"refresh_token": login["refresh_token"]})
+        assert replay.status_code == 401
+        assert client.post("/token/refresh", json={"refresh_token": body["refresh_token"]}).status_code == 401
+
+
+def test_refresh_reissues_claims_from_the_user_row():
+    with TestClient(app) as client:
+        email = f"rename-{uuid.uuid4().hex}@example.com"
+        client.post("/users/register", json={"email": email, "password": "pw", "first_name": "Old", "last_name": "N"})
+        login = client.post("/token", data={"username": email, "password": "pw"}).json()
+        with Session(engine) as session:
+            user = session.get(User, login["user"]["id"])
+            user.first_name = "New"
+            session.add(user)
+            session.commit()
+
+        body = client.post("/token/refresh", json={"refresh_token": login["refresh_token"]}).json()
+        assert decode_access_token(body["access_token"])["first_name"] == "New"
+
+        with Session(engine) as session:
+            session.delete(session.get(User, login["user"]["id"]))
+            session.commit()
+        assert client.post("/token/refresh", json={"refresh_token": body["refresh_token"]}).status_code == 401
+
+
+def test_logout_everywhere_revokes_every_refresh_token():
+    with TestClient(app) as client:
+        email = f"everywhere-{uuid.uuid4().hex}@example.com"
+        client.post("/users/register", json={"email": email, "password": "pw", "first_name": "E", "last_name": "W"})
+        logins = [client.post("/token", data={"username": email, "password": "pw"}).json() for _ in range(2)]
+
+        headers = {"Authorization": f"Bearer {logins[0]['access_token']}"}
+        assert client.post("/logout", params={"everywhere": "true"}, headers=headers).status_code == 204
+        for login in logins:
+            assert client.post("/token/refresh", json={"refresh_token": login["refresh_token"]}).status_code == 401
+
+
+def test_revoke_endpoint_ends_one_login():
+    with TestClient(app) as client:
+        email = f"revoke-{uuid.uuid4().hex}@example.com"
+        client.post("/users/register", json={"email": email, "password": "pw", "first_name": "O", "last_name": "N"})
+        first, second = [client.post("/token", data={"username": email, "password": "pw"}).json() for _ in range(2)]
+
+        assert client.post("/token/revoke", json={"refresh_token": first["refresh_token"]}).status_code == 204
+        assert client.post("/token/refresh", json={"refresh_token": first["refresh_token"]}).status_code == 401
+        assert client.post("/token/refresh", json={"refresh_token": second["refresh_token"]}).status_code == 200
+
+
+def test_store_backend_follows_settings(monkeypatch):
+    from app.config import get_settings
+    get_session_store.cache_clear()
+    try:
+        monkeypatch.setattr(get_settings(), "session_store", "memory")
+        assert isinstance(get_session_store(), MemorySessionStore)
+        get_session_store.cache_clear()
+        monkeypatch.setattr(get_settings(), "session_store", "nonsense")
+        with pytest.raises(ValueError):
+            get_session_store()
+    finally:
+        get_session_store.cache_clear()
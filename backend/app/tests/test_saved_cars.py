@@ -0,0 +1,49 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import create_access_token
+from app.config import get_settings
+from app.db import engine
+from app.main import app
+from app.models import User
+
+
+@pytest.fixture
+def client(db_async, monkeypatch):
+    # fail the test if these routes grow per-car queries again
+    monkeypatch.setattr(get_settings(), "query_budgets", {"GET /saved_cars/": 3, "POST /saved_cars/": 3})
+    monkeypatch.setattr(get_settings(), "query_budget_enforce", True)
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            user = User(email=f"garage-{uuid.uuid4().hex}@example.com", password="x", first_name="G", last_name="U")
+            session.add(user)
+            session.commit()
+            token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+
+def test_save_and_page_through_garage(client):
+    saved = [
+        client.post("/saved_cars/", json={"car_model_id": 1, "name": f"Build {i}", "part_ids": [3, i + 10, 3]})
+        for i in range(5)
+    ]
+    assert all(response.status_code == 201 for response in saved)
+    assert saved[0].json()["part_ids"] == [3, 10]
+    assert client.post("/saved_cars/", json={"car_model_id": 1, "part_ids": []}).json()["part_ids"] == []
+
+    cars, url = [], "/saved_cars/?limit=2"
+    while url:
+        response = client.get(url)
+        cars.extend(response.json())
+        link = response.headers.get("link")
+        url = link[1:link.index(">")] if link else None
+    assert [car["name"] for car in cars] == [f"Build {i}" for i in range(5)] + [""]
+    assert [sorted(car["part_ids"]) for car in cars[:5]] == [[3, i + 10] for i in range(5)]
+
+    single = client.get(f"/saved_cars/{cars[1]['id']}").json()
+    assert sorted(single["part_ids"]) == [3, 11]
@@ -0,0 +1,95 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.auth import create_access_token, decode_access_token, get_password_hash
+from app.db import engine
+from app.main import app
+from app.models import Anchor, CarModel, Fitment, Part, Transform, User
+from app.services.auto_placement_service import AutoPlacementService
+from app.services.catalog_cache import catalog_cache
+
+
+@pytest.fixture
+def scene():
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            car = CarModel(name="Scene Car", manufacturer="Make", year=2024, unit_scale=2.0)
+            user = User(email=f"scene-{uuid.uuid4().hex}@example.com", password=get_password_hash("pw"), first_name="S", last_name="C")
+            session.add(car)
+            session.add(user)
+            session.commit()
+            wheel_anchor = Anchor(car_model_id=car.id, name="wheel_FL_anchor", type="wheel", pos_x=-0.8, expected_diameter=0.7)
+            spoiler_anchor = Anchor(car_model_id=car.id, name="spoiler_anchor", type="spoiler", pos_y=1.2)
+            session.add(wheel_anchor)
+            session.add(spoiler_anchor)
+            parts = [
+                Part(name="Wheel", type="wheels", category="wheel", price=1, attach_to="wheel_FL_anchor", pivot_hint="hub-center"),
+                Part(name="Spoiler", type="spoiler", category="spoiler", price=1),
+                Part(name="Seat", type="interior", category="seat", price=1),
+            ] + [Part(name=f"Exhaust {i}", type="exhaust", category="exhaust", price=1) for i in range(4)]
+            session.add_all(parts)
+            session.commit()
+            session.add(Fitment(car_model_id=car.id, part_id=parts[1].id, anchor_id=spoiler_anchor.id, scope="global",
+                                quality_score=0.9, transform_override=Transform(position=[0, 1, 0], rotation_euler=[0, 0, 0], scale=[1, 1, 1])))
+            session.add(Fitment(car_model_id=car.id, part_id=parts[1].id, anchor_id=spoiler_anchor.id, scope="user",
+                                created_by_user_id=user.id,
+                                transform_override=Transform(position=[0, 2, 0], rotation_euler=[0, 0, 0], scale=[1, 1, 1])))
+            session.commit()
+            token = create_access_token({"sub": user.email}, timedelta(minutes=5))
+            yield client, car.id, [part.id for part in parts], token
+        catalog_cache.invalidate()
+
+
+def test_scene_matches_per_part_resolution(scene):
+    client, car_id, part_ids, _ = scene
+    response = client.post(f"/car_models/{car_id}/scene", json={"part_ids": part_ids[:3] + [987654]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["car_model"]["id"] == car_id
+    assert body["missing_part_ids"] == [987654]
+
+    wheel, spoiler, seat = body["parts"]
+    assert wheel["anchor"]["name"] == "wheel_FL_anchor" and wheel["source"] == "auto"
+    assert spoiler["source"] == "global" and spoiler["transform"]["position"] == [0, 1, 0]
+    assert seat["anchor"] is None and seat["source"] == "default"
+
+    # same answers as the one-part-at-a-time service calls
+    with Session(engine) as session:
+        service = AutoPlacementService(session)
+        for resolved in (wheel, spoiler):
+            expected = service.get_best_fitment_transform(car_id, resolved["part_id"], resolved["anchor"]["id"])
+            assert Transform.model_validate(resolved["transform"]) == Transform.model_validate(expected)
+
+
+def test_scene_prefers_user_fitment_when_signed_in(scene):
+    client, car_id, part_ids, token = scene
+    response = client.post(f"/car_models/{car_id}/scene", json={"part_ids": [part_ids[1]]},
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.json()["parts"][0]["source"] == "user"
+    assert response.json()["parts"][0]["transform"]["position"] == [0, 2, 0]
+
+
+@pytest.mark.parametrize("token", ["not-a-jwt", "expired"])
+def test_scene_treats_bad_tokens_as_anonymous(scene, token):
+    client, car_id, part_ids, valid = scene
+    if token == "expired":
+        token = create_access_token(decode_access_token(valid), timedelta(minutes=-1))
+    response = client.post(f"/car_models/{car_id}/scene", json={"part_ids": [part_ids[1]]},
+                           headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["parts"][0]["source"] == "global"
+
+
+def test_scene_query_count_is_independent_of_part_count(scene, query_count):
+    client, car_id, part_ids, _ = scene
+
+    def queries(ids):
+        return query_count(client.post(f"/car_models/{car_id}/scene", json={"part_ids": ids}))
+
+    queries(part_ids)  # warm the catalog cache
+    assert queries(part_ids[:2]) == queries(part_ids) == 3  # catalog version + parts + fitments
+    assert client.post("/car_models/987654/scene", json={"part_ids": []}).status_code == 404
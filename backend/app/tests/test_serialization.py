@@ -0,0 +1,72 @@
+import json
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+from app.db import engine
+from app.main import app
+from app.models import Bounds, Part
+from app.serialization import RowJSONCache
+
+
+def test_fragments_match_response_model_output_and_track_row_version():
+    part = Part(id=7, name="Rim", type="wheels", price=10, bounding_box=Bounds(min=[0, 0, 0], max=[1, 1, 1]))
+    cache = RowJSONCache()
+
+    body = cache.encode_list([part])
+    assert json.loads(body) == TypeAdapter(list[Part]).dump_python([part], mode="json")
+    assert cache.encode_list([part]) == body
+    assert cache.stats()["hits"] == 1
+
+    part.name = "Renamed"
+    assert json.loads(cache.encode_list([part]))[0]["name"] == "Rim"  # same row version: cached bytes
+    part.version += 1
+    assert json.loads(cache.encode_list([part]))[0]["name"] == "Renamed"
+    assert cache.stats()["size"] == 1
+
+    cache.discard("part", 7)
+    part.version = 1
+    assert json.loads(cache.encode_list([part]))[0]["name"] == "Renamed"
+
+def test_catalog_lists_are_served_from_fragments():
+    with TestClient(app) as client:
+        part = client.post("/parts/", json={"name": "Fragment", "type": "wheels", "price": 3.5}).json()
+        listed = client.get("/parts/?limit=1000")
+        assert listed.headers["content-type"] == "application/json"
+        assert part in listed.json()
+
+        # an update re-encodes only the changed row, whatever the catalog ETag
+        update = {"name": "Fragment 2", "type": "wheels", "price": 3.5}
+        assert client.put(f"/parts/{part['id']}", json=update).json()["version"] == 2
+        assert {"id": part["id"], "name": "Fragment 2", "version": 2}.items() <= next(
+            p for p in client.get("/parts/?limit=1000").json() if p["id"] == part["id"]
+        ).items()
+
+        client.delete(f"/parts/{part['id']}")
+        assert all(p["id"] != part["id"] for p in client.get("/parts/?limit=1000").json())
+
+
+def test_a_reinserted_row_never_matches_another_workers_bytes():
+    workers = [RowJSONCache(), RowJSONCache()]
+    with Session(engine) as session:
+        old = Part(name="Doomed", type="wheels", price=1)
+        session.add(old)
+        session.commit()
+        session.refresh(old)
+        for cache in workers:
+            cache.fragment(old)
+        old_id = old.id
+
+        # the delete is handled by worker 0 only
+        session.delete(old)
+        session.commit()
+        workers[0].discard("part", old_id)
+        new = Part(name="Reborn", type="wheels", price=2)
+        session.add(new)
+        session.commit()
+        session.refresh(new)
+
+    assert new.id != old_id and new.version == old.version == 1
+    for cache in workers:
+        assert json.loads(cache.fragment(new))["name"] == "Reborn"
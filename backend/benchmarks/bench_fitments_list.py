@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /fitments/?car_model_id= returning 10k rows.
+
+"before" replays the old handler: transform_override read as a TEXT column
+and json.loads'd into a FitmentResponse per row. "after" is the current
+endpoint, where the JSON column is decoded once when the row is loaded.
+
+Usage: python benchmarks/bench_fitments_list.py [--rows 10000] [--requests 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-fitments-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import registry
+from sqlmodel import Field, SQLModel, Session, select
+
+from app.db import engine
+from app.main import app
+from app.models import Fitment
+from app.routers.fitments import FitmentResponse
+
+
+class LegacyBase(SQLModel, registry=registry()):
+    pass
+
+
+class LegacyFitment(LegacyBase, table=True):
+    """The fitment table as it was mapped before, with a TEXT transform"""
+    __tablename__ = "fitment"
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    car_model_id: int
+    part_id: int
+    anchor_id: int
+    part_variant_hash: str = ""
+    transform_override: str = ""
+    quality_score: float = 0.5
+    scope: str = "user"
+    created_by_user_id: Optional[int] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 1
+
+
+@app.get("/legacy/fitments", response_model=List[FitmentResponse])
+def legacy_fitments(car_model_id: int):
+    with Session(engine) as session:
+        fitments = session.exec(
+            select(LegacyFitment)
+            .where(LegacyFitment.car_model_id == car_model_id, LegacyFitment.scope == "global")
+            .order_by(LegacyFitment.quality_score.desc())
+        ).all()
+    result = []
+    for fitment in fitments:
+        fitment_dict = fitment.model_dump()
+        try:
+            fitment_dict["transform_override"] = json.loads(fitment.transform_override) if fitment.transform_override else {}
+        except:
+            fitment_dict["transform_override"] = {}
+        result.append(FitmentResponse(**fitment_dict))
+    return result
+
+
+def seed(count: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(count):
+            session.add(Fitment(
+                car_model_id=1, part_id=i, anchor_id=i % 12, scope="global", quality_score=(i % 100) / 100,
+                transform_override={"position": [i * 0.01, 0.2, 0.3], "rotation_euler": [0, 0.1, 0], "scale": [1, 1, 1]},
+            ))
+        session.commit()
+
+
+def timed(client, url: str, requests: int) -> float:
+    client.get(url)  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url)
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    with TestClient(app) as client:
+        before = timed(client, "/legacy/fitments?car_model_id=1", args.requests)
+        after = timed(client, "/fitments/?car_model_id=1", args.requests)
+        assert client.get("/fitments/?car_model_id=1").json() == client.get("/legacy/fitments?car_model_id=1").json()
+
+    print(f"/fitments/?car_model_id=1 returning {args.rows} rows, {args.requests} requests")
+    print(f"  before (TEXT + json.loads per row): {before:8.1f} ms/request")
+    print(f"  after  (JSON column):               {after:8.1f} ms/request  ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark serializing a 10k-part list:
+- before: response_model=list[Part] validation + FastAPI's stdlib JSONResponse
+- after:  pre-serialized row fragments joined into one body (app.serialization)
+
+Both routes serve the same rows from the catalog cache, so the difference is
+serialization only.
+
+Usage: python benchmarks/bench_list_serialization.py [--parts 10000] [--requests 30]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-serialization-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+
+from fastapi import Depends
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, select
+
+from app.config import get_settings
+from app.db import engine, get_async_read_session
+from app.main import app
+from app.models import Bounds, IntrinsicSize, Part
+from app.services.catalog_cache import catalog_cache, PARTS
+
+
+def seed(count: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(count):
+            session.add(Part(
+                name=f"Part {i}", type="wheels", category="wheel", price=100.0 + i,
+                attribution_html=f"<a href='https://example.com/{i}'>Uploader {i}</a> CC-BY-4.0",
+                intrinsic_size=IntrinsicSize(radius=0.34, width=0.2, height=0.68),
+                bounding_box=Bounds(min=[-0.3, -0.3, -0.1], max=[0.3, 0.3, 0.1]),
+            ))
+        session.commit()
+
+
+@app.get("/bench/legacy_parts", response_model=list[Part], response_class=JSONResponse)
+async def legacy_parts(session=Depends(get_async_read_session)):
+    # same cached rows, rendered the old way: response_model validation + json.dumps
+    async def load():
+        return (await session.exec(select(Part).order_by(Part.id))).all()
+    return await catalog_cache.aget_or_load((PARTS, "bench"), load)
+
+
+def run(client, url: str, requests: int) -> float:
+    client.get(url)  # warm up the catalog cache and fragments
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url)
+        assert response.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+
+    seed(args.parts)
+    settings = get_settings()
+    settings.page_size_max = settings.page_size_default = args.parts
+    settings.query_stats_enabled = False
+
+    with TestClient(app) as client:
+        before = run(client, "/bench/legacy_parts", args.requests)
+        after = run(client, "/parts/", args.requests)
+        size = len(client.get("/parts/").content)
+
+    print(f"/parts/ with {args.parts} parts ({size / 1024:.0f} KiB), {args.requests} requests")
+    print(f"  before (response_model + json.dumps): {before:8.2f} req/s")
+    print(f"  after  (cached row fragments):        {after:8.2f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
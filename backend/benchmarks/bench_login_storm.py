@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Latency of GET /parts/ while a storm of concurrent logins runs on the same
+worker, with bcrypt:
+- inline: verified on the event loop (what an async login does without offloading)
+- pool:   verified on the dedicated bcrypt pool (app.auth)
+
+Usage: python benchmarks/bench_login_storm.py [--logins 8] [--requests 60] [--rounds 10]
+
+The inline run is slow by design: every /parts/ request waits behind the
+bcrypt calls queued ahead of it on the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-login-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+
+import httpx
+from sqlmodel import Session
+
+import app.main
+from app.auth import get_password_hash, password_context
+from app.config import get_settings
+from app.db import engine, init_db
+from app.main import app as asgi_app
+from app.models import Part, User
+
+EMAIL = "storm@example.com"
+PASSWORD = "correct horse battery staple"
+
+
+def seed(parts: int):
+    init_db()
+    with Session(engine) as session:
+        session.add(User(email=EMAIL, password=get_password_hash(PASSWORD), first_name="S", last_name="T"))
+        for i in range(parts):
+            session.add(Part(name=f"Part {i}", type="wheels", category="wheel", price=100.0 + i))
+        session.commit()
+
+
+async def inline_verify(plain_password, hashed_password):
+    return password_context().verify_and_update(plain_password, hashed_password)
+
+
+async def measure(logins: int, requests: int) -> list:
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/parts/")  # warm up
+        done = asyncio.Event()
+
+        async def login_loop():
+            while not done.is_set():
+                response = await client.post("/token", data={"username": EMAIL, "password": PASSWORD})
+                assert response.status_code == 200
+
+        storm = [asyncio.create_task(login_loop()) for _ in range(logins)]
+        await asyncio.sleep(0.2)  # let the storm build
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get("/parts/")
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+        done.set()
+        await asyncio.gather(*storm)
+    return latencies
+
+
+def report(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"  {label:<8} p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login loops")
+    parser.add_argument("--requests", type=int, default=60, help="/parts/ requests measured")
+    parser.add_argument("--parts", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor")
+    args = parser.parse_args()
+
+    get_settings().bcrypt_rounds = args.rounds
+    get_settings().catalog_cache_size = 0  # measure the route, not the cache
+    seed(args.parts)
+
+    print(f"/parts/ during {args.logins} concurrent logins, bcrypt cost {args.rounds}, {args.requests} requests")
+    pooled = app.main.verify_and_update_password
+    app.main.verify_and_update_password = inline_verify
+    before = report("inline", asyncio.run(measure(args.logins, args.requests)))
+    app.main.verify_and_update_password = pooled
+    after = report("pool", asyncio.run(measure(args.logins, args.requests)))
+    print(f"  p99 {before / after:.1f}x lower with the bcrypt pool")
+
+
+if __name__ == "__main__":
+    main()
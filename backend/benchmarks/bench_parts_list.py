@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /parts/ throughput with:
+- the legacy engine (echo=True, default pool) on threadpool sessions
+- the settings-driven engine from app.db.create_db_engine on threadpool sessions
+- the async engine (db_async=True)
+
+Usage: python benchmarks/bench_parts_list.py [--parts 500] [--requests 300]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-parts-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlmodel import SQLModel, Session, create_engine
+
+from app.config import get_settings
+from app.db import ThreadedSession, create_db_engine, get_async_read_session
+from app.main import app
+from app.models import Part
+
+
+def seed(engine, count: int):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(count):
+            session.add(Part(name=f"Part {i}", type="wheels", category="wheel", price=100.0 + i))
+        session.commit()
+
+
+def run(requests: int, engine=None) -> float:
+    """Requests/sec for /parts/; ``engine`` forces threadpool sessions on it."""
+    if engine is not None:
+        async def override():
+            with Session(engine, expire_on_commit=False) as session:
+                yield ThreadedSession(session)
+
+        app.dependency_overrides[get_async_read_session] = override
+    try:
+        with TestClient(app) as client:
+            client.get("/parts/")  # warm up
+            start = time.perf_counter()
+            for _ in range(requests):
+                response = client.get("/parts/")
+                assert response.status_code == 200
+            elapsed = time.perf_counter() - start
+    finally:
+        app.dependency_overrides.pop(get_async_read_session, None)
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    url = os.environ["DATABASE_URL"]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # what app/db.py used to do: echo every statement to stdout
+        legacy = create_engine(url, echo=True)
+        seed(legacy, args.parts)
+        before = run(args.requests, legacy)
+    legacy.dispose()
+
+    tuned = create_db_engine(url, get_settings())
+    after = run(args.requests, tuned)
+    tuned.dispose()
+
+    get_settings().db_async = True
+    async_rate = run(args.requests)
+
+    print(f"/parts/ with {args.parts} parts, {args.requests} requests")
+    print(f"  before (echo=True):        {before:8.1f} req/s")
+    print(f"  after  (create_db_engine): {after:8.1f} req/s  ({after / before:.2f}x)")
+    print(f"  async  (db_async=True):    {async_rate:8.1f} req/s  ({async_rate / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
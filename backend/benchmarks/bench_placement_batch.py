@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+10k auto-placements (100 parts x 100 anchors on one car) with:
+- scalar:   compute_auto_placement_transform per pair (rows from the catalog cache)
+- batch:    compute_auto_placement_batch (one parts query, NumPy for the rest,
+            4x4 matrices included)
+
+Checks that both give identical TRS before reporting.
+
+Usage: python benchmarks/bench_placement_batch.py [--parts 100] [--anchors 100] [--repeat 5]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+BENCH_DIR = tempfile.mkdtemp(prefix="bench-placement-")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DIR}/bench.db"
+
+from sqlmodel import Session
+
+from app.db import engine, init_db
+from app.models import Anchor, CarModel, IntrinsicSize, Part
+from app.services.auto_placement_service import AutoPlacementService
+
+KINDS = [
+    ("wheels", "wheel", "hub-center"),
+    ("headlight", "lighting", "bottom-center"),
+    ("spoiler", "aero", "center"),
+    ("exhaust", "exhaust", "bottom-center"),
+    ("interior", "seat", "center"),
+]
+
+
+def seed(parts: int, anchors: int):
+    init_db()
+    rng = random.Random(0)
+    with Session(engine) as session:
+        car = CarModel(name="Bench Car", manufacturer="Make", year=2024, unit_scale=0.01)
+        session.add(car)
+        session.commit()
+        anchor_rows = [
+            Anchor(
+                car_model_id=car.id, name=f"anchor_{i}", type="body",
+                pos_x=rng.uniform(-2, 2), pos_y=rng.uniform(0, 1.5), pos_z=rng.uniform(-2, 2),
+                rot_x=rng.uniform(-math.pi, math.pi), rot_y=rng.uniform(-math.pi, math.pi), rot_z=rng.uniform(-math.pi, math.pi),
+                scale_x=rng.uniform(0.5, 2), scale_y=rng.uniform(0.5, 2), scale_z=rng.uniform(0.5, 2),
+                expected_diameter=rng.choice([None, rng.uniform(0.5, 0.8)]),
+            )
+            for i in range(anchors)
+        ]
+        part_rows = []
+        for i in range(parts):
+            part_type, category, pivot = KINDS[i % len(KINDS)]
+            size = IntrinsicSize(radius=rng.uniform(0.25, 0.4), height=rng.uniform(0.1, 0.7)) if i % 3 else None
+            part_rows.append(Part(name=f"Part {i}", type=part_type, category=category, pivot_hint=pivot,
+                                  intrinsic_size=size, price=1))
+        session.add_all(anchor_rows + part_rows)
+        session.commit()
+        return car.id, [part.id for part in part_rows], [anchor.id for anchor in anchor_rows]
+
+
+def best_of(repeat: int, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parts", type=int, default=100)
+    parser.add_argument("--anchors", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    car_id, part_ids, anchor_ids = seed(args.parts, args.anchors)
+    with Session(engine) as session:
+        service = AutoPlacementService(session)
+
+        def scalar():
+            return [[service.compute_auto_placement_transform(car_id, p, a) for a in anchor_ids] for p in part_ids]
+
+        def batch():
+            return service.compute_auto_placement_batch(car_id, part_ids, anchor_ids)
+
+        scalar_time, expected = best_of(args.repeat, scalar)
+        batch_time, placements = best_of(args.repeat, batch)
+
+    for i in range(len(part_ids)):
+        for j in range(len(anchor_ids)):
+            for key in ("position", "rotation_euler", "scale"):
+                assert placements[key][i, j].tolist() == expected[i][j][key], (i, j, key)
+
+    count = len(part_ids) * len(anchor_ids)
+    print(f"{count} placements ({len(part_ids)} parts x {len(anchor_ids)} anchors), best of {args.repeat}; TRS identical")
+    print(f"  scalar  {scalar_time * 1000:8.1f} ms")
+    print(f"  batch   {batch_time * 1000:8.1f} ms  (incl. 4x4 matrices)")
+    print(f"  {scalar_time / batch_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
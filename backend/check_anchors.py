@@ -3,12 +3,9 @@
 Script to check anchors in the database
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Anchor
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def check_anchors():
     with Session(engine) as session:
@@ -3,13 +3,11 @@
 Check what models were ingested into the database
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Anchor
-from app.db import DATABASE_URL
+from app.db import engine
 
 def check_ingested():
-    engine = create_engine(DATABASE_URL, echo=False)
-    
     with Session(engine) as session:
         # Get all car models
         car_models = session.exec(select(CarModel)).all()
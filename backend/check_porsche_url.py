@@ -3,12 +3,9 @@
 Script to check and fix the Porsche model URL
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def check_porsche_url():
     with Session(engine) as session:
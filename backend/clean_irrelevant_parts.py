@@ -3,12 +3,9 @@
 Script to clean up irrelevant parts from the database
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import Part, CarModelPartLink
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def clean_irrelevant_parts():
     with Session(engine) as session:
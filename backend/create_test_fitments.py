@@ -3,16 +3,13 @@
 Create test fitments for Phase 2 testing
 """
 
-import json
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import Fitment, CarModel, Part, Anchor
-from app.db import DATABASE_URL
+from app.db import engine
 
 def create_test_fitments():
     """Create test fitments for Phase 2 testing"""
     
-    engine = create_engine(DATABASE_URL, echo=True)
-    
     with Session(engine) as session:
         # Get first car model
         car_model = session.exec(select(CarModel).limit(1)).first()
@@ -44,11 +41,11 @@ def create_test_fitments():
                 "car_model_id": car_model.id,
                 "part_id": part.id,
                 "anchor_id": anchor.id,
-                "transform_override": json.dumps({
+                "transform_override": {
                     "position": [0.1, 0.2, 0.3],
                     "rotation_euler": [0.0, 0.1, 0.0],
                     "scale": [1.1, 1.0, 1.1]
-                }),
+                },
                 "scope": "global",
                 "quality_score": 0.8,
                 "version": 1
@@ -57,11 +54,11 @@ def create_test_fitments():
                 "car_model_id": car_model.id,
                 "part_id": part.id,
                 "anchor_id": anchor.id,
-                "transform_override": json.dumps({
+                "transform_override": {
                     "position": [0.05, 0.15, 0.25],
                     "rotation_euler": [0.0, 0.05, 0.0],
                     "scale": [1.05, 1.0, 1.05]
-                }),
+                },
                 "scope": "global",
                 "quality_score": 0.9,
                 "version": 1
@@ -3,12 +3,9 @@
 Script to fix all URLs in the database
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Part
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def fix_all_urls():
     with Session(engine) as session:
@@ -3,12 +3,10 @@
 Script to link parts to car models
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel, Part, CarModelPartLink
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
+from app.services.catalog_cache import bump_catalog_version
 
 def link_parts_to_cars():
     with Session(engine) as session:
@@ -40,6 +38,8 @@ def link_parts_to_cars():
                 else:
                     print(f"  ⏭️  Already linked: {part.name}")
             
+            # running servers drop their cached per-car part lists
+            session.exec(bump_catalog_version())
             session.commit()
         
         print(f"\n✅ Successfully linked all parts to all car models!")
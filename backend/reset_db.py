@@ -3,14 +3,11 @@
 Script to reset database and add correct car model and parts
 """
 
-from sqlmodel import Session, create_engine
+from sqlmodel import Session
 from app.models import Part, CarModel, CarModelPartLink
-from app.db import DATABASE_URL
+from app.db import engine
 import os
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
-
 def reset_database():
     # Delete the database file
     if os.path.exists("test.db"):
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Copy the catalog between environments as NDJSON (see app.services.catalog_sync).
+
+    python scripts/catalog_sync.py export catalog.ndjson
+    python scripts/catalog_sync.py import catalog.ndjson [--batch-size 1000]
+
+Use "-" for stdout / stdin. A running server exports the same format from
+GET /admin/export, so the usual path is:
+
+    curl -H "Authorization: Bearer $TOKEN" $SOURCE/admin/export > catalog.ndjson
+    DATABASE_URL=... python scripts/catalog_sync.py import catalog.ndjson
+
+Import upserts by primary key and never deletes. Memory stays flat either
+way: rows are streamed, never collected.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings
+from app.db import engine, init_db
+from app.services.catalog_sync import export_ndjson, import_ndjson
+from app.services.placement_cache import placement_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NDJSON catalog export / import")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help='NDJSON file, or "-" for stdout / stdin')
+    parser.add_argument("--batch-size", type=int, default=get_settings().catalog_sync_batch_size)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        with contextlib.ExitStack() as stack:
+            out = sys.stdout.buffer if args.path == "-" else stack.enter_context(open(args.path, "wb"))
+            for chunk in export_ndjson(engine, args.batch_size):
+                out.write(chunk)
+        return
+
+    init_db()  # tables, FTS index and catalog_version row must exist
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin.buffer if args.path == "-" else stack.enter_context(open(args.path, "rb"))
+        counts = import_ndjson(engine, source, args.batch_size)
+    placement_cache.invalidate()  # reaches the servers when the cache is shared (redis)
+    for table, count in counts.items():
+        print(f"{table}: {count} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Write .br and .gz siblings for the static assets under downloads/ so the
+/models mount can serve them precompressed (see app.compression).
+
+Run after ingestion or as a deploy build step:
+    python scripts/precompress_assets.py [downloads] [--min-size 1024] [--force]
+
+Siblings are only rewritten when the source is newer, and skipped when
+compression does not make the file smaller.
+"""
+
+import argparse
+import gzip
+import os
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTENSIONS = {".glb", ".gltf", ".bin", ".json", ".obj", ".svg", ".txt"}
+
+
+def _write_if_smaller(source: Path, target: Path, data: bytes, original_size: int) -> bool:
+    if len(data) >= original_size:
+        if target.exists():
+            target.unlink()
+        return False
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+    # keep the sibling's mtime >= the source so it is not treated as stale
+    stat = source.stat()
+    os.utime(target, (stat.st_atime, max(stat.st_mtime, target.stat().st_mtime)))
+    return True
+
+
+def precompress(path: Path, force: bool = False) -> list:
+    """Write fresh .gz/.br siblings for ``path``; returns the codings written."""
+    written = []
+    source_mtime = path.stat().st_mtime
+    data = None
+    codecs = [("gzip", ".gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        codecs.append(("br", ".br", lambda raw: brotli.compress(raw, quality=11)))
+    for coding, suffix, compress in codecs:
+        target = path.with_name(path.name + suffix)
+        if not force and target.exists() and target.stat().st_mtime >= source_mtime:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        if _write_if_smaller(path, target, compress(data), len(data)):
+            written.append(coding)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default="downloads")
+    parser.add_argument("--min-size", type=int, default=1024, help="skip files smaller than this many bytes")
+    parser.add_argument("--force", action="store_true", help="rewrite siblings even if they are up to date")
+    args = parser.parse_args()
+
+    root = Path(args.directory)
+    if not root.is_dir():
+        print(f"❌ {root} is not a directory")
+        sys.exit(1)
+    if brotli is None:
+        print("⚠️ brotli is not installed; writing .gz siblings only")
+
+    count = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in EXTENSIONS:
+            continue
+        if path.stat().st_size < args.min_size:
+            continue
+        written = precompress(path, force=args.force)
+        if written:
+            count += 1
+            print(f"✅ {path}: {', '.join(written)}")
+    print(f"Precompressed {count} files under {root}")
+
+
+if __name__ == "__main__":
+    main()
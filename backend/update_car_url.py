@@ -3,12 +3,9 @@
 Script to update car model URL to use GLTF file
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+from app.db import engine
 
 def update_car_url():
     with Session(engine) as session:
@@ -3,12 +3,9 @@
 Script to update GLB URLs in the database to point to the backend server
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import CarModel
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=True)
+from app.db import engine
 
 def update_glb_urls():
     with Session(engine) as session:
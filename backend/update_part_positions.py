@@ -3,12 +3,9 @@
 Script to update part positions and scaling for better part-specific modifications
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import Part
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def update_part_positions():
     with Session(engine) as session:
@@ -3,12 +3,9 @@
 Script to update placeholder parts to use real GLB models
 """
 
-from sqlmodel import Session, create_engine, select
+from sqlmodel import Session, select
 from app.models import Part
-from app.db import DATABASE_URL
-
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+from app.db import engine
 
 def update_placeholder_parts():
     with Session(engine) as session:
@@ -252,15 +252,10 @@ function AnchorPartAttachment({ part, carScene }: { part: Part; carScene: THREE.
       
       // Auto-scale based on anchor metadata if available
       if (anchorNode.userData?.radius && part.intrinsic_size) {
-        try {
-          const intrinsicSize = JSON.parse(part.intrinsic_size);
-          const targetRadius = anchorNode.userData.radius;
-          const currentRadius = intrinsicSize.radius || 0.5;
-          const scale = targetRadius / currentRadius;
-          clonedPart.scale.multiplyScalar(scale);
-        } catch (e) {
-          console.warn('Failed to parse intrinsic_size:', e);
-        }
+        const targetRadius = anchorNode.userData.radius;
+        const currentRadius = part.intrinsic_size.radius || 0.5;
+        const scale = targetRadius / currentRadius;
+        clonedPart.scale.multiplyScalar(scale);
       }
       
       // Optimize performance
@@ -88,7 +88,12 @@ export default function PartDetails({ part, onClose }: PartDetailsProps) {
             {part.intrinsic_size && (
               <div className="flex justify-between">
                 <span className="text-gray-600">Size:</span>
-                <span className="font-medium">{part.intrinsic_size}</span>
+                <span className="font-medium">
+                  {Object.entries(part.intrinsic_size)
+                    .filter(([, value]) => typeof value === 'number')
+                    .map(([key, value]) => `${key} ${value}`)
+                    .join(', ')}
+                </span>
               </div>
             )}
 
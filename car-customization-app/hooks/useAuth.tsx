@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect, createContext, useContext, type ReactNode } from "react"
+import { useState, useEffect, useRef, createContext, useContext, type ReactNode } from "react"
 import { apiClient, type User, type LoginRequest } from "@/lib/api"
 
 interface AuthContextType {
@@ -23,15 +23,21 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<User | null>(null)
   const [isLoading, setIsLoading] = useState(true)
   const [isClient, setIsClient] = useState(false)
+  const restored = useRef(false)
 
   useEffect(() => {
     setIsClient(true)
+    // Strict mode runs effects twice; the second run must not replay the
+    // refresh token the first one spent (that revokes the session)
+    if (restored.current) return
+    restored.current = true
     // Check if user is already logged in
-    const token = localStorage.getItem('auth_token')
-    if (token) {
-      // In a real app, you'd validate the token with the backend
-      // For now, we'll assume it's valid
-      setIsLoading(false)
+    if (localStorage.getItem('refresh_token')) {
+      // trade the stored refresh token for a fresh access token; no password
+      // needed. Later expiries are refreshed by apiClient on a 401
+      apiClient.refreshSession()
+        .catch(() => {})
+        .finally(() => setIsLoading(false))
     } else {
       setIsLoading(false)
     }
@@ -44,6 +50,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         throw new Error("Login failed: No access token returned")
       }
       localStorage.setItem('auth_token', response.access_token)
+      localStorage.setItem('refresh_token', response.refresh_token)
       setUser(response.user)
       console.log("setUser called with:", response.user)
     } catch (error) {
@@ -67,7 +74,17 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   }
 
   const logout = () => {
+    const token = localStorage.getItem('auth_token')
+    if (token) {
+      // best effort: the token is dropped locally either way
+      apiClient.logout(token).catch(() => {})
+    }
+    const refreshToken = localStorage.getItem('refresh_token')
+    if (refreshToken) {
+      apiClient.revokeRefreshToken(refreshToken).catch(() => {})
+    }
     localStorage.removeItem('auth_token')
+    localStorage.removeItem('refresh_token')
     setUser(null)
   }
 
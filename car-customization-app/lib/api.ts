@@ -7,6 +7,19 @@ export interface User {
   last_name: string;
 }
 
+export interface Bounds {
+  min: [number, number, number];
+  max: [number, number, number];
+}
+
+export interface IntrinsicSize {
+  radius?: number;
+  width?: number;
+  height?: number;
+  length?: number;
+  [key: string]: unknown;
+}
+
 export interface CarModel {
   id: number;
   name: string;
@@ -20,7 +33,7 @@ export interface CarModel {
   source_url: string;
   uploader: string;
   source_uid: string;
-  bounds: string;
+  bounds: Bounds | null;
   scale_factor: number;
 }
 
@@ -38,11 +51,11 @@ export interface Part {
   source_url: string;
   uploader: string;
   source_uid: string;
-  intrinsic_size: string;  // JSON string for auto-scaling
+  intrinsic_size: IntrinsicSize | null;  // for auto-scaling
   nominal_size: number;  // Added missing field
   pivot_hint: string;  // Added missing field
   symmetry: string;  // Added missing field
-  bounding_box: string;  // Added missing field
+  bounding_box: Bounds | null;
   attach_to: string;  // Anchor node name
   pos_x: number;
   pos_y: number;
@@ -69,10 +82,10 @@ export interface Anchor {
   scale_x: number;
   scale_y: number;
   scale_z: number;
-  anchor_metadata: string;  // JSON string for extras
+  anchor_metadata: Record<string, unknown>;  // extras like radius, axis
   symmetry_pair_id?: number;
   expected_diameter?: number;
-  bounds: string;
+  bounds: Bounds | null;
 }
 
 export interface Fitment {
@@ -94,6 +107,37 @@ export interface Fitment {
   version: number;
 }
 
+export interface ScenePart {
+  part_id: number;
+  anchor: Anchor | null;
+  transform: {
+    position: [number, number, number];
+    rotation_euler: [number, number, number];
+    scale: [number, number, number];
+  };
+  source: 'user' | 'global' | 'auto' | 'default';
+}
+
+export interface Scene {
+  car_model: CarModel;
+  parts: ScenePart[];
+  missing_part_ids: number[];
+}
+
+type Vec3 = [number, number, number];
+
+// [part][anchor], in the order of part_ids / anchor_ids
+export interface Placements {
+  part_ids: number[];
+  anchor_ids: number[];
+  position: Vec3[][];
+  rotation_euler: Vec3[][];
+  scale: Vec3[][];
+  matrix: number[][][][];  // row-major 4x4 (Matrix4.set order, not fromArray)
+  missing_part_ids: number[];
+  missing_anchor_ids: number[];
+}
+
 export interface SavedCar {
   id: number;
   user_id: number;
@@ -103,8 +147,98 @@ export interface SavedCar {
   part_ids: number[];
 }
 
+export interface PartSearchResult {
+  total: number;
+  results: Part[];
+  facets: {
+    type: Record<string, number>;
+    category: Record<string, number>;
+    price: Record<string, number>;
+  };
+}
+
+export interface Quote {
+  key: string | null;
+  total: number;
+  currency: string;
+  lines: { part_id: number; price: number }[] | null;
+  unknown_part_ids: number[];
+}
+
+export interface ConfigurationValidation {
+  valid: boolean;
+  conflicts: { part_id: number; conflicts_with_part_id: number }[];
+  car_conflicts: number[];
+  unknown_part_ids: number[];
+  remaining_part_ids: number[] | null;
+}
+
+export interface TransformDelta {
+  position?: [number, number, number];
+  rotation_euler?: [number, number, number];
+  scale?: [number, number, number]; // multiplied into the current scale
+}
+
+export interface ManualAdjustmentState {
+  type: 'ready' | 'saved';
+  fitment_id: string | null;
+  version: number;
+  transform: Fitment['transform_override'];
+}
+
+/**
+ * Live manual correction for one part: send every gizmo movement, the
+ * server keeps the latest state and persists it on an interval and on close.
+ */
+export class ManualAdjustmentChannel {
+  private socket: WebSocket;
+  private pending: string[] = [];
+
+  constructor(url: string, onState?: (state: ManualAdjustmentState) => void) {
+    this.socket = new WebSocket(url);
+    this.socket.onopen = () => {
+      this.pending.forEach((message) => this.socket.send(message));
+      this.pending = [];
+    };
+    this.socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'error') {
+        console.error('Manual adjustment channel:', message.detail);
+      } else {
+        onState?.(message);
+      }
+    };
+  }
+
+  private send(message: object) {
+    const data = JSON.stringify(message);
+    if (this.socket.readyState === WebSocket.OPEN) {
+      this.socket.send(data);
+    } else {
+      this.pending.push(data);
+    }
+  }
+
+  sendDelta(delta: TransformDelta) {
+    this.send({ delta });
+  }
+
+  sendTransform(transform: Fitment['transform_override']) {
+    this.send({ transform });
+  }
+
+  flush() {
+    this.send({ type: 'flush' });
+  }
+
+  close() {
+    this.socket.close();
+  }
+}
+
 class ApiClient {
   private baseUrl: string;
+  private refreshing: Promise<string> | null = null;
 
   constructor(baseUrl: string = 'http://localhost:8000') {
     this.baseUrl = baseUrl;
@@ -127,18 +261,128 @@ class ApiClient {
     return response.json();
   }
 
+  // Follows the Link rel="next" headers of paginated list endpoints
+  private async requestAllPages<T>(endpoint: string, options: RequestInit = {}, token?: string): Promise<T[]> {
+    const items: T[] = [];
+    let url: string | null = `${this.baseUrl}${endpoint}`;
+    while (url) {
+      const init: RequestInit = {
+        headers: {
+          'Content-Type': 'application/json',
+          ...options.headers,
+        },
+        ...options,
+      };
+      const response: Response = token ? await this.fetchWithToken(url, token, init) : await fetch(url, init);
+
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+
+      items.push(...(await response.json()));
+      const next = response.headers.get('Link')?.match(/<([^>]+)>;\s*rel="next"/);
+      url = next ? next[1] : null;
+    }
+    return items;
+  }
+
+  // Trades the stored refresh token for new tokens. Refresh tokens are single
+  // use and replaying a spent one revokes the whole session, so concurrent
+  // callers share the one refresh in flight.
+  refreshSession(): Promise<string> {
+    if (!this.refreshing) {
+      const refreshToken = localStorage.getItem('refresh_token');
+      this.refreshing = (refreshToken ? this.refresh(refreshToken) : Promise.reject(new Error('Session expired')))
+        .then(
+          (tokens) => {
+            localStorage.setItem('auth_token', tokens.access_token);
+            localStorage.setItem('refresh_token', tokens.refresh_token);
+            return tokens.access_token;
+          },
+          (error) => {
+            localStorage.removeItem('auth_token');
+            localStorage.removeItem('refresh_token');
+            throw error;
+          }
+        )
+        .finally(() => {
+          this.refreshing = null;
+        });
+    }
+    return this.refreshing;
+  }
+
+  // fetch with a bearer token; on a 401 refresh the session once and retry
+  private async fetchWithToken(url: string, token: string, options: RequestInit = {}): Promise<Response> {
+    const send = (accessToken: string) => fetch(url, {
+      ...options,
+      headers: {
+        ...options.headers,
+        'Authorization': `Bearer ${accessToken}`,
+      },
+    });
+    const response = await send(token);
+    if (response.status !== 401 || !localStorage.getItem('refresh_token')) {
+      return response;
+    }
+    // another request may have refreshed since this token was read
+    const stored = localStorage.getItem('auth_token');
+    return send(stored && stored !== token ? stored : await this.refreshSession());
+  }
+
   private async authenticatedRequest<T>(endpoint: string, token: string, options: RequestInit = {}): Promise<T> {
-    return this.request<T>(endpoint, {
+    const response = await this.fetchWithToken(`${this.baseUrl}${endpoint}`, token, {
       ...options,
       headers: {
+        'Content-Type': 'application/json',
         ...options.headers,
-        'Authorization': `Bearer ${token}`,
       },
     });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    return response.json();
   }
 
   // Authentication
-  async login(email: string, password: string): Promise<{ access_token: string; user: User }> {
+  async logout(token: string): Promise<void> {
+    // revokes the token server-side; 204 has no body, so skip request()'s JSON parse
+    const response = await fetch(`${this.baseUrl}/logout`, {
+      method: 'POST',
+      headers: { 'Authorization': `Bearer ${token}` },
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+  }
+
+  async refresh(refreshToken: string): Promise<{ access_token: string; refresh_token: string }> {
+    // single use: store the returned refresh_token, the one sent is spent
+    const response = await fetch(`${this.baseUrl}/token/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+    if (!response.ok) {
+      throw new Error('Session expired');
+    }
+    return response.json();
+  }
+
+  async revokeRefreshToken(refreshToken: string): Promise<void> {
+    const response = await fetch(`${this.baseUrl}/token/revoke`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+  }
+
+  async login(email: string, password: string): Promise<{ access_token: string; refresh_token: string; user: User }> {
     const formData = new FormData();
     formData.append('username', email);
     formData.append('password', password);
@@ -167,7 +411,7 @@ class ApiClient {
 
   // Car Models
   async getCarModels(): Promise<CarModel[]> {
-    return this.request<CarModel[]>('/car_models/');
+    return this.requestAllPages<CarModel>('/car_models/');
   }
 
   async getCarModel(id: number): Promise<CarModel> {
@@ -179,7 +423,18 @@ class ApiClient {
     if (carModelId) {
       return this.request<Part[]>(`/parts/car_model/${carModelId}`);
     }
-    return this.request<Part[]>('/parts/');
+    return this.requestAllPages<Part>('/parts/');
+  }
+
+  async searchParts(
+    q: string,
+    filters: { type?: string; category?: string; min_price?: number; max_price?: number; limit?: number } = {}
+  ): Promise<PartSearchResult> {
+    const params = new URLSearchParams({ q });
+    for (const [key, value] of Object.entries(filters)) {
+      if (value !== undefined) params.set(key, String(value));
+    }
+    return this.request<PartSearchResult>(`/parts/search?${params}`);
   }
 
   async getPart(id: number): Promise<Part> {
@@ -192,6 +447,31 @@ class ApiClient {
     return response;
   }
 
+  // Scene: anchors and resolved transforms for a whole configuration in one call
+  async getScene(
+    carModelId: number,
+    partIds: number[],
+    partVariantHashes: Record<number, string> = {},
+    token?: string
+  ): Promise<Scene> {
+    return this.request<Scene>(`/car_models/${carModelId}/scene`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { 'Authorization': `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({ part_ids: partIds, part_variant_hashes: partVariantHashes }),
+    });
+  }
+
+  // Auto-placement of every part at every anchor (no fitments applied)
+  async getPlacements(carModelId: number, partIds: number[], anchorIds: number[]): Promise<Placements> {
+    return this.request<Placements>(`/car_models/${carModelId}/placements`, {
+      method: 'POST',
+      body: JSON.stringify({ part_ids: partIds, anchor_ids: anchorIds }),
+    });
+  }
+
   // Fitments
   async getFitments(params?: {
     car_model_id?: number;
@@ -207,7 +487,22 @@ class ApiClient {
     
     const queryString = searchParams.toString();
     const url = queryString ? `/fitments/?${queryString}` : '/fitments/';
-    return this.request<Fitment[]>(url);
+    return this.requestAllPages<Fitment>(url);
+  }
+
+  // Best fitment for many (car, part, anchor, variant) keys; results follow input order
+  async getBestFitments(
+    items: { car_model_id: number; part_id: number; anchor_id: number; part_variant_hash?: string }[],
+    token?: string
+  ): Promise<(Fitment | null)[]> {
+    return this.request<(Fitment | null)[]>('/fitments/best:batch', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { 'Authorization': `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify({ items }),
+    });
   }
 
   async getBestFitment(
@@ -277,6 +572,17 @@ class ApiClient {
     }
   }
 
+  openManualAdjustmentChannel(
+    token: string,
+    carModelId: number,
+    partId: number,
+    onState?: (state: ManualAdjustmentState) => void
+  ): ManualAdjustmentChannel {
+    const params = new URLSearchParams({ car_model_id: String(carModelId), part_id: String(partId), token });
+    const wsBase = this.baseUrl.replace(/^http/, 'ws');
+    return new ManualAdjustmentChannel(`${wsBase}/fitments/manual-adjustment/ws?${params}`, onState);
+  }
+
   async deleteFitment(fitmentId: string): Promise<void> {
     return this.request<void>(`/fitments/${fitmentId}`, {
       method: 'DELETE',
@@ -285,7 +591,7 @@ class ApiClient {
 
   // Saved Cars
   async getSavedCars(token: string): Promise<SavedCar[]> {
-    return this.authenticatedRequest<SavedCar[]>('/saved_cars/', token);
+    return this.requestAllPages<SavedCar>('/saved_cars/', {}, token);
   }
 
   async getSavedCar(token: string, id: number): Promise<SavedCar> {
@@ -301,11 +607,8 @@ class ApiClient {
   }
 
   async deleteSavedCar(token: string, id: number): Promise<void> {
-    const response = await fetch(`${this.baseUrl}/saved_cars/${id}`, {
+    const response = await this.fetchWithToken(`${this.baseUrl}/saved_cars/${id}`, token, {
       method: 'DELETE',
-      headers: {
-        'Authorization': `Bearer ${token}`,
-      },
     });
 
     if (!response.ok) {
@@ -328,10 +631,31 @@ class ApiClient {
     });
   }
 
+  async quoteConfigurations(
+    configurations: { key?: string; part_ids: number[] }[],
+    breakdown = true
+  ): Promise<Quote[]> {
+    return this.request<Quote[]>('/parts/quote:batch', {
+      method: 'POST',
+      body: JSON.stringify({ configurations, breakdown }),
+    });
+  }
+
   // Compatible parts
   async getCompatibleParts(partId: number): Promise<Part[]> {
     return this.request<Part[]>(`/parts/${partId}/compatible`);
   }
+
+  async validateConfiguration(
+    partIds: number[],
+    carModelId?: number,
+    includeRemaining = false
+  ): Promise<ConfigurationValidation> {
+    return this.request<ConfigurationValidation>('/parts/validate_configuration', {
+      method: 'POST',
+      body: JSON.stringify({ car_model_id: carModelId, part_ids: partIds, include_remaining: includeRemaining }),
+    });
+  }
 }
 
 // Create a singleton instance